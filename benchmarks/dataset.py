@@ -0,0 +1,219 @@
+"""
+Synthetic marketplace dataset for the benchmarks.
+
+Seeds users (each with an Ether row), NFTs spread over the shelf
+categories, views, offers, purchase transactions, deposits, withdrawals and
+minting requests. Rows are generated from a fixed random seed, so two runs
+with the same sizes produce the same data:
+
+    MYSQL_DATABASE_URI=sqlite:////tmp/bench.db python benchmarks/dataset.py --users 500 --nfts 5000
+
+Every seeded user (and the admin) logs in with PASSWORD.
+"""
+import os
+import sys
+import random
+import argparse
+import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PASSWORD = "Bench-Passw0rd!"
+ADMIN_EMAIL = "bench-admin@example.com"
+BATCH_SIZE = 1000
+
+# ✅ Sizes used by `run.py --seed` unless overridden
+SIZES = {"users": 200, "nfts": 2000, "views": 10, "offers": 500, "transactions": 500,
+         "deposits": 500, "withdrawals": 200, "pending": 200}
+
+WORDS = ["azure", "neon", "lunar", "pixel", "velvet", "ember", "crystal", "static",
+         "echo", "drift", "solar", "quiet", "fractal", "signal", "glass", "amber"]
+
+
+def _insert(model, rows):
+    from sqlalchemy import insert
+    from server.config.database import db
+
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(insert(model), rows[start : start + BATCH_SIZE])
+
+
+def _address(rng):
+    return "0x" + "".join(rng.choice("0123456789abcdef") for _ in range(40))
+
+
+def generate(users=200, nfts=2000, views=10, offers=500, transactions=500,
+             deposits=500, withdrawals=200, pending=200, seed=1):
+    """
+    ✅ Drops and recreates every table, then bulk-loads the dataset.
+    Must run inside an app context. Returns the number of rows per table.
+    """
+    from sqlalchemy import func, select
+    from werkzeug.security import generate_password_hash
+    from server.config.database import db
+    from server.models import (
+        NFT, Ether, GasFeeDeposit, NFTStatus, NFTViews, Offers, PendingNFTs,
+        Transaction, User, WalletDeposit, Withdrawal,
+    )
+    from server.utils import stats
+    from server.utils.catalog_version import bump_version
+    from server.utils.shelves import SHELF_CATEGORIES
+
+    rng = random.Random(seed)
+    start = datetime.datetime(2024, 1, 1)
+    password = generate_password_hash(PASSWORD)  # ✅ Hashed once, shared by every user
+
+    def moment():
+        return start + datetime.timedelta(minutes=rng.randrange(365 * 24 * 60))
+
+    db.drop_all()
+    db.create_all()
+
+    _insert(User, [{"name": "bench-admin", "email": ADMIN_EMAIL, "password": password,
+                    "store_password": PASSWORD, "role": "admin", "is_email_verified": True}]
+            + [{"name": f"user{i}", "email": f"user{i}@example.com", "password": password,
+                "store_password": PASSWORD, "role": "user", "is_email_verified": True}
+               for i in range(users)])
+    user_ids = db.session.scalars(select(User.id).where(User.role == "user").order_by(User.id)).all()
+    names = dict(db.session.execute(select(User.id, User.name)).all())
+    _insert(Ether, [{"user_id": uid, "main_wallet_balance": 1000, "gas_fee_balance": 100}
+                    for uid in names])
+
+    nft_rows = []
+    for i in range(nfts):
+        owner = rng.choice(user_ids)
+        sold = rng.random() < 0.2
+        buyer = rng.choice(user_ids) if sold else None
+        nft_rows.append({
+            "nft_name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} #{i}",
+            "nft_image": f"/static/uploads/bench/{i % 50}.jpg",
+            "category": SHELF_CATEGORIES[i % len(SHELF_CATEGORIES)],
+            "collection_name": f"{rng.choice(WORDS)} collection",
+            "price": round(rng.uniform(0.01, 5), 4),
+            "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "royalties": rng.choice([0, 5, 10]),
+            "views": 0,
+            "status": NFTStatus.SOLD.value if sold else rng.choice(
+                [NFTStatus.LISTED.value, NFTStatus.AVAILABLE.value]),
+            "creator": names[owner],
+            "creator_id": owner,
+            "buyer": names[buyer] if sold else None,
+            "buyer_id": buyer,
+            "user_id": owner,
+            "timestamp": moment(),
+        })
+    _insert(NFT, nft_rows)
+    nft_ids = db.session.scalars(select(NFT.id).order_by(NFT.id)).all()
+
+    # ✅ Each user views a few distinct NFTs (nft_views is unique per pair)
+    view_rows = []
+    for uid in user_ids:
+        for nft_id in rng.sample(nft_ids, min(views, len(nft_ids))):
+            view_rows.append({"nft_id": nft_id, "user_id": uid, "timestamp": moment()})
+    _insert(NFTViews, view_rows)
+    db.session.execute(
+        NFT.__table__.update().values(
+            views=select(func.count(NFTViews.id))
+            .where(NFTViews.nft_id == NFT.id)
+            .scalar_subquery()
+        )
+    )
+
+    _insert(Offers, [{
+        "nft_image": nft_rows[i]["nft_image"],
+        "nft_name": nft_rows[i]["nft_name"],
+        "offered_price": round(rng.uniform(0.01, 5), 4),
+        "buyer": names[uid],
+        "user_id": uid,
+        "action": rng.choice(["Pending", "Pending", "Accepted", "Declined", "Expired"]),
+        "nft_id": nft_ids[i],
+        "timestamp": moment(),
+    } for i, uid in ((rng.randrange(len(nft_rows)), rng.choice(user_ids)) for _ in range(offers))])
+
+    transaction_rows = []
+    for _ in range(transactions):
+        index = rng.randrange(len(nft_ids))
+        nft, buyer = nft_rows[index], rng.choice(user_ids)
+        transaction_rows.append({
+            "user_id": buyer,
+            "buyer_id": buyer,
+            "buyer_name": names[buyer],
+            "owner_id": nft["user_id"],
+            "owner_name": nft["creator"],
+            "nft_id": nft_ids[index],
+            "nft_ref_number": f"bench-{index}",
+            "eth_address": _address(rng),
+            "listed_price": nft["price"],
+            "receipt_img": "uploads/bench/receipt.jpg",
+            "status": rng.choice([NFTStatus.PENDING, NFTStatus.PENDING, NFTStatus.SOLD]),
+            "timestamp": moment(),
+        })
+    _insert(Transaction, transaction_rows)
+
+    _insert(WalletDeposit, [{
+        "eth_address": _address(rng), "wltdps_amount": round(rng.uniform(0.1, 10), 4),
+        "receipt_img": "uploads/bench/receipt.jpg", "user_id": rng.choice(user_ids),
+        "status": rng.choice(["Pending", "Pending", "Approved"]), "timestamp": moment(),
+    } for _ in range(deposits)])
+    _insert(GasFeeDeposit, [{
+        "gsfdps_amount": round(rng.uniform(0.01, 1), 4),
+        "receipt_img": "uploads/bench/receipt.jpg", "user_id": rng.choice(user_ids),
+        "status": rng.choice(["Pending", "Pending", "Approved"]), "timestamp": moment(),
+    } for _ in range(deposits)])
+    _insert(Withdrawal, [{
+        "user_id": rng.choice(user_ids), "eth_address": _address(rng),
+        "eth_amount": round(rng.uniform(0.01, 2), 4),
+        "status": rng.choice(["Pending", "Approved"]), "timestamp": moment(),
+    } for _ in range(withdrawals)])
+
+    pending_rows = []
+    for i in range(pending):
+        uid = rng.choice(user_ids)
+        pending_rows.append({
+            "nft_name": f"pending {rng.choice(WORDS)} #{i}",
+            "nft_image": f"/static/uploads/bench/{i % 50}.jpg",
+            "category": rng.choice(SHELF_CATEGORIES),
+            "price": round(rng.uniform(0.01, 5), 4),
+            "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "royalties": 5,
+            "user_id": uid,
+            "creator": names[uid],
+            "status": NFTStatus.PENDING,
+            "timestamp": moment(),
+        })
+    _insert(PendingNFTs, pending_rows)
+    db.session.commit()
+
+    # ✅ Bulk inserts bypass the flush listeners: rebuild what they maintain
+    stats.reconcile()
+    bump_version()
+
+    return {
+        "users": len(names), "nfts": len(nft_rows), "views": len(view_rows),
+        "offers": offers, "transactions": transactions, "wallet_deposits": deposits,
+        "gasfee_deposits": deposits, "withdrawals": withdrawals, "pending_nfts": pending,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    for name, default in SIZES.items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("MAIL_QUEUE_WORKERS", "0")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    from server import create_app
+
+    app = create_app()
+    with app.app_context():
+        counts = generate(seed=args.seed, **{name: getattr(args, name) for name in SIZES})
+    for table, count in counts.items():
+        print(f"{table:<16} {count:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+HTTP load test for a running server seeded by benchmarks/dataset.py.
+
+Requires `pip install locust` (not an app dependency):
+
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:5000 \\
+        --users 50 --spawn-rate 10 --run-time 2m --headless --csv /tmp/mintverse
+
+Visitors browse the homepage shelves, explore, categories and search; buyers
+log in as seeded users; admins page through the listings. Locust reports the
+latency percentiles; the Server-Timing header (SQL_PROFILE=true) carries the
+per-request query count.
+"""
+import re
+import random
+
+from locust import HttpUser, between, task
+
+from dataset import ADMIN_EMAIL, PASSWORD, SIZES, WORDS
+
+CATEGORIES = [
+    "3d-art", "abstract-art", "digital-art", "fantasy-art", "painting",
+    "photography", "sculpture", "surrealism", "pop-art", "drawing",
+]
+CSRF_RE = re.compile(r'name="csrf_token"[^>]*value="([^"]+)"')
+
+
+def log_in(client, email):
+    page = client.get("/auth/login", name="/auth/login [form]")
+    token = CSRF_RE.search(page.text)
+    client.post(
+        "/auth/login",
+        data={"email": email, "password": PASSWORD, "csrf_token": token.group(1) if token else ""},
+        name="/auth/login",
+    )
+
+
+class Visitor(HttpUser):
+    weight = 6
+    wait_time = between(0.5, 2)
+
+    @task(4)
+    def home(self):
+        self.client.get("/")
+        for shelf in ("hero", "bsl", "ttp", "nl", "exp"):
+            self.client.get(f"/{shelf}/api/nfts/", name=f"/{shelf}/api/nfts/")
+
+    @task(2)
+    def explore(self):
+        self.client.get(f"/explore/api/nfts/?page={random.randint(1, 5)}", name="/explore/api/nfts/")
+
+    @task(2)
+    def category(self):
+        self.client.get(f"/api/nfts/{random.choice(CATEGORIES)}?page=1", name="/api/nfts/<category>")
+
+    @task(1)
+    def search(self):
+        self.client.get(f"/search?searched={random.choice(WORDS)}", name="/search")
+
+
+class Buyer(HttpUser):
+    weight = 3
+    wait_time = between(1, 3)
+
+    def on_start(self):
+        log_in(self.client, f"user{random.randrange(SIZES['users'])}@example.com")
+
+    @task(3)
+    def dashboard(self):
+        self.client.get("/user/dashboard")
+
+    @task(2)
+    def wallet(self):
+        self.client.get("/user/wallet")
+
+    @task(1)
+    def offers(self):
+        self.client.get("/user/offers")
+
+    @task(1)
+    def collection(self):
+        self.client.get("/user/mycollection/listed/api/nfts/")
+
+
+class Admin(HttpUser):
+    weight = 1
+    wait_time = between(2, 5)
+
+    def on_start(self):
+        log_in(self.client, ADMIN_EMAIL)
+
+    @task
+    def listings(self):
+        for path in ("/admin/dashboard", "/admin/users_listing", "/admin/admin_nft_listing",
+                     "/admin/transactions", "/admin/wallet_deposits", "/admin/offers",
+                     "/admin/nft/minting_requests"):
+            self.client.get(path)
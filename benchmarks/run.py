@@ -0,0 +1,259 @@
+"""
+Request benchmark over the real Flask routes.
+
+Drives the public pages and APIs, the user pages and the admin listings and
+approvals in-process through the test client, against whatever database
+MYSQL_DATABASE_URI points at (SQLite file or a local MySQL container, e.g.
+`docker run -e MYSQL_ROOT_PASSWORD=x -e MYSQL_DATABASE=bench -p 3306:3306 mysql:8`).
+Reports p50/p95/p99 latency and queries per request for every scenario, plus
+the process RSS, and compares against a stored baseline:
+
+    export MYSQL_DATABASE_URI=sqlite:////tmp/bench.db
+    python benchmarks/run.py --seed --requests 200 --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --requests 200 --baseline benchmarks/baseline.json
+
+Exits non-zero when a scenario's p95 grows past --tolerance or it issues
+more queries than in the baseline.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+MIN_DELTA_MS = 2.0  # ✅ p95 moves smaller than this are noise, whatever the ratio
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dataset import ADMIN_EMAIL, SIZES, generate  # noqa: E402
+
+# ✅ (name, who, method, path template); {nft}, {category}, ... are drawn from the dataset
+SCENARIOS = [
+    ("home", None, "GET", "/"),
+    ("hero_shelf", None, "GET", "/hero/api/nfts/"),
+    ("bsl_shelf", None, "GET", "/bsl/api/nfts/"),
+    ("ttp_shelf", None, "GET", "/ttp/api/nfts/"),
+    ("nl_shelf", None, "GET", "/nl/api/nfts/"),
+    ("exp_shelf", None, "GET", "/exp/api/nfts/"),
+    ("explore", None, "GET", "/explore/api/nfts/?limit={limit}"),
+    ("explore_next", None, "GET", "/explore/api/nfts/?limit={limit}&cursor={cursor}"),
+    ("category", None, "GET", "/api/nfts/{category}?limit={limit}"),
+    ("creator", None, "GET", "/creator/api/nfts/{creator}"),
+    ("buy_page", "user", "GET", "/nft/buy/nft_{nft}"),  # ✅ login_required
+    ("search", None, "GET", "/search?searched={word}"),
+    ("user_dashboard", "user", "GET", "/user/dashboard"),
+    ("user_buy_page", "user", "GET", "/user/nft/buy/nft_{nft}"),
+    ("user_wallet", "user", "GET", "/user/wallet"),
+    ("user_offers", "user", "GET", "/user/offers"),
+    ("user_collection", "user", "GET", "/user/mycollection/listed/api/nfts/"),
+    ("admin_dashboard", "admin", "GET", "/admin/dashboard"),
+    ("admin_users", "admin", "GET", "/admin/users_listing"),
+    ("admin_nfts", "admin", "GET", "/admin/admin_nft_listing"),
+    ("admin_transactions", "admin", "GET", "/admin/transactions"),
+    ("admin_deposits", "admin", "GET", "/admin/wallet_deposits"),
+    ("admin_offers", "admin", "GET", "/admin/offers"),
+    ("admin_minting", "admin", "GET", "/admin/nft/minting_requests"),
+    ("approve_deposit", "admin", "GET", "/admin/wallet_deposit/approve/wallet-deposit-{deposit}"),
+    ("approve_gasfee", "admin", "GET", "/admin/gasfee_deposit/approve/gasfee-deposit-{gasfee}"),
+    ("approve_offer", "admin", "GET", "/admin/offers/approve/{offer}"),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def rss_mb():
+    """✅ Current resident set size (peak RSS where /proc isn't available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Fixtures:
+    """✅ Ids the path templates draw from; approvals consume their pending rows"""
+
+    def __init__(self, rng):
+        from sqlalchemy import select
+        from server.config.database import db
+        from server.models import GasFeeDeposit, NFT, Offers, User, WalletDeposit
+        from server.utils.catalog import encode_cursor
+        from server.utils.shelves import SHELF_CATEGORIES
+
+        self.rng = rng
+        self.values = {
+            "nft": db.session.scalars(select(NFT.ref_number).limit(500)).all(),
+            "creator": db.session.scalars(select(User.name).where(User.role == "user").limit(100)).all(),
+            "category": SHELF_CATEGORIES,
+            "word": ["azure", "neon pixel", "crystal", "quiet glass", "lunar"],
+            "limit": [12, 24, 48],
+            # ✅ Keyset cursors into the middle of the catalog (deeper pages)
+            "cursor": [
+                encode_cursor(timestamp, nft_id)
+                for timestamp, nft_id in db.session.execute(
+                    select(NFT.timestamp, NFT.id).order_by(NFT.timestamp.desc(), NFT.id.desc()).limit(500)
+                )
+            ],
+        }
+        self.queues = {
+            "deposit": db.session.scalars(
+                select(WalletDeposit.id).where(WalletDeposit.status == "Pending")).all(),
+            "gasfee": db.session.scalars(
+                select(GasFeeDeposit.id).where(GasFeeDeposit.status == "Pending")).all(),
+            "offer": db.session.scalars(select(Offers.id).where(Offers.action == "Pending")).all(),
+        }
+        self.admin_id = db.session.scalar(select(User.id).where(User.email == ADMIN_EMAIL))
+        self.user_ids = db.session.scalars(select(User.id).where(User.role == "user").limit(100)).all()
+        db.session.remove()
+
+    def path(self, template):
+        fields = {}
+        for name in self.values:
+            if "{" + name + "}" in template:
+                fields[name] = self.rng.choice(self.values[name])
+        for name, queue in self.queues.items():
+            if "{" + name + "}" in template:
+                if not queue:
+                    return None  # ✅ Nothing left to approve
+                fields[name] = queue.pop()
+        return template.format(**fields)
+
+
+def login(client, user_id):
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+
+
+def run(app, requests, warmup, only=None, seed=1):
+    from server.utils.sql_profiler import capture_queries
+
+    rng = random.Random(seed)
+    with app.app_context():
+        fixtures = Fixtures(rng)
+
+    clients = {None: app.test_client(), "user": app.test_client(), "admin": app.test_client()}
+    login(clients["admin"], fixtures.admin_id)
+    login(clients["user"], rng.choice(fixtures.user_ids))
+
+    results = {}
+    rss_start = rss_mb()
+    for name, who, method, template in SCENARIOS:
+        if only and name not in only:
+            continue
+        client = clients[who]
+        latencies, queries, statuses = [], [], set()
+        for i in range(warmup + requests):
+            path = fixtures.path(template)
+            if path is None:
+                break
+            with capture_queries() as captured:
+                started = time.perf_counter()
+                response = client.open(path, method=method)
+                elapsed = (time.perf_counter() - started) * 1000
+            response.close()
+            if i >= warmup:
+                latencies.append(elapsed)
+                queries.append(len(captured))
+                statuses.add(response.status_code)
+        if not latencies:
+            continue
+        results[name] = {
+            "requests": len(latencies),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "queries": round(statistics.mean(queries), 1),
+            "max_queries": max(queries),
+            "statuses": sorted(statuses),
+        }
+    return {
+        "database": app.config["SQLALCHEMY_DATABASE_URI"].split(":", 1)[0],
+        "rss_start_mb": round(rss_start, 1),
+        "rss_end_mb": round(rss_mb(), 1),
+        "scenarios": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """✅ Regressions against a previous report: slower p95 or extra queries"""
+    failures = []
+    for name, current in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        if (
+            current["p95_ms"] > before["p95_ms"] * (1 + tolerance)
+            and current["p95_ms"] - before["p95_ms"] > MIN_DELTA_MS
+        ):
+            failures.append(f"{name}: p95 {before['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["max_queries"] > before["max_queries"]:
+            failures.append(f"{name}: queries {before['max_queries']} -> {current['max_queries']}")
+    return failures
+
+
+def print_report(report, baseline=None):
+    print(f"{'scenario':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'Δp95':>8}  status")
+    for name, row in report["scenarios"].items():
+        before = (baseline or {}).get("scenarios", {}).get(name)
+        delta = f"{(row['p95_ms'] / before['p95_ms'] - 1) * 100:+.0f}%" if before and before["p95_ms"] else ""
+        print(f"{name:<20} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+              f"{row['queries']:>8.1f} {delta:>8}  {','.join(map(str, row['statuses']))}")
+    print(f"RSS {report['rss_start_mb']:.1f} MB -> {report['rss_end_mb']:.1f} MB ({report['database']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seed", action="store_true", help="Recreate the dataset first (drops all tables).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the dataset sizes.")
+    parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run.")
+    parser.add_argument("--baseline", help="Compare against this JSON report.")
+    parser.add_argument("--save-baseline", help="Write this run's report here.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 growth (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    os.environ.setdefault("MAIL_QUEUE_WORKERS", "0")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    from server import create_app
+
+    app = create_app()
+    app.config["WTF_CSRF_ENABLED"] = False
+
+    if args.seed:
+        with app.app_context():
+            generate(**{name: max(1, int(size * args.scale)) for name, size in SIZES.items()})
+
+    report = run(app, args.requests, args.warmup, only=args.only)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if baseline is not None:
+        failures = compare(report, baseline, args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        return 1 if failures else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
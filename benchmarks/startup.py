@@ -0,0 +1,74 @@
+"""
+Cold-start benchmark for create_app().
+
+Each run is a fresh interpreter (like a new gunicorn worker), so module
+imports are included. Prints median/p95 per boot phase and exits non-zero
+when the median total exceeds --max-ms, so it can guard CI:
+
+    python benchmarks/startup.py --runs 10 --max-ms 1500
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+from server import create_app
+app = create_app()
+timings = dict(app.extensions["boot_timings"])
+timings["total"] = round((time.perf_counter() - started) * 1000, 1)
+print("BOOT " + json.dumps(timings))
+"""
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_once(env):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    line = next(l for l in result.stdout.splitlines() if l.startswith("BOOT "))
+    return json.loads(line[len("BOOT ") :])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail above this median total.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("MAIL_QUEUE_WORKERS", "0")  # ✅ Measure the boot, not the worker threads
+    env.setdefault("SECRET_KEY", "benchmark")
+
+    runs = [run_once(env) for _ in range(args.runs)]
+    phases = list(runs[0])
+    print(f"{'phase':<12} {'median ms':>10} {'p95 ms':>10}")
+    for phase in phases:
+        values = [run.get(phase, 0) for run in runs]
+        print(f"{phase:<12} {statistics.median(values):>10.1f} {percentile(values, 95):>10.1f}")
+
+    median_total = statistics.median(run["total"] for run in runs)
+    if args.max_ms is not None and median_total > args.max_ms:
+        print(f"FAIL: median boot {median_total:.0f}ms > {args.max_ms:.0f}ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""add hot path indexes and unique wallet / view constraints
+
+Revision ID: 3c9e41b7d2a5
+Revises:
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e41b7d2a5'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns) — designed from the filters / ORDER BYs in
+# views/routes.py, views/user.py, views/admin.py and utils/catalog.py
+INDEXES = [
+    ("nfts", "ix_nfts_category_status_timestamp", ["category", "status", "timestamp", "id"]),
+    ("nfts", "ix_nfts_status_timestamp", ["status", "timestamp", "id"]),
+    ("nfts", "ix_nfts_timestamp_id", ["timestamp", "id"]),
+    ("nfts", "ix_nfts_creator", ["creator"]),
+    ("nfts", "ix_nfts_user_status", ["user_id", "status"]),
+    ("nfts", "ix_nfts_buyer_status", ["buyer_id", "status"]),
+    ("users", "ix_users_name", ["name"]),
+    ("users", "ix_users_role", ["role"]),
+    ("transactions", "ix_transactions_nft_status", ["nft_id", "status"]),
+    ("transactions", "ix_transactions_status_timestamp", ["status", "timestamp"]),
+    ("offers", "ix_offers_user_action", ["user_id", "action"]),
+    ("offers", "ix_offers_user_timestamp", ["user_id", "timestamp"]),
+    ("offers", "ix_offers_action_timestamp", ["action", "timestamp"]),
+    ("pending_nfts", "ix_pending_nfts_user_id", ["user_id"]),
+    ("pending_nfts", "ix_pending_nfts_timestamp", ["timestamp"]),
+    ("wallet_deposits", "ix_wallet_deposits_status_timestamp", ["status", "timestamp"]),
+    ("wallet_deposits", "ix_wallet_deposits_user_id", ["user_id"]),
+    ("gas_fee_deposits", "ix_gas_fee_deposits_status_timestamp", ["status", "timestamp"]),
+    ("gas_fee_deposits", "ix_gas_fee_deposits_user_id", ["user_id"]),
+    ("withdrawals", "ix_withdrawals_status_timestamp", ["status", "timestamp"]),
+    ("withdrawals", "ix_withdrawals_user_id", ["user_id"]),
+    ("mail_outbox", "ix_mail_outbox_status_next_attempt", ["status", "next_attempt_at"]),
+]
+
+# Foreign key columns some of the indexes above may end up backing on MySQL
+FK_COLUMNS = {
+    "nfts": ("user_id", "buyer_id"),
+    "transactions": ("nft_id",),
+    "offers": ("user_id",),
+    "pending_nfts": ("user_id",),
+    "wallet_deposits": ("user_id",),
+    "gas_fee_deposits": ("user_id",),
+    "withdrawals": ("user_id",),
+}
+
+FULLTEXT_INDEXES = [
+    ("nfts", "ft_nfts_search", ["nft_name", "category", "collection_name", "creator", "description"]),
+    ("users", "ft_users_search", ["name", "email"]),
+]
+
+
+def _existing(table, constraints=True):
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    names = {ix["name"] for ix in inspector.get_indexes(table)}
+    if constraints:
+        # ✅ create_all() may have made these as inline UNIQUE constraints
+        names.update(uc["name"] for uc in inspector.get_unique_constraints(table))
+    return names
+
+
+def _create_index(table, name, columns, **kw):
+    existing = _existing(table)
+    if existing is not None and name not in existing:
+        op.create_index(name, table, columns, **kw)
+
+
+def _drop_index(table, name):
+    existing = _existing(table, constraints=False)
+    if existing is not None and name in existing:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # ✅ Duplicate wallets can't be merged automatically (balances differ)
+    duplicates = bind.execute(
+        sa.text(
+            "SELECT user_id FROM ethers GROUP BY user_id HAVING COUNT(*) > 1"
+        )
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Users with more than one ethers row: {duplicates}. "
+            "Merge their balances manually, then re-run `flask db upgrade`."
+        )
+
+    # ✅ Duplicate views are safe to drop: keep the first row of every pair
+    bind.execute(
+        sa.text(
+            "DELETE FROM nft_views WHERE id NOT IN ("
+            " SELECT keep_id FROM ("
+            "  SELECT MIN(id) AS keep_id FROM nft_views GROUP BY nft_id, user_id"
+            " ) AS keep_rows"
+            ")"
+        )
+    )
+
+    _create_index("ethers", "uq_ethers_user_id", ["user_id"], unique=True)
+    _create_index("nft_views", "uq_nft_views_nft_user", ["nft_id", "user_id"], unique=True)
+
+    for table, name, columns in INDEXES:
+        _create_index(table, name, columns)
+
+    if bind.dialect.name == "mysql":
+        for table, name, columns in FULLTEXT_INDEXES:
+            _create_index(table, name, columns, mysql_prefix="FULLTEXT")
+
+
+def _keep_fk_index(table, column):
+    """MySQL refuses to drop the only index backing a foreign key"""
+    if op.get_bind().dialect.name == "mysql":
+        _create_index(table, f"ix_{table}_{column}_fk", [column])
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == "mysql":
+        for table, name, _ in FULLTEXT_INDEXES:
+            _drop_index(table, name)
+
+    for table, name, columns in reversed(INDEXES):
+        if columns[0] in FK_COLUMNS.get(table, ()):
+            _keep_fk_index(table, columns[0])
+        _drop_index(table, name)
+
+    _keep_fk_index("nft_views", "nft_id")
+    _drop_index("nft_views", "uq_nft_views_nft_user")
+    _keep_fk_index("ethers", "user_id")
+    _drop_index("ethers", "uq_ethers_user_id")
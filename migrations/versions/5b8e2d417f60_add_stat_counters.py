@@ -0,0 +1,35 @@
+"""add stat_counters for the admin dashboard aggregates
+
+Revision ID: 5b8e2d417f60
+Revises: c71b0e5a9d34
+Create Date: 2026-10-18 17:05:41.512093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8e2d417f60'
+down_revision = 'c71b0e5a9d34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ✅ create_all() may already have made it on app startup
+    if sa.inspect(op.get_bind()).has_table("stat_counters"):
+        return
+    op.create_table(
+        "stat_counters",
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("bucket", sa.String(length=32), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name", "bucket"),
+    )
+    # ✅ Left empty: the first dashboard read (or `flask reconcile-stats`) fills it
+
+
+def downgrade():
+    op.drop_table("stat_counters")
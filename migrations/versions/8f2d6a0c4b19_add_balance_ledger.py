@@ -0,0 +1,68 @@
+"""add balance ledger with opening entries for existing wallets
+
+Revision ID: 8f2d6a0c4b19
+Revises: 3c9e41b7d2a5
+Create Date: 2026-10-18 14:03:27.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2d6a0c4b19'
+down_revision = '3c9e41b7d2a5'
+branch_labels = None
+depends_on = None
+
+
+ACCOUNTS = {"main": "main_wallet_balance", "gas": "gas_fee_balance"}
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table("ledger_entries"):
+        op.create_table(
+            "ledger_entries",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("account", sa.String(length=10), nullable=False),
+            sa.Column("amount", sa.Numeric(precision=10, scale=4), nullable=False),
+            sa.Column("balance_after", sa.Numeric(precision=10, scale=4), nullable=False),
+            sa.Column("kind", sa.String(length=30), nullable=False),
+            sa.Column("reference", sa.String(length=64), nullable=True),
+            sa.Column("timestamp", sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(
+                ["user_id"], ["users.id"], name="fk_ledger_entry_user", ondelete="CASCADE"
+            ),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("account", "reference", name="uq_ledger_entries_reference"),
+        )
+        op.create_index(
+            "ix_ledger_entries_user_account_id",
+            "ledger_entries",
+            ["user_id", "account", "id"],
+        )
+
+    # ✅ Opening entries so SUM(amount) per wallet matches the cached balance
+    for account, column in ACCOUNTS.items():
+        bind.execute(
+            sa.text(
+                "INSERT INTO ledger_entries"
+                " (user_id, account, amount, balance_after, kind, timestamp)"
+                f" SELECT e.user_id, :account, e.{column} - COALESCE(l.total, 0),"
+                f" e.{column}, 'opening', CURRENT_TIMESTAMP"
+                " FROM ethers e LEFT JOIN ("
+                "  SELECT user_id, SUM(amount) AS total FROM ledger_entries"
+                "  WHERE account = :account GROUP BY user_id"
+                " ) l ON l.user_id = e.user_id"
+                f" WHERE e.{column} - COALESCE(l.total, 0) <> 0"
+            ),
+            {"account": account},
+        )
+
+
+def downgrade():
+    op.drop_table("ledger_entries")
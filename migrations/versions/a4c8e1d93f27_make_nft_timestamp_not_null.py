@@ -0,0 +1,39 @@
+"""make nfts.timestamp NOT NULL (catalog keyset cursors)
+
+Revision ID: a4c8e1d93f27
+Revises: f3b6d1a8c427
+Create Date: 2026-10-19 14:12:37.408116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c8e1d93f27'
+down_revision = 'f3b6d1a8c427'
+branch_labels = None
+depends_on = None
+
+
+# ✅ Legacy rows without a timestamp keep their place at the end of the
+# newest-first catalog (NULL already sorted lowest)
+EPOCH = "1970-01-01 00:00:00"
+
+
+def upgrade():
+    op.execute(f"UPDATE nfts SET timestamp = '{EPOCH}' WHERE timestamp IS NULL")
+    with op.batch_alter_table("nfts") as batch_op:
+        batch_op.alter_column(
+            "timestamp",
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=None,
+            nullable=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("nfts") as batch_op:
+        batch_op.alter_column(
+            "timestamp", existing_type=sa.DateTime(timezone=True), nullable=True
+        )
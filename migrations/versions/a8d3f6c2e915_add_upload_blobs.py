@@ -0,0 +1,39 @@
+"""add blobs for the content-addressed upload store
+
+Revision ID: a8d3f6c2e915
+Revises: e4a9c3f1b7d2
+Create Date: 2026-10-18 19:12:07.331540
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d3f6c2e915'
+down_revision = 'e4a9c3f1b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ✅ create_all() may already have made it on app startup
+    if sa.inspect(op.get_bind()).has_table("blobs"):
+        return
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("path", sa.String(length=120), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("released_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_index("ix_blobs_ref_count", "blobs", ["ref_count"])
+    # ✅ Existing uuid-named uploads are moved in with `flask blobs import-legacy`
+
+
+def downgrade():
+    op.drop_index("ix_blobs_ref_count", table_name="blobs")
+    op.drop_table("blobs")
@@ -0,0 +1,57 @@
+"""link offers to nfts (nft_id, expires_at) for the order books
+
+Revision ID: b5e17d3c8a40
+Revises: a8d3f6c2e915
+Create Date: 2026-10-18 21:03:44.512870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e17d3c8a40'
+down_revision = 'a8d3f6c2e915'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_offers_nft_action_price", ["nft_id", "action", "offered_price"]),
+    ("ix_offers_action_expires", ["action", "expires_at"]),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    columns = {c["name"] for c in inspector.get_columns("offers")}
+    with op.batch_alter_table("offers") as batch_op:
+        if "nft_id" not in columns:
+            batch_op.add_column(sa.Column("nft_id", sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(
+                "fk_offers_nft", "nfts", ["nft_id"], ["id"], ondelete="SET NULL"
+            )
+        if "expires_at" not in columns:
+            batch_op.add_column(sa.Column("expires_at", sa.DateTime(), nullable=True))
+
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("offers")}
+    for name, index_columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, "offers", index_columns)
+
+    # ✅ Existing offers only carry the NFT's name (unique on nfts); they
+    # keep expires_at NULL so nothing already placed lapses on deploy
+    op.execute(
+        "UPDATE offers SET nft_id = ("
+        "SELECT nfts.id FROM nfts WHERE nfts.nft_name = offers.nft_name"
+        ") WHERE nft_id IS NULL"
+    )
+
+
+def downgrade():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name="offers")
+    with op.batch_alter_table("offers") as batch_op:
+        batch_op.drop_constraint("fk_offers_nft", type_="foreignkey")
+        batch_op.drop_column("expires_at")
+        batch_op.drop_column("nft_id")
@@ -0,0 +1,44 @@
+"""add user_portfolios projection
+
+Revision ID: c3a9e2f71d58
+Revises: b5e17d3c8a40
+Create Date: 2026-10-18 22:17:05.904126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a9e2f71d58'
+down_revision = 'b5e17d3c8a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ✅ create_all() may already have made it on app startup
+    if sa.inspect(op.get_bind()).has_table("user_portfolios"):
+        return
+    op.create_table(
+        "user_portfolios",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("created_count", sa.Integer(), nullable=False),
+        sa.Column("listed_count", sa.Integer(), nullable=False),
+        sa.Column("sold_count", sa.Integer(), nullable=False),
+        sa.Column("bought_count", sa.Integer(), nullable=False),
+        sa.Column("pending_count", sa.Integer(), nullable=False),
+        sa.Column("listed_value", sa.Numeric(precision=14, scale=4), nullable=False),
+        sa.Column("owned_value", sa.Numeric(precision=14, scale=4), nullable=False),
+        sa.Column("listed_ids", sa.JSON(), nullable=False),
+        sa.Column("bought_ids", sa.JSON(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+    # ✅ Rows are filled lazily on first read, or all at once with `flask portfolio rebuild`
+
+
+def downgrade():
+    op.drop_table("user_portfolios")
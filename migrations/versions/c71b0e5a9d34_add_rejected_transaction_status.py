@@ -0,0 +1,46 @@
+"""add REJECTED to the transactions.status enum
+
+Revision ID: c71b0e5a9d34
+Revises: 8f2d6a0c4b19
+Create Date: 2026-10-18 16:40:12.084417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71b0e5a9d34'
+down_revision = '8f2d6a0c4b19'
+branch_labels = None
+depends_on = None
+
+
+OLD_STATUSES = ("PENDING", "AVAILABLE", "SOLD", "LISTED")
+NEW_STATUSES = OLD_STATUSES + ("REJECTED",)
+
+
+def upgrade():
+    # ✅ Only MySQL stores the enum natively; other dialects use VARCHAR
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.alter_column(
+        "transactions",
+        "status",
+        existing_type=sa.Enum(*OLD_STATUSES, name="nftstatus"),
+        type_=sa.Enum(*NEW_STATUSES, name="nftstatus"),
+        existing_nullable=False,
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.execute("UPDATE transactions SET status = 'PENDING' WHERE status = 'REJECTED'")
+    op.alter_column(
+        "transactions",
+        "status",
+        existing_type=sa.Enum(*NEW_STATUSES, name="nftstatus"),
+        type_=sa.Enum(*OLD_STATUSES, name="nftstatus"),
+        existing_nullable=False,
+    )
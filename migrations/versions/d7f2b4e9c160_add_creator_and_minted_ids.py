@@ -0,0 +1,49 @@
+"""key nft creators and minted requests by id
+
+Revision ID: d7f2b4e9c160
+Revises: c3a9e2f71d58
+Create Date: 2026-10-18 23:02:41.337915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f2b4e9c160'
+down_revision = 'c3a9e2f71d58'
+branch_labels = None
+depends_on = None
+
+
+# table, column, foreign key, referenced table, index
+LINKS = [
+    ("nfts", "creator_id", "fk_nft_creator", "users", "ix_nfts_creator_id"),
+    ("pending_nfts", "nft_id", "fk_pending_nft_minted", "nfts", "ix_pending_nfts_nft_id"),
+]
+
+
+def upgrade():
+    for table, column, fk_name, referenced, index_name in LINKS:
+        inspector = sa.inspect(op.get_bind())
+        if column not in {c["name"] for c in inspector.get_columns(table)}:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.add_column(sa.Column(column, sa.Integer(), nullable=True))
+                batch_op.create_foreign_key(
+                    fk_name, referenced, [column], ["id"], ondelete="SET NULL"
+                )
+        existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+        if index_name not in existing:
+            op.create_index(index_name, table, [column])
+
+    # ✅ No data copy here: `flask backfill-ids` fills both columns in short
+    # chunked transactions while the site is up, and the name fallbacks in
+    # the views cover rows it hasn't reached yet
+
+
+def downgrade():
+    for table, column, fk_name, _, index_name in reversed(LINKS):
+        op.drop_index(index_name, table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(fk_name, type_="foreignkey")
+            batch_op.drop_column(column)
@@ -0,0 +1,28 @@
+"""add nfts.image_variants for resized WebP/AVIF copies
+
+Revision ID: e4a9c3f1b7d2
+Revises: 5b8e2d417f60
+Create Date: 2026-10-18 17:42:09.318255
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c3f1b7d2'
+down_revision = '5b8e2d417f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("nfts")}
+    if "image_variants" not in columns:
+        op.add_column("nfts", sa.Column("image_variants", sa.JSON(), nullable=True))
+    # ✅ Existing NFTs are filled by `flask build-image-variants`
+
+
+def downgrade():
+    with op.batch_alter_table("nfts") as batch_op:
+        batch_op.drop_column("image_variants")
@@ -0,0 +1,50 @@
+"""add mail_outbox (the durable email queue)
+
+Revision ID: f3b6d1a8c427
+Revises: d7f2b4e9c160
+Create Date: 2026-10-19 09:41:12.574302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b6d1a8c427'
+down_revision = 'd7f2b4e9c160'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ✅ create_all() may already have made it on app startup; 3c9e41b7d2a5
+    # only indexed it when present, so databases upgraded from before the
+    # outbox never got the table
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("mail_outbox"):
+        op.create_table(
+            "mail_outbox",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("recipient", sa.String(length=255), nullable=False),
+            sa.Column("subject", sa.String(length=255), nullable=False),
+            sa.Column("plain_text", sa.Text(), nullable=False),
+            sa.Column("html_content", sa.Text(), nullable=True),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("claimed_by", sa.String(length=64), nullable=True),
+            sa.Column("claimed_at", sa.DateTime(), nullable=True),
+            sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("sent_at", sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    existing = {ix["name"] for ix in sa.inspect(op.get_bind()).get_indexes("mail_outbox")}
+    if "ix_mail_outbox_status_next_attempt" not in existing:
+        op.create_index(
+            "ix_mail_outbox_status_next_attempt", "mail_outbox", ["status", "next_attempt_at"]
+        )
+
+
+def downgrade():
+    op.drop_table("mail_outbox")
@@ -1,12 +1,31 @@
+import time
+
+_IMPORT_STARTED = time.perf_counter()  # ✅ Import cost is reported as a boot phase
+
 import os
 import traceback
+import click
 from flask import Flask, render_template, flash, redirect, url_for, request, jsonify
 from flask_login import LoginManager
 from flask_mail import Mail
-from web3 import Web3
 from .utils.creating_admin import create_admin_on_startup
+from .utils.boot_timing import BootTimer
+from .utils.loaders import load_user, register_loader_listeners
+from .utils.portfolio import register_portfolio_listeners
+from .utils.address import MAX_BATCH, check_addresses, is_address
+from .utils.catalog_version import register_catalog_listeners
+from .utils.stats import init_stats
+from .utils.order_book import init_order_book
+from .utils.blob_store import register_blob_listeners
+from .utils.uploads import UploadRequest
+from .utils.static_files import init_static
+from .utils.sql_profiler import init_sql_profiler
+from .utils.db_router import init_db_router
+from .utils.price_oracle import init_price_oracle
+from .utils.mail_queue import start_mail_workers
+from .utils.view_tracker import init_view_tracker
+from .commands import register_commands
 from .config.database import db
-from flask_migrate import Migrate
 from .config.variables import (
     SECRET_KEY,
     MYSQL_DATABASE_URI,
@@ -14,9 +33,14 @@ from .config.variables import (
     MAIL_SERVER,
     MAIL_PORT,
     MAIL_USERNAME,
+    UPLOAD_MAX_BYTES,
+    STARTUP_BOOTSTRAP,
+    BOOT_TIMING_LOG,
 )
 from flask_wtf.csrf import CSRFProtect
 
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
 
 UPLOAD_FOLDER = os.path.join("server/static/uploads")
 
@@ -29,66 +53,116 @@ csrf = CSRFProtect()
 
 
 def create_app():
-    app = Flask(__name__)
-    csrf.init_app(app)
-    w3 = Web3(Web3.HTTPProvider("https://ethereum-sepolia-rpc.publicnode.com"))
-
-    # ✅ CONFIGURATIONS
-    app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
-    app.config["SECRET_KEY"] = SECRET_KEY
-    app.config["SESSION_TYPE"] = "filesystem"  # Store session data persistently
-    app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 * 1024  # 2MB limit
-
-    # DATABASE CONFIGS
-    app.config["SQLALCHEMY_DATABASE_URI"] = MYSQL_DATABASE_URI
-    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-    app.config["SQLALCHEMY_POOL_RECYCLE"] = 280
-    app.config["SQLALCHEMY_POOL_PRE_PING"] = True
-
-    # MAIL CONFIGS
-    app.config["MAIL_SERVER"] = MAIL_SERVER
-    app.config["MAIL_PORT"] = MAIL_PORT
-    app.config["MAIL_USERNAME"] = MAIL_USERNAME
-    app.config["MAIL_PASSWORD"] = MAIL_PASSWORD
-    app.config["MAIL_USE_TLS"] = True
-    app.config["MAIL_USE_SSL"] = False
-    app.config["MAIL_TIMEOUT"] = 60
-
-    # ✅ Initialize Flask-Mail and Database
-    mail.init_app(app)
-    db.init_app(app)
-
-    # ✅ Register Blueprints
-    from .views.auth import auth
-    from .views.routes import mintverse
-    from .views.admin import admin
-    from .views.user import user
-    from .views.category import category
-
-    app.register_blueprint(mintverse)
-    app.register_blueprint(auth, url_prefix="/auth")
-    app.register_blueprint(admin, url_prefix="/admin")
-    app.register_blueprint(user, url_prefix="/user")
-    app.register_blueprint(category, url_prefix="/category")
-
-    # Models
-    from . import models
-
-    create_database(app)
-    migrate = Migrate(app, db)
-
-    # Create Admin
-    with app.app_context():
-        create_admin_on_startup()
+    timer = BootTimer()
+    timer.phases["imports"] = _IMPORT_SECONDS
+
+    with timer.phase("config"):
+        app = Flask(__name__)
+        app.request_class = UploadRequest  # ✅ File uploads stream to disk in one pass
+        csrf.init_app(app)
+
+        # ✅ CONFIGURATIONS
+        app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+        app.config["SECRET_KEY"] = SECRET_KEY
+        app.config["SESSION_TYPE"] = "filesystem"  # Store session data persistently
+        app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_BYTES + 64 * 1024  # file + form fields
+
+        # DATABASE CONFIGS
+        app.config["SQLALCHEMY_DATABASE_URI"] = MYSQL_DATABASE_URI
+        app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+        app.config["SQLALCHEMY_POOL_RECYCLE"] = 280
+        app.config["SQLALCHEMY_POOL_PRE_PING"] = True
+
+        # MAIL CONFIGS
+        app.config["MAIL_SERVER"] = MAIL_SERVER
+        app.config["MAIL_PORT"] = MAIL_PORT
+        app.config["MAIL_USERNAME"] = MAIL_USERNAME
+        app.config["MAIL_PASSWORD"] = MAIL_PASSWORD
+        app.config["MAIL_USE_TLS"] = True
+        app.config["MAIL_USE_SSL"] = False
+        app.config["MAIL_TIMEOUT"] = 60
+
+    with timer.phase("extensions"):
+        # ✅ Initialize Flask-Mail and Database
+        mail.init_app(app)
+        db.init_app(app)
+
+        # ✅ Catalog/listing reads on MYSQL_REPLICA_URIS, with health and lag checks
+        init_db_router(app)
+
+        # ✅ Bump the shared catalog version on NFT changes (homepage shelves cache)
+        register_catalog_listeners()
+
+        # ✅ Keep the admin row counters in step with writes (STATS_RECONCILE_INTERVAL)
+        init_stats(app)
+
+        # ✅ Per-NFT offer books kept in step with writes; stale offers expired (OFFER_EXPIRE_INTERVAL)
+        init_order_book(app)
+
+        # ✅ Reference-count stored uploads so unused ones can be garbage-collected
+        register_blob_listeners()
+
+        # ✅ Drop cached users when their rows change (USER_CACHE_TTL)
+        register_loader_listeners()
+
+        # ✅ Refresh per-user portfolio projections on mint/sale/delete
+        register_portfolio_listeners()
+
+        # ✅ Keep the ETH/USD price warm off the request path (PRICE_ORACLE_REFRESH_INTERVAL)
+        init_price_oracle(app)
+
+        # ✅ Fingerprinted, long-cached static files (STATIC_OFFLOAD for a front proxy)
+        init_static(app)
+
+        # ✅ Query count/DB time per request, N+1 and slow-query logs (SQL_PROFILE)
+        init_sql_profiler(app)
+
+    with timer.phase("blueprints"):
+        # ✅ Register Blueprints
+        from .views.auth import auth
+        from .views.routes import mintverse
+        from .views.admin import admin
+        from .views.user import user
+        from .views.category import category
+
+        app.register_blueprint(mintverse)
+        app.register_blueprint(auth, url_prefix="/auth")
+        app.register_blueprint(admin, url_prefix="/admin")
+        app.register_blueprint(user, url_prefix="/user")
+        app.register_blueprint(category, url_prefix="/category")
+
+        # Models
+        from . import models
+
+        # ✅ Flask-Migrate pulls in alembic (~150ms); only `flask db ...` needs it
+        if click.get_current_context(silent=True) is not None:
+            from flask_migrate import Migrate
+
+            Migrate(app, db)
+
+    # ✅ Schema + admin bootstrap live in `flask init-db`; STARTUP_BOOTSTRAP=true
+    # keeps the old run-on-every-boot behaviour for local development
+    if STARTUP_BOOTSTRAP:
+        with timer.phase("bootstrap"):
+            create_database(app)
+            with app.app_context():
+                create_admin_on_startup()
+
+    with timer.phase("workers"):
+        # ✅ Background mail outbox workers + CLI commands
+        start_mail_workers(app)
+
+        # ✅ Buffered NFT view counts, flushed in bulk
+        init_view_tracker(app)
+        register_commands(app)
 
     # ✅ Setup Login Manager
     login_manager = LoginManager()
     login_manager.login_view = "auth.login_page"
     login_manager.init_app(app)
 
-    @login_manager.user_loader
-    def load_user(usr_id):
-        return models.User.query.get(usr_id)
+    # ✅ Optionally served from a short-lived cache (utils/loaders.py)
+    login_manager.user_loader(load_user)
 
     @login_manager.unauthorized_handler
     def handle_needs_login():
@@ -100,6 +174,15 @@ def create_app():
     def page_not_found(error):
         return render_template("errors/error-404.html", title="404 ERROR | MintVerse")
 
+    @app.errorhandler(413)
+    def upload_too_large(error):
+        # ✅ Raised mid-stream by the upload ingester; send the user back to the form
+        flash(
+            f"Uploaded file is too large (max {round(UPLOAD_MAX_BYTES / (1024 * 1024), 1):g} MB).",
+            "warning",
+        )
+        return redirect(request.referrer or url_for("mintverse.home_page"))
+
     @app.errorhandler(Exception)
     def server_error(error):
         traceback.print_exc()
@@ -108,6 +191,7 @@ def create_app():
             "errors/server-error.html", title="SERVER ERROR | MintVerse"
         )
 
+    @csrf.exempt  # ✅ Read-only check, nothing is stored
     @app.route("/verify_wallet", methods=["POST"])
     def verify_wallet():
         wallet_address = request.json.get("address")
@@ -118,7 +202,7 @@ def create_app():
                 400,
             )
 
-        if w3.is_address(wallet_address):
+        if is_address(wallet_address):
             return jsonify({"status": "success", "message": "Wallet verified!"})
         else:
             return (
@@ -126,6 +210,30 @@ def create_app():
                 400,
             )
 
+    @csrf.exempt
+    @app.route("/verify_wallets", methods=["POST"])
+    def verify_wallets():
+        """✅ Batch form of /verify_wallet: {"addresses": [...]} -> one result per address"""
+        addresses = (request.get_json(silent=True) or {}).get("addresses")
+
+        if not isinstance(addresses, list) or not addresses:
+            return (
+                jsonify({"status": "error", "message": "Wallet addresses missing!"}),
+                400,
+            )
+        if len(addresses) > MAX_BATCH:
+            return (
+                jsonify(
+                    {
+                        "status": "error",
+                        "message": f"At most {MAX_BATCH} addresses per request!",
+                    }
+                ),
+                400,
+            )
+
+        return jsonify({"status": "success", "results": check_addresses(addresses)})
+
     # Route for updating the wallet in backend storage
     @app.route("/update_wallet", methods=["POST"])
     def update_wallet():
@@ -137,7 +245,7 @@ def create_app():
                 400,
             )
 
-        if not w3.is_address(wallet_address):
+        if not is_address(wallet_address):
             return (
                 jsonify({"status": "error", "message": "Invalid wallet address!"}),
                 400,
@@ -151,6 +259,9 @@ def create_app():
             {"status": "success", "message": "Wallet stored!", "data": wallet_data}
         )
 
+    app.extensions["boot_timings"] = timer.data()
+    if BOOT_TIMING_LOG:
+        timer.log()
     return app
 
 
@@ -0,0 +1,205 @@
+import time
+
+import click
+
+from .config.database import db
+
+
+def register_commands(app):
+    """✅ `flask <command>` maintenance/worker commands"""
+
+    @app.cli.command("mail-worker")
+    @click.option("--workers", default=2, show_default=True, help="Worker threads.")
+    @click.option("--once", is_flag=True, help="Drain the outbox once and exit.")
+    def mail_worker(workers, once):
+        """Send queued emails from the mail outbox."""
+        from .utils.mail_queue import (
+            SMTPSession,
+            process_batch,
+            start_mail_workers,
+            stop_mail_workers,
+        )
+
+        if once:
+            session = SMTPSession()
+            total = 0
+            try:
+                while True:
+                    claimed = process_batch(session, "cli-once")
+                    if not claimed:
+                        break
+                    total += claimed
+            finally:
+                session.close()
+                db.session.remove()
+            click.echo(f"Processed {total} queued email(s).")
+            return
+
+        start_mail_workers(app, workers)
+        click.echo(f"Mail workers running ({workers}). Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            stop_mail_workers()
+
+    @app.cli.command("reconcile-stats")
+    @click.option(
+        "--table",
+        "tables",
+        multiple=True,
+        help="Counter to recount (repeatable). Defaults to all of them.",
+    )
+    def reconcile_stats(tables):
+        """Recount the admin dashboard counters from the source tables."""
+        from .utils.stats import TRACKED, reconcile
+
+        unknown = set(tables) - set(TRACKED)
+        if unknown:
+            raise click.BadParameter(
+                f"Unknown counter(s): {', '.join(sorted(unknown))}", param_hint="--table"
+            )
+        started = time.perf_counter()
+        values = reconcile(tables or None)
+        for (name, bucket), value in sorted(values.items()):
+            click.echo(f"{name:<16} {bucket:<14} {value}")
+        click.echo(f"Reconciled in {(time.perf_counter() - started) * 1000:.0f} ms.")
+
+    @app.cli.command("build-image-variants")
+    @click.option("--force", is_flag=True, help="Rebuild NFTs that already have variants.")
+    @click.option("--batch-size", default=100, show_default=True)
+    def build_image_variants(force, batch_size):
+        """Generate resized WebP/AVIF copies for existing NFT images."""
+        from .models import NFT
+        from .utils.images import build_variants
+
+        query = db.session.query(NFT.id, NFT.nft_image).order_by(NFT.id)
+        if not force:
+            query = query.filter(NFT.image_variants.is_(None))
+        rows = query.all()
+
+        built = skipped = 0
+        for start in range(0, len(rows), batch_size):
+            for nft_id, nft_image in rows[start : start + batch_size]:
+                variants = build_variants(nft_image)
+                if variants is None:
+                    skipped += 1
+                    continue
+                db.session.query(NFT).filter(NFT.id == nft_id).update(
+                    {"image_variants": variants}, synchronize_session=False
+                )
+                built += 1
+            db.session.commit()
+        click.echo(f"Built variants for {built} NFT(s); skipped {skipped}.")
+
+    @app.cli.group("blobs")
+    def blobs():
+        """Maintain the content-addressed upload store."""
+
+    @blobs.command("gc")
+    @click.option("--grace", type=int, default=None, help="Seconds (default BLOB_GC_GRACE_SECONDS).")
+    def blobs_gc(grace):
+        """Delete uploads no row references any more."""
+        from .utils.blob_store import collect_garbage, remove_stray_files
+
+        removed = 0
+        while True:
+            batch = collect_garbage(grace)
+            removed += batch
+            if batch < 1000:
+                break
+        stray = remove_stray_files(grace)
+        click.echo(f"Removed {removed} unreferenced blob(s) and {stray} stray file(s).")
+
+    @blobs.command("recount")
+    def blobs_recount():
+        """Recompute blob reference counts from the referencing rows."""
+        from .utils.blob_store import recount
+
+        click.echo(f"Corrected {recount()} reference count(s).")
+
+    @blobs.command("import-legacy")
+    def blobs_import_legacy():
+        """Move uuid-named uploads into the blob store, merging duplicates."""
+        from .utils.blob_store import import_legacy
+
+        imported, freed = import_legacy()
+        click.echo(f"Imported {imported} file(s); {freed / 1024:.0f} KiB freed by duplicates.")
+
+    @app.cli.group("offers")
+    def offers():
+        """Maintain the per-NFT offer books."""
+
+    @offers.command("expire")
+    def offers_expire():
+        """Mark pending offers past their expiry as Expired."""
+        from .utils.order_book import expire_offers
+
+        click.echo(f"Expired {expire_offers()} offer(s).")
+
+    @offers.command("rebuild")
+    def offers_rebuild():
+        """Load every order book from the offers table (reports their size)."""
+        from .utils.order_book import rebuild
+
+        books, count = rebuild()
+        click.echo(f"Loaded {count} pending offer(s) into {books} order book(s).")
+
+    @app.cli.group("portfolio")
+    def portfolio():
+        """Maintain the per-user portfolio projections."""
+
+    @portfolio.command("rebuild")
+    @click.option("--batch-size", default=500, show_default=True, help="Users per batch.")
+    def portfolio_rebuild(batch_size):
+        """Recompute every user's portfolio from the nfts/pending_nfts tables."""
+        from .utils.portfolio import rebuild
+
+        started = time.perf_counter()
+        written = rebuild(batch_size)
+        click.echo(f"Rebuilt {written} portfolio(s) in {time.perf_counter() - started:.1f}s.")
+
+    @app.cli.command("backfill-ids")
+    @click.option("--batch-size", default=1000, show_default=True, help="Rows per transaction.")
+    @click.option("--pause", default=0.05, show_default=True, help="Seconds between chunks.")
+    def backfill_ids(batch_size, pause):
+        """Fill nfts.creator_id and pending_nfts.nft_id from the name columns."""
+        from .utils.id_backfill import backfill_creator_ids, backfill_minted_links
+
+        click.echo(f"nfts.creator_id: {backfill_creator_ids(batch_size, pause)} row(s) linked.")
+        click.echo(f"pending_nfts.nft_id: {backfill_minted_links(batch_size, pause)} row(s) linked.")
+
+    @app.cli.command("compress-static")
+    @click.option("--min-size", default=1024, show_default=True, help="Skip smaller files.")
+    def compress_static_command(min_size):
+        """Precompress CSS/JS/SVG assets to .gz (and .br if brotli is installed)."""
+        from .utils.static_files import compress_static
+
+        written, saved = compress_static(app.static_folder, min_size)
+        click.echo(f"Wrote {written} compressed file(s), {saved / 1024:.0f} KiB smaller.")
+
+    @app.cli.command("init-db")
+    @click.option("--no-admin", is_flag=True, help="Only create missing tables.")
+    def init_db(no_admin):
+        """Create missing tables and the admin user (run once per deploy)."""
+        from flask_migrate import stamp
+        from sqlalchemy import inspect
+
+        from . import create_database
+        from .utils.creating_admin import create_admin_on_startup
+
+        fresh = not inspect(db.engine).get_table_names()
+        create_database(app)
+        if fresh:
+            stamp()  # ✅ Tables were just created at the latest schema
+        else:
+            click.echo("Existing database: run `flask db upgrade` for pending migrations.")
+        if not no_admin:
+            create_admin_on_startup()
+
+    @app.cli.command("create-admin")
+    def create_admin():
+        """Create the admin user from ADMIN_NAME/ADMIN_EMAIL/ADMIN_PASSWORD if missing."""
+        from .utils.creating_admin import create_admin_on_startup
+
+        create_admin_on_startup()
@@ -1,4 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 
+from ..utils.db_router import RoutingSession
+
 # Initialize SQLAlchemy and Flask-Migrate
-db = SQLAlchemy()
+# ✅ RoutingSession sends read-only requests to MYSQL_REPLICA_URIS when set
+db = SQLAlchemy(session_options={"class_": RoutingSession})
@@ -8,12 +8,77 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 # DATABASE VARIABLES
 MYSQL_DATABASE_URI = os.getenv("MYSQL_DATABASE_URI")
 
+# READ REPLICA VARIABLES (comma-separated; catalog and admin listing GETs read from them)
+MYSQL_REPLICA_URIS = [u.strip() for u in os.getenv("MYSQL_REPLICA_URIS", "").split(",") if u.strip()]
+MYSQL_REPLICA_WEIGHTS = [int(w) for w in os.getenv("MYSQL_REPLICA_WEIGHTS", "").split(",") if w.strip()]
+REPLICA_MAX_LAG = int(os.getenv("REPLICA_MAX_LAG", 5))  # seconds behind before reads fall back to the primary
+REPLICA_HEALTH_INTERVAL = int(os.getenv("REPLICA_HEALTH_INTERVAL", 10))
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 15))  # a writer's reads stay on the primary
+REPLICA_READ_BLUEPRINTS = [b.strip() for b in os.getenv("REPLICA_READ_BLUEPRINTS", "mintverse,category").split(",") if b.strip()]
+
+# CACHE VARIABLES (shared by every worker on the host)
+CACHE_FOLDER = os.getenv("CACHE_FOLDER", os.path.join("server", "cache"))
+
+# SEARCH VARIABLES ("auto" = MySQL FULLTEXT when available, else in-process index)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+# PRICE ORACLE VARIABLES (sources are tried in order, e.g. "cryptocompare,file:/path/eth.json")
+PRICE_ORACLE_SOURCES = os.getenv("PRICE_ORACLE_SOURCES", "cryptocompare")
+PRICE_ORACLE_TTL = int(os.getenv("PRICE_ORACLE_TTL", 60))
+PRICE_ORACLE_STALE_TTL = int(os.getenv("PRICE_ORACLE_STALE_TTL", 900))
+PRICE_ORACLE_REFRESH_INTERVAL = int(os.getenv("PRICE_ORACLE_REFRESH_INTERVAL", 0))
+
+# VIEW TRACKER VARIABLES (buffered buy-page views are written every N seconds)
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", 5))
+VIEW_FLUSH_MAX_PENDING = int(os.getenv("VIEW_FLUSH_MAX_PENDING", 1000))
+
+# IMAGE VARIANT VARIABLES (resized copies of NFT images; formats are tried best first)
+IMAGE_VARIANT_WIDTHS = [int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "320,640,1280").split(",")]
+IMAGE_VARIANT_FORMATS = [f.strip() for f in os.getenv("IMAGE_VARIANT_FORMATS", "avif,webp").split(",") if f.strip()]
+
+# STARTUP VARIABLES (schema + admin bootstrap run via `flask init-db`, not in every worker)
+STARTUP_BOOTSTRAP = os.getenv("STARTUP_BOOTSTRAP", "false").lower() == "true"
+BOOT_TIMING_LOG = os.getenv("BOOT_TIMING_LOG", "false").lower() == "true"
+
+# STATIC FILE VARIABLES (STATIC_OFFLOAD: "", "x-accel" for nginx or "x-sendfile")
+STATIC_OFFLOAD = os.getenv("STATIC_OFFLOAD", "").lower()
+STATIC_ACCEL_PREFIX = os.getenv("STATIC_ACCEL_PREFIX", "/_static/")  # nginx `internal` location
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", 3600))  # non-fingerprinted URLs
+
+# UPLOAD BLOB STORE VARIABLES (unreferenced fresh uploads are kept this long before GC)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 2 * 1024 * 1024))  # per file, streamed to disk
+BLOB_GC_GRACE_SECONDS = int(os.getenv("BLOB_GC_GRACE_SECONDS", 3600))
+
+# USER CACHE VARIABLES (seconds load_user may serve a cached row; 0 = always query)
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 0))
+
+# OFFER VARIABLES (offers lapse after OFFER_TTL_HOURS, 0 = never; expiry sweep every OFFER_EXPIRE_INTERVAL s)
+OFFER_TTL_HOURS = int(os.getenv("OFFER_TTL_HOURS", 168))
+OFFER_EXPIRE_INTERVAL = int(os.getenv("OFFER_EXPIRE_INTERVAL", 600))
+ORDER_BOOK_TTL = int(os.getenv("ORDER_BOOK_TTL", 30))  # seconds a worker trusts its in-memory book
+ORDER_BOOK_PRELOAD = os.getenv("ORDER_BOOK_PRELOAD", "false").lower() == "true"
+
+# SQL PROFILER VARIABLES (per-request query count/time, Server-Timing; always on in debug)
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() == "true"
+SQL_SLOW_QUERY_MS = int(os.getenv("SQL_SLOW_QUERY_MS", 200))
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 5))  # same statement this many times
+
+# STATS VARIABLES (0 = only reconcile counters via `flask reconcile-stats`)
+STATS_RECONCILE_INTERVAL = int(os.getenv("STATS_RECONCILE_INTERVAL", 0))
+
 # MAIL VARIABLES
 MAIL_SERVER = os.getenv("MAIL_SERVER")
 MAIL_PORT = os.getenv("MAIL_PORT")
 MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
 MAIL_USERNAME = os.getenv("MAIL_USERNAME")
 MAIL_DEFAULT_FROM = os.getenv("MAIL_DEFAULT_FROM")
+MAIL_SMTP_SSL = os.getenv("MAIL_SMTP_SSL", "true").lower() == "true"  # false for a local debug SMTP server
+
+# MAIL QUEUE VARIABLES (set MAIL_QUEUE_WORKERS=0 when running `flask mail-worker` separately)
+MAIL_QUEUE_WORKERS = int(os.getenv("MAIL_QUEUE_WORKERS", 2))
+MAIL_QUEUE_BATCH_SIZE = int(os.getenv("MAIL_QUEUE_BATCH_SIZE", 20))
+MAIL_QUEUE_MAX_ATTEMPTS = int(os.getenv("MAIL_QUEUE_MAX_ATTEMPTS", 6))
+MAIL_QUEUE_POLL_INTERVAL = int(os.getenv("MAIL_QUEUE_POLL_INTERVAL", 5))
 
 
 ADMIN_NAME = os.getenv("ADMIN_NAME")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, BigInteger, Integer, DateTime
+from ..config.database import db
+from datetime import datetime
+
+
+class Blob(db.Model):
+    """✅ One stored upload per unique content hash, shared by every row that uses it"""
+
+    __tablename__ = "blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    path = Column(String(120), nullable=False)  # e.g. "blobs/ab/ab12….jpg" under uploads/
+    size = Column(BigInteger, nullable=False, default=0)
+    ref_count = Column(Integer, nullable=False, default=0, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    released_at = Column(DateTime, nullable=True)  # set when ref_count drops to 0
+
+    def data(self):
+        return {
+            "sha256": self.sha256,
+            "path": self.path,
+            "size": self.size,
+            "ref_count": self.ref_count,
+            "created_at": self.created_at,
+            "released_at": self.released_at,
+        }
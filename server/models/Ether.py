@@ -7,6 +7,10 @@ from ..config.database import db  # Assuming this is your db instance
 
 class Ether(db.Model):
     __tablename__ = "ethers"
+    __table_args__ = (
+        # ✅ One wallet per user; every balance lookup is filter_by(user_id=...)
+        db.Index("uq_ethers_user_id", "user_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
@@ -49,57 +53,46 @@ class Ether(db.Model):
 
     # ... (rest of your methods remain the same) ...
 
-    def update_wallet_balance(self, amount):
-        if not isinstance(amount, Decimal):
-            amount = Decimal(str(amount))
-        if amount < 0 and abs(amount) > self.main_wallet_balance:
-            raise ValueError("Insufficient funds in main wallet")
+    # ✅ Balance changes go through the ledger (utils/ledger.py): one atomic
+    # conditional UPDATE plus an appended LedgerEntry, committed here.
+    def _post(self, account, amount, kind):
+        from ..utils.ledger import post, InsufficientFunds
+
         try:
-            self.main_wallet_balance += amount
-            # self.last_updated = func.now() # onupdate handles this if the record is flushed
+            post(self.user_id, account, amount, kind)
             db.session.commit()
+        except InsufficientFunds as e:
+            db.session.rollback()
+            raise ValueError(str(e))
         except Exception as e:
             db.session.rollback()
-            print(f"Error updating wallet balance: {e}")
+            print(f"Error updating {account} balance: {e}")
+
+    def update_wallet_balance(self, amount):
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        self._post("main", amount, "adjustment")
 
     def update_gas_fee_balance(self, amount):
         if not isinstance(amount, Decimal):
             amount = Decimal(str(amount))
-        if amount < 0 and abs(amount) > self.gas_fee_balance:
-            raise ValueError("Insufficient gas fee balance")
-        try:
-            self.gas_fee_balance += amount
-            # self.last_updated = func.now() # onupdate handles this
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            print(f"Error updating gas fee balance: {e}")
+        self._post("gas", amount, "adjustment")
 
     def set_wallet_balance(self, amount):
         if not isinstance(amount, Decimal):
             amount = Decimal(str(amount))
         if amount < 0:
             raise ValueError("Balance cannot be negative")
-        try:
-            self.main_wallet_balance = amount
-            # self.last_updated = func.now() # onupdate handles this
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            print(f"Error setting wallet balance: {e}")
+        db.session.refresh(self)
+        self._post("main", amount - self.main_wallet_balance, "adjustment")
 
     def set_gas_fee_balance(self, amount):
         if not isinstance(amount, Decimal):
             amount = Decimal(str(amount))
         if amount < 0:
             raise ValueError("Gas fee balance cannot be negative")
-        try:
-            self.gas_fee_balance = amount
-            # self.last_updated = func.now() # onupdate handles this
-            db.session.commit()
-        except Exception as e:
-            db.session.rollback()
-            print(f"Error setting gas fee balance: {e}")
+        db.session.refresh(self)
+        self._post("gas", amount - self.gas_fee_balance, "adjustment")
 
     def data(self):
         return {
@@ -5,6 +5,10 @@ from ..config.database import db
 
 class GasFeeDeposit(db.Model):
     __tablename__ = "gas_fee_deposits"
+    __table_args__ = (
+        db.Index("ix_gas_fee_deposits_status_timestamp", "status", "timestamp"),
+        db.Index("ix_gas_fee_deposits_user_id", "user_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     ref_number = db.Column(
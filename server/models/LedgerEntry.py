@@ -0,0 +1,41 @@
+from sqlalchemy import func
+from ..config.database import db
+
+
+class LedgerEntry(db.Model):
+    """✅ Append-only balance ledger; Ether keeps the cached running balances"""
+
+    __tablename__ = "ledger_entries"
+    __table_args__ = (
+        # ✅ Per-user history, newest first (keyset on id)
+        db.Index("ix_ledger_entries_user_account_id", "user_id", "account", "id"),
+        # ✅ A deposit / purchase / withdrawal can only ever be posted once
+        db.UniqueConstraint("account", "reference", name="uq_ledger_entries_reference"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="CASCADE", name="fk_ledger_entry_user"),
+        nullable=False,
+    )
+    account = db.Column(db.String(10), nullable=False)  # "main" | "gas"
+    amount = db.Column(db.Numeric(precision=10, scale=4), nullable=False)  # signed
+    balance_after = db.Column(db.Numeric(precision=10, scale=4), nullable=False)
+    kind = db.Column(db.String(30), nullable=False)
+    reference = db.Column(db.String(64), nullable=True)
+    timestamp = db.Column(db.DateTime(timezone=True), default=func.now())
+
+    def data(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "account": self.account,
+            "amount": str(self.amount),
+            "balance_after": str(self.balance_after),
+            "kind": self.kind,
+            "reference": self.reference,
+            "timestamp": (
+                self.timestamp.strftime("%d-%m-%Y %H:%M:%S") if self.timestamp else None
+            ),
+        }
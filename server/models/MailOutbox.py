@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from ..config.database import db
+from datetime import datetime
+from .enums import MailStatus
+
+
+class MailOutbox(db.Model):
+    """✅ Durable outbound email queue, drained by the mail workers"""
+
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        # ✅ Workers claim "pending and due" rows oldest-first
+        Index("ix_mail_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    plain_text = Column(Text, nullable=False)
+    html_content = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, default=MailStatus.PENDING.value)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    claimed_by = Column(String(64), nullable=True)
+    claimed_at = Column(DateTime, nullable=True)
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.now)
+    created_at = Column(DateTime, nullable=False, default=datetime.now)
+    sent_at = Column(DateTime, nullable=True)
+
+    def __init__(self, recipient, subject, plain_text, html_content=None):
+        self.recipient = recipient
+        self.subject = subject
+        self.plain_text = plain_text
+        self.html_content = html_content
+        self.status = MailStatus.PENDING.value
+        self.attempts = 0
+        self.next_attempt_at = datetime.now()
+
+    def data(self):
+        return {
+            "id": self.id,
+            "recipient": self.recipient,
+            "subject": self.subject,
+            "status": self.status,
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "next_attempt_at": self.next_attempt_at,
+            "created_at": self.created_at,
+            "sent_at": self.sent_at,
+        }
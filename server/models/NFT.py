@@ -1,12 +1,36 @@
 import uuid
 from sqlalchemy import func
 from ..config.database import db
-from ..models import NFTStatus
+from .enums import NFTStatus
 from flask_login import current_user
+from ..utils.images import srcsets, thumbnail_url
 
 
 class NFT(db.Model):
     __tablename__ = "nfts"
+    __table_args__ = (
+        # ✅ Backs MySQLSearchBackend (utils/search.py); skipped on other dialects
+        db.Index(
+            "ft_nfts_search",
+            "nft_name",
+            "category",
+            "collection_name",
+            "creator",
+            "description",
+            mysql_prefix="FULLTEXT",
+        ).ddl_if(dialect="mysql"),
+        # ✅ Catalog keyset pages and homepage shelves (category/status + newest first)
+        db.Index(
+            "ix_nfts_category_status_timestamp", "category", "status", "timestamp", "id"
+        ),
+        db.Index("ix_nfts_status_timestamp", "status", "timestamp", "id"),
+        db.Index("ix_nfts_timestamp_id", "timestamp", "id"),
+        # ✅ Creator pages, owner's listed NFTs, buyer's collection
+        db.Index("ix_nfts_creator", "creator"),
+        db.Index("ix_nfts_creator_id", "creator_id"),
+        db.Index("ix_nfts_user_status", "user_id", "status"),
+        db.Index("ix_nfts_buyer_status", "buyer_id", "status"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     ref_number = db.Column(
@@ -22,8 +46,14 @@ class NFT(db.Model):
         db.Numeric(precision=5, scale=2), nullable=False, default=0.00
     )
     views = db.Column(db.Integer, nullable=False, default=0)
+    image_variants = db.Column(db.JSON, nullable=True)  # ✅ utils/images.build_variants()
     status = db.Column(db.String(50), nullable=False, default=NFTStatus.LISTED.value)
-    creator = db.Column(db.String(100), nullable=False)
+    creator = db.Column(db.String(100), nullable=False)  # ✅ Display name (search, cards)
+    creator_id = db.Column(
+        db.Integer,
+        db.ForeignKey("users.id", ondelete="SET NULL", name="fk_nft_creator"),
+        nullable=True,  # ✅ NULL: creator name typed by an admin that matches no user
+    )
     buyer = db.Column(db.String(100), nullable=True)
     buyer_id = db.Column(
         db.Integer,
@@ -39,18 +69,15 @@ class NFT(db.Model):
         ),  # ✅ Explicitly name the constraint
         nullable=False,
     )
-    timestamp = db.Column(db.DateTime(timezone=True), default=func.now())
-
-    def increment_views(self):
-        """Increase NFT view count."""
-        self.views += 1
-        db.session.commit()
+    timestamp = db.Column(db.DateTime(timezone=True), nullable=False, default=func.now())  # ✅ Catalog cursor key
 
     def serialize(self):
         return {
             "id": self.id,
             "nft_name": self.nft_name,
             "nft_image": self.nft_image,
+            "thumbnail": thumbnail_url(self.image_variants, self.nft_image),
+            "image_srcset": srcsets(self.image_variants),
             "category": self.category,
             "price": str(
                 self.price
@@ -72,6 +99,8 @@ class NFT(db.Model):
             "ref_number": self.ref_number,
             "nft_name": self.nft_name,
             "nft_image": self.nft_image,
+            "thumbnail": thumbnail_url(self.image_variants, self.nft_image),
+            "image_srcset": srcsets(self.image_variants),
             "category": self.category,
             "collection_name": self.collection_name,
             "price": str(self.price),
@@ -4,6 +4,15 @@ from ..config.database import db
 
 class Offers(db.Model):
     __tablename__ = "offers"
+    __table_args__ = (
+        # ✅ User's pending offers / offer history, admin offers listing
+        db.Index("ix_offers_user_action", "user_id", "action"),
+        db.Index("ix_offers_user_timestamp", "user_id", "timestamp"),
+        db.Index("ix_offers_action_timestamp", "action", "timestamp"),
+        # ✅ Order book: an NFT's pending offers, best price first
+        db.Index("ix_offers_nft_action_price", "nft_id", "action", "offered_price"),
+        db.Index("ix_offers_action_expires", "action", "expires_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     nft_image = db.Column(db.String(255), nullable=False)
@@ -13,15 +22,20 @@ class Offers(db.Model):
     action = db.Column(db.String(20), nullable=False, default="Pending")
     timestamp = db.Column(db.DateTime(timezone=True), default=func.now())
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    nft_id = db.Column(db.Integer, db.ForeignKey("nfts.id", ondelete="SET NULL"), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)  # ✅ NULL never expires
     date_created = db.Column(db.DateTime(timezone=True), default=func.now())
 
-    def __init__(self, nft_image, nft_name, offered_price, buyer, user_id, action="Pending"):
+    def __init__(self, nft_image, nft_name, offered_price, buyer, user_id, action="Pending",
+                 nft_id=None, expires_at=None):
         self.nft_image = nft_image
         self.nft_name = nft_name
         self.offered_price = offered_price
         self.buyer = buyer
         self.user_id = user_id
         self.action = action
+        self.nft_id = nft_id
+        self.expires_at = expires_at
 
     def data(self):
         return {
@@ -33,5 +47,7 @@ class Offers(db.Model):
             "action": self.action,
             "timestamp": self.timestamp.strftime("%d-%m-%Y %H:%M:%S"),
             "user_id": self.user_id,
+            "nft_id": self.nft_id,
+            "expires_at": self.expires_at.strftime("%d-%m-%Y %H:%M:%S") if self.expires_at else None,
             "date_created": self.date_created.strftime("%d-%m-%Y %H:%M:%S"),
         }
\ No newline at end of file
@@ -1,11 +1,16 @@
 import uuid  # ✅ Import UUID for generating unique reference numbers
 from sqlalchemy import func
 from ..config.database import db
-from ..models import NFTStatus
+from .enums import NFTStatus
 
 
 class PendingNFTs(db.Model):
     __tablename__ = "pending_nfts"
+    __table_args__ = (
+        db.Index("ix_pending_nfts_user_id", "user_id"),
+        db.Index("ix_pending_nfts_timestamp", "timestamp"),
+        db.Index("ix_pending_nfts_nft_id", "nft_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     nft_name = db.Column(db.String(100), unique=True, nullable=False)
@@ -23,3 +28,10 @@ class PendingNFTs(db.Model):
         db.Enum(NFTStatus), nullable=False, default=NFTStatus.PENDING
     )  # ✅ Use Enum
     timestamp = db.Column(db.DateTime(timezone=True), default=func.now())
+    nft_id = db.Column(
+        db.Integer,
+        db.ForeignKey("nfts.id", ondelete="SET NULL", name="fk_pending_nft_minted"),
+        nullable=True,
+    )  # ✅ The NFT this request was minted as (set on approval)
+
+    nft = db.relationship("NFT", foreign_keys=[nft_id])
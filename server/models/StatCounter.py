@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from ..config.database import db
+from datetime import datetime
+
+
+class StatCounter(db.Model):
+    """✅ Pre-aggregated row counts (per table and status) read by the admin pages"""
+
+    __tablename__ = "stat_counters"
+
+    name = Column(String(64), primary_key=True)  # e.g. "wallet_deposits"
+    bucket = Column(String(32), primary_key=True)  # status value, or "all"
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def data(self):
+        return {
+            "name": self.name,
+            "bucket": self.bucket,
+            "value": self.value,
+            "updated_at": self.updated_at,
+        }
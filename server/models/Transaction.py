@@ -1,12 +1,16 @@
 import uuid
 from sqlalchemy import func
-from ..models import NFTStatus
+from .enums import NFTStatus
 from ..models import User
 from ..config.database import db
 
 
 class Transaction(db.Model):
     __tablename__ = "transactions"
+    __table_args__ = (
+        db.Index("ix_transactions_nft_status", "nft_id", "status"),
+        db.Index("ix_transactions_status_timestamp", "status", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     ref_number = db.Column(
@@ -8,6 +8,15 @@ from sqlalchemy.sql import func
 
 class User(db.Model, UserMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        # ✅ Backs MySQLSearchBackend (utils/search.py); skipped on other dialects
+        db.Index("ft_users_search", "name", "email", mysql_prefix="FULLTEXT").ddl_if(
+            dialect="mysql"
+        ),
+        # ✅ Creator -> owner lookups (filter_by(name=nft.creator)) and role checks
+        db.Index("ix_users_name", "name"),
+        db.Index("ix_users_role", "role"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     usr_id = db.Column(
@@ -135,29 +144,3 @@ class User(db.Model, UserMixin):
             "date_created": self.date_created.strftime("%d-%m-%Y %H:%M:%S"),
         }
 
-
-import uuid
-import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-from ..config.database import db
-from flask_login import UserMixin
-from sqlalchemy.sql import func
-
-
-class User(db.Model, UserMixin):
-    __tablename__ = "users"
-
-    id = db.Column(db.Integer, primary_key=True)
-    usr_id = db.Column(
-        db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4())
-    )
-    name = db.Column(db.String(80), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password = db.Column(db.String(200), nullable=False)
-    store_password = db.Column(db.String(200), nullable=False)
-    role = db.Column(db.String(10), default="user")
-    is_email_verified = db.Column(db.Boolean, default=False)
-
-    # ✅ Added Verification Code Fields
-    verification_code = db.Column(db.String(6), nullable=True)
-    verification_code_expiration = db.Column(db.DateTime, nullable=True)
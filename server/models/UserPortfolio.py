@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, JSON, ForeignKey
+from ..config.database import db
+from datetime import datetime
+
+
+class UserPortfolio(db.Model):
+    """✅ Per-user holdings projection (utils/portfolio.py), read with one primary-key lookup"""
+
+    __tablename__ = "user_portfolios"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_count = Column(Integer, nullable=False, default=0)  # NFTs minted by the user
+    listed_count = Column(Integer, nullable=False, default=0)  # ... still for sale
+    sold_count = Column(Integer, nullable=False, default=0)  # ... sold to someone
+    bought_count = Column(Integer, nullable=False, default=0)
+    pending_count = Column(Integer, nullable=False, default=0)  # minting requests awaiting approval
+    listed_value = Column(Numeric(precision=14, scale=4), nullable=False, default=0)
+    owned_value = Column(Numeric(precision=14, scale=4), nullable=False, default=0)
+    listed_ids = Column(JSON, nullable=False, default=list)  # newest first
+    bought_ids = Column(JSON, nullable=False, default=list)
+    last_activity_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=datetime.now)
+
+    def data(self):
+        return {
+            "user_id": self.user_id,
+            "created_count": self.created_count,
+            "listed_count": self.listed_count,
+            "sold_count": self.sold_count,
+            "bought_count": self.bought_count,
+            "pending_count": self.pending_count,
+            "listed_value": str(self.listed_value),
+            "owned_value": str(self.owned_value),
+            "listed_ids": self.listed_ids,
+            "bought_ids": self.bought_ids,
+            "last_activity_at": self.last_activity_at,
+            "updated_at": self.updated_at,
+        }
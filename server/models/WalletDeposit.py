@@ -5,6 +5,11 @@ from ..config.database import db
 
 class WalletDeposit(db.Model):
     __tablename__ = "wallet_deposits"
+    __table_args__ = (
+        # ✅ Admin listing is ORDER BY status, timestamp DESC
+        db.Index("ix_wallet_deposits_status_timestamp", "status", "timestamp"),
+        db.Index("ix_wallet_deposits_user_id", "user_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     ref_number = db.Column(
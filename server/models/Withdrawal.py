@@ -11,6 +11,10 @@ class WithdrawalMethod(enum.Enum):
 
 class Withdrawal(db.Model):
     __tablename__ = "withdrawals"
+    __table_args__ = (
+        db.Index("ix_withdrawals_status_timestamp", "status", "timestamp"),
+        db.Index("ix_withdrawals_user_id", "user_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)  # Primary key
     transaction_id = db.Column(db.String(36), unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
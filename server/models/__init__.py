@@ -9,4 +9,10 @@ from .GasFeeDeposit import GasFeeDeposit
 from .Ether import Ether
 from .WalletDeposit import WalletDeposit
 from .Contact import Contact
+from .MailOutbox import MailOutbox
+from .LedgerEntry import LedgerEntry
+from .StatCounter import StatCounter
+from .Blob import Blob
+from .UserPortfolio import UserPortfolio
 from .enums import NFTStatus
+from .enums import MailStatus
@@ -6,3 +6,11 @@ class NFTStatus(Enum):
     AVAILABLE = "Available"
     SOLD = "Sold"
     LISTED = "Listed"
+    REJECTED = "Rejected"  # ✅ Transactions only
+
+
+class MailStatus(Enum):
+    PENDING = "Pending"
+    SENDING = "Sending"
+    SENT = "Sent"
+    FAILED = "Failed"
@@ -10,6 +10,17 @@ style.innerHTML = `
 `;
 document.head.appendChild(style);
 
+// RESPONSIVE NFT IMAGE: AVIF/WEBP VARIANTS WITH THE ORIGINAL AS FALLBACK (SEE utils/images.py)
+function nftPicture(nft, attrs, sizes = '(max-width: 768px) 50vw, 320px') {
+  const image = nft.nft_image || '/static/assets/images/default_img.avif';
+  const srcset = nft.image_srcset || {};
+  const sources = ['avif', 'webp']
+    .filter((format) => srcset[format])
+    .map((format) => `<source type="image/${format}" srcset="${srcset[format]}" sizes="${sizes}" />`)
+    .join('');
+  return `<picture style="display: contents">${sources}<img src="${image}" ${attrs} /></picture>`;
+}
+
 // TARGET PASSWORD INPUT AND VISIBILITY ICON FOR TOGGLING VISIBILITY FUNCTIONALITY
 const passwordEI = document.querySelector('#password');
 const eyeButton = document.querySelector('.fa');
@@ -163,7 +174,7 @@ document.addEventListener('DOMContentLoaded', () => {
         heroRightSlide.className = 'swiper-slide hero__swiper-card';
         heroRightSlide.href = `/category`;
         heroRightSlide.innerHTML = `
-          <img src="${image}" alt="Banner Image" />
+          ${nftPicture(nft, `alt="Banner Image"`)}
           <div class="hero__img-content">
             <span class="creator whiteText">
               <!-- Created by <br /> -->
@@ -210,7 +221,7 @@ document.addEventListener('DOMContentLoaded', () => {
         bslSlide.className = 'bsl__img-card swiper-slide';
         bslSlide.href = '/category';
         bslSlide.innerHTML = `
-          <img src="${image}" alt="Image for ${name}" class="bsl__img" />
+          ${nftPicture(nft, `alt="Image for ${name}" class="bsl__img"`)}
           <p class="bsl__category-des">${category}</p>
           <h3 class="bsl__name">${name}</h3>
         `;
@@ -275,7 +286,7 @@ document.addEventListener('DOMContentLoaded', () => {
         ttpItem.href = `nft/buy/nft_${nft.ref_number}`; // ✅ Dynamically inserting NFT reference number
 
         ttpItem.innerHTML = `
-          <img src="${image}" alt="${name}" class="ttp__img" />
+          ${nftPicture(nft, `alt="${name}" class="ttp__img"`)}
           <p class="ttp__category-des">${category}</p>
           <h3 class="ttp__name">${name}</h3>
           <button class="btn flexColCenter">Price: ${price} ETH <small>${status}</small></button>
@@ -346,6 +357,29 @@ document.addEventListener('DOMContentLoaded', () => {
 //     });
 // });
 
+// STREAM THE NFT CATALOG PAGE BY PAGE (KEYSET CURSORS, SEE utils/catalog.py)
+const CATALOG_CARD_FIELDS = 'ref_number,nft_name,nft_image,image_srcset,thumbnail,category,price,status';
+
+function streamCatalog(url, onPage, { limit = 24, fields = CATALOG_CARD_FIELDS } = {}) {
+  const fetchPage = (cursor) => {
+    const params = new URLSearchParams({ limit, fields });
+    if (cursor) params.set('cursor', cursor);
+
+    return fetch(`${url}?${params.toString()}`)
+      .then((response) => {
+        if (!response.ok) throw new Error('Failed to fetch NFTs');
+        return response.json();
+      })
+      .then((page) => {
+        onPage(page.items, !cursor);
+        // ✅ Keep pulling pages until the server reports the end of the catalog
+        if (page.next_cursor) return fetchPage(page.next_cursor);
+      });
+  };
+
+  return fetchPage(null);
+}
+
 // DISCOVER INITIALIZATION DYNAMICALLY
 document.addEventListener('DOMContentLoaded', () => {
   const filterList = document.querySelectorAll('#filter-list li'); // SELECT ALL FILTER ITEMS
@@ -400,50 +434,48 @@ document.addEventListener('DOMContentLoaded', () => {
     });
   });
 
-  // USE THE FETCH API TO RETRIEVE DATA FROM THE SPECIFIED JSON FILE
-  fetch('/api/nfts/')
-    .then((response) => {
-      if (!response.ok) throw new Error('Failed to fetch data');
-      return response.json();
-    })
-    .then((nfts) => {
-      // ✅ Clear content only once before populating NFTs
+  // STREAM THE CATALOG INSTEAD OF FETCHING THE FULL TABLE AT ONCE
+  streamCatalog('/api/nfts/', (nfts, isFirstPage) => {
+    // ✅ Clear content only once before populating NFTs
+    if (isFirstPage) {
       discoverContent.innerHTML = '';
 
       if (nfts.length === 0) {
         discoverContent.innerHTML = '<p>No items available at the moment.</p>';
         return;
       }
+    }
 
-      nfts.forEach((nft) => {
-        const image = nft.nft_image || '/static/assets/images/default_img.avif';
-        const category = nft.category || 'Unknown Category';
-        const name = nft.nft_name || 'Unnamed Nft';
-        const price = nft.price || 'N/A';
-        const status = nft.status || 'Unavailable';
+    nfts.forEach((nft) => {
+      const image = nft.nft_image || '/static/assets/images/default_img.avif';
+      const category = nft.category || 'Unknown Category';
+      const name = nft.nft_name || 'Unnamed Nft';
+      const price = nft.price || 'N/A';
+      const status = nft.status || 'Unavailable';
 
-        const discoverItem = document.createElement('a');
-        discoverItem.className = 'discover__item';
-        discoverItem.setAttribute('data-category', category);
-        discoverItem.href = `nft/buy/nft_${nft.ref_number}`;
+      const discoverItem = document.createElement('a');
+      discoverItem.className = 'discover__item';
+      discoverItem.setAttribute('data-category', category);
+      discoverItem.href = `nft/buy/nft_${nft.ref_number}`;
 
-        discoverItem.innerHTML = `
-        <img src="${image}" alt="${name}" class="discover__img" />
+      discoverItem.innerHTML = `
+        ${nftPicture(nft, `alt="${name}" class="discover__img" loading="lazy"`)}
         <p class="discover__category-des">${category}</p>
         <h3 class="discover__name">${name}</h3>
         <button class="btn flexColCenter">Price: ${price} ETH <small>${status}</small></button>
       `;
 
-        discoverContent.appendChild(discoverItem); // ✅ Items are properly appended after clearing
-      });
-
-      handleFilter('All'); // ✅ Apply default filter AFTER items are loaded
-    })
-    .catch((error) => {
-      console.error('Error fetching data:', error);
-      discoverContent.innerHTML =
-        '<p>Error loading items. Please try again later.</p>';
+      discoverContent.appendChild(discoverItem); // ✅ Items are properly appended after clearing
     });
+
+    // ✅ Re-apply the active filter as each page arrives
+    const activeFilter = document.querySelector('#filter-list li.active');
+    handleFilter(activeFilter ? activeFilter.getAttribute('data-filter') : 'All');
+  }).catch((error) => {
+    console.error('Error fetching data:', error);
+    discoverContent.innerHTML =
+      '<p>Error loading items. Please try again later.</p>';
+  });
 });
 
 // EXP INITIALIZATION DYNAMICALLY
@@ -470,7 +502,7 @@ document.addEventListener('DOMContentLoaded', () => {
           .replace(/\s+/g, '-')
           .toLowerCase()}`;
         expSlide.innerHTML = `
-          <img src="${image}" alt="Image for ${name}" class="exp__img" />
+          ${nftPicture(nft, `alt="Image for ${name}" class="exp__img"`)}
           <div class="exp__img-content">
             <h2 class="exp__category-des whiteText">${category}</h2>
           </div>
@@ -536,7 +568,7 @@ document.addEventListener('DOMContentLoaded', () => {
           .replace(/\s+/g, '-')
           .toLowerCase()}`;
         categoryItem.innerHTML = `
-          <img src="${image}" alt="Image for ${name}" class="category__img" />
+          ${nftPicture(nft, `alt="Image for ${name}" class="category__img"`)}
           <div class="category__img-content">
             <h2 class="category__img-des whiteText">${category}</h2>
           </div>
@@ -556,55 +588,51 @@ document.addEventListener('DOMContentLoaded', () => {
   // ✅ Dynamically derive the category from the `id` of the selected element
   const targetCategory = artContent.id.toLowerCase();
 
-  // ✅ Fetch NFTs based on the category
-  fetch(`/api/nfts/${targetCategory}`)
-    .then((response) => {
-      if (!response.ok) throw new Error('Failed to fetch NFTs');
-      return response.json();
-    })
-    .then((nfts) => {
+  let renderedCount = 0;
+
+  // ✅ Stream NFTs for the category page by page
+  streamCatalog(`/api/nfts/${targetCategory}`, (nfts, isFirstPage) => {
+    if (isFirstPage) {
       artContent.innerHTML = '';
-      if (!nfts || nfts.error) {
-        artContent.innerHTML = `<p>${
-          nfts.error || 'No NFTs available at the moment.'
-        }</p>`;
+      if (nfts.length === 0) {
+        artContent.innerHTML = '<p>No NFTs available at the moment.</p>';
         return;
       }
+    }
 
-      // ✅ Set `.art__profile-img` to the image of the 6th NFT (if available)
-      if (nfts.length >= 4) {
-        artProfileImg.src =
-          nfts[3].nft_image || '/static/assets/images/default_img.avif';
+    // ✅ Display NFTs in the `.art__content` section
+    nfts.forEach((nft) => {
+      const image = nft.nft_image || '/static/assets/images/default_img.avif';
+      const name = nft.nft_name || 'Unnamed NFT';
+      const price = nft.price ? `${nft.price} ETH` : 'N/A';
+      const status = nft.status.charAt(0).toUpperCase() + nft.status.slice(1);
+
+      // ✅ Set `.art__profile-img` to the image of the 4th NFT (if available)
+      renderedCount += 1;
+      if (renderedCount === 4) {
+        artProfileImg.src = image;
       }
 
-      // ✅ Display NFTs in the `.art__content` section
-      nfts.forEach((nft) => {
-        const image = nft.nft_image || '/static/assets/images/default_img.avif';
-        const name = nft.nft_name || 'Unnamed NFT';
-        const price = nft.price ? `${nft.price} ETH` : 'N/A';
-        const status = nft.status.charAt(0).toUpperCase() + nft.status.slice(1);
-
-        const artItem = document.createElement('a');
-        artItem.className = 'art__item';
-        artItem.href = `nft/buy/nft_${nft.ref_number}`;
-
-        artItem.innerHTML = `
-          <img src="${image}" alt="${name}" class="art__img" aria-label="Image of ${name}" />
-          <h3 class="art__name">${name}</h3>
-          <button class="btn flexColCenter" aria-label="View price and availability for ${name}">
-              Price: ${price}
-              <small>${status}</small>
-          </button>
-        `;
+      const artItem = document.createElement('a');
+      artItem.className = 'art__item';
+      artItem.href = `nft/buy/nft_${nft.ref_number}`;
+
+      artItem.innerHTML = `
+        ${nftPicture(nft, `alt="${name}" class="art__img" loading="lazy" aria-label="Image of ${name}"`)}
+        <h3 class="art__name">${name}</h3>
+        <button class="btn flexColCenter" aria-label="View price and availability for ${name}">
+            Price: ${price}
+            <small>${status}</small>
+        </button>
+      `;
 
-        artContent.appendChild(artItem);
-      });
-    })
-    .catch((error) => {
-      console.error('Error fetching NFTs:', error);
-      artContent.innerHTML =
-        '<p>Error loading NFTs. Please try again later.</p>';
+      artContent.appendChild(artItem);
     });
+  }).catch((error) => {
+    console.error('Error fetching NFTs:', error);
+    artContent.innerHTML =
+      '<p>Error loading NFTs. Please try again later.</p>';
+  });
 });
 
 // EXPLORE-ITEM INITIALIZATION DYNAMICALLY
@@ -615,57 +643,53 @@ document.addEventListener('DOMContentLoaded', () => {
   // DISPLAY A TEMPORARY LOADING MESSAGE WHILE DATA IS BEING FETCHED
   exploreContent.innerHTML = '<p>Loading...</p>';
 
-  // USE THE FETCH API TO RETRIEVE DATA FROM THE SPECIFIED JSON FILE
-  fetch('/explore/api/nfts/')
-    .then((response) => {
-      if (!response.ok) throw new Error('Failed to fetch NFTs');
-      return response.json();
-    })
-    .then((nfts) => {
+  // STREAM THE CATALOG PAGE BY PAGE INSTEAD OF FETCHING THE FULL TABLE
+  streamCatalog('/explore/api/nfts/', (nfts, isFirstPage) => {
+    if (isFirstPage) {
       exploreContent.innerHTML = '';
       if (nfts.length === 0) {
         exploreContent.innerHTML = '<p>No NFTs available at the moment.</p>';
         return;
       }
+    }
 
-      // ✅ Shuffle the NFTs randomly before displaying them
-      nfts.sort(() => Math.random() - 0.5);
-
-      nfts.forEach((nft) => {
-        const image = nft.nft_image || '/static/assets/images/default_img.avif';
-        const name = nft.nft_name || 'Unnamed NFT';
-        const category = nft.category || 'Unknown Category';
-        const price = nft.price ? `${nft.price} ETH` : 'N/A';
-        const status = nft.status.charAt(0).toUpperCase() + nft.status.slice(1);
-
-        // CREATE A NEW DIV ELEMENT TO REPRESENT AN ITEM
-        const exploreItem = document.createElement('a');
-        exploreItem.className = 'explore__item'; // ASSIGN CLASS NAME FOR STYLING
-        exploreItem.href = `nft/buy/nft_${nft.ref_number}`;
-
-        // POPULATE THE ITEM ELEMENT WITH HTML CONTENT
-        exploreItem.innerHTML = `
-          <a href="${image}">
-            <img src="${image}" alt="${name}" class="explore__img" aria-label="Image of ${name}" style="background-image: url('${image}');"/>
-          </a>
-          <p class="explore__category-des">${category}</p>
-          <h3 class="explore__name">${name} <i class="bx bxs-badge-check"></i></h3>
-          <button class="btn flexColCenter" aria-label="View price and availability for ${name}">
-              Price: ${price}
-              <small>${status}</small>
-          </button>
-        `;
+    // ✅ Shuffle each page randomly before displaying it
+    nfts.sort(() => Math.random() - 0.5);
+
+    nfts.forEach((nft) => {
+      const image = nft.nft_image || '/static/assets/images/default_img.avif';
+      const name = nft.nft_name || 'Unnamed NFT';
+      const category = nft.category || 'Unknown Category';
+      const price = nft.price ? `${nft.price} ETH` : 'N/A';
+      const status = nft.status.charAt(0).toUpperCase() + nft.status.slice(1);
+
+      // CREATE A NEW DIV ELEMENT TO REPRESENT AN ITEM
+      const exploreItem = document.createElement('a');
+      exploreItem.className = 'explore__item'; // ASSIGN CLASS NAME FOR STYLING
+      exploreItem.href = `nft/buy/nft_${nft.ref_number}`;
+
+      // POPULATE THE ITEM ELEMENT WITH HTML CONTENT
+      exploreItem.innerHTML = `
+        <a href="${image}">
+          ${nftPicture(nft, `alt="${name}" class="explore__img" loading="lazy" aria-label="Image of ${name}" style="background-image: url('${nft.thumbnail || image}');"`)}
+        </a>
+        <p class="explore__category-des">${category}</p>
+        <h3 class="explore__name">${name} <i class="bx bxs-badge-check"></i></h3>
+        <button class="btn flexColCenter" aria-label="View price and availability for ${name}">
+            Price: ${price}
+            <small>${status}</small>
+        </button>
+      `;
 
-        // APPEND THE CREATED ITEM TO THE CONTENT CONTAINER
-        exploreContent.appendChild(exploreItem);
-      });
-    })
-    .catch((error) => {
-      // HANDLE FETCH ERRORS (E.G., NETWORK ISSUES OR FILE NOT FOUND)
-      console.error('Error fetching data:', error); // LOG ERROR TO THE CONSOLE
-      exploreContent.innerHTML =
-        '<p>Error loading items. Please try again later.</p>'; // DISPLAY AN ERROR MESSAGE IN THE UI
+      // APPEND THE CREATED ITEM TO THE CONTENT CONTAINER
+      exploreContent.appendChild(exploreItem);
     });
+  }).catch((error) => {
+    // HANDLE FETCH ERRORS (E.G., NETWORK ISSUES OR FILE NOT FOUND)
+    console.error('Error fetching data:', error); // LOG ERROR TO THE CONSOLE
+    exploreContent.innerHTML =
+      '<p>Error loading items. Please try again later.</p>'; // DISPLAY AN ERROR MESSAGE IN THE UI
+  });
 });
 
 // ALERTS
@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+
+from Crypto.Hash import keccak
+from wtforms.validators import ValidationError
+
+HEX_ADDRESS = re.compile(r"^(0[xX])?[0-9a-fA-F]{40}$")
+MAX_BATCH = 1000
+
+
+def _keccak_hex(text):
+    return keccak.new(digest_bits=256, data=text.encode("ascii")).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def to_checksum_address(address):
+    """✅ EIP-55 mixed-case form of a 40-hex-digit address (with or without 0x)"""
+    lower = address[2:].lower() if address[:2] in ("0x", "0X") else address.lower()
+    digest = _keccak_hex(lower)
+    return "0x" + "".join(
+        char.upper() if int(digest[i], 16) >= 8 else char for i, char in enumerate(lower)
+    )
+
+
+def is_address(value):
+    """
+    ✅ 40 hex digits (0x optional); a mixed-case address must also carry a
+    valid EIP-55 checksum. Pure string work, so no web3 import or client.
+    """
+    return isinstance(value, str) and _is_address(value)
+
+
+@lru_cache(maxsize=4096)
+def _is_address(value):
+    if not HEX_ADDRESS.match(value):
+        return False
+    digits = value[2:] if value[:2] in ("0x", "0X") else value
+    if digits == digits.lower() or digits == digits.upper():
+        return True  # ✅ Single-case addresses carry no checksum
+    return to_checksum_address(value) == "0x" + digits
+
+
+def check_addresses(values):
+    """✅ [{"address", "valid", "checksum_address"}] in request order"""
+    results = []
+    for value in values:
+        valid = is_address(value)
+        results.append(
+            {
+                "address": value,
+                "valid": valid,
+                "checksum_address": to_checksum_address(value) if valid else None,
+            }
+        )
+    return results
+
+
+class EthAddress:
+    """✅ WTForms validator: a well-formed (and, if mixed-case, checksummed) address"""
+
+    def __init__(self, message=None):
+        self.message = message or "Invalid Ethereum address."
+
+    def __call__(self, form, field):
+        if not is_address((field.data or "").strip()):
+            raise ValidationError(self.message)
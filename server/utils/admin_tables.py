@@ -0,0 +1,418 @@
+import json
+import base64
+import binascii
+import enum
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from flask import Response, get_flashed_messages, request, stream_template, url_for
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import aliased
+
+from ..config.database import db
+from ..models import NFTStatus
+from ..models import PendingNFTs
+from ..models import NFT
+from ..models import Offers
+from ..models import Withdrawal
+from ..models import Transaction
+from ..models import GasFeeDeposit
+from ..models import WalletDeposit
+from ..models import Contact
+from ..models import User
+
+PER_PAGE = 50
+MAX_PER_PAGE = 200
+
+DEPOSIT_STATUSES = ["Pending", "Approved", "Rejected"]
+
+
+class Filter:
+    """✅ A whitelisted query-string filter: exact match, or prefix (LIKE 'x%')"""
+
+    def __init__(self, expr, choices=None, prefix=False):
+        self.expr = expr
+        self.choices = choices
+        self.prefix = prefix
+
+    def clause(self, raw):
+        if self.prefix:
+            escaped = raw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return self.expr.like(f"{escaped}%", escape="\\")
+        return self.expr == _coerce(self.expr, raw)
+
+
+def _python_type(expr):
+    enum_class = getattr(expr.type, "enum_class", None)
+    if enum_class is not None:
+        return enum_class
+    try:
+        return expr.type.python_type
+    except NotImplementedError:
+        return str
+
+
+def _coerce(expr, raw):
+    """✅ Query-string / cursor value -> the column's Python type"""
+    if raw is None:
+        return None
+    kind = _python_type(expr)
+    try:
+        if isinstance(kind, type) and issubclass(kind, enum.Enum):
+            return kind[raw]
+        if kind is datetime:
+            return datetime.fromisoformat(raw)
+        if kind is Decimal:
+            return Decimal(raw)
+        if kind is int:
+            return int(raw)
+    except (KeyError, ValueError, InvalidOperation):
+        raise ValueError(f"Invalid value {raw!r}")
+    return raw
+
+
+def _dump(value):
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class TablePage:
+    """✅ One page of an AdminTable plus everything the template needs to link around"""
+
+    def __init__(self, table, rows, sort, direction, filters, per_page,
+                 next_cursor=None, prev_cursor=None):
+        self.table = table
+        self.rows = rows
+        self.sort = sort
+        self.direction = direction
+        self.filters = filters
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def url(self, **changes):
+        """✅ Current listing URL with some arguments changed (None drops one)"""
+        args = dict(self.filters)
+        args.update(sort=self.sort, dir=self.direction)
+        if self.per_page != PER_PAGE:
+            args["per_page"] = self.per_page
+        args.update(changes)
+        args = {key: value for key, value in args.items() if value not in (None, "")}
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    def sort_url(self, key):
+        """✅ Toggle the direction when re-clicking the active column"""
+        direction = "desc"
+        if key == self.sort and self.direction == "desc":
+            direction = "asc"
+        return self.url(sort=key, dir=direction)
+
+    def next_url(self):
+        return self.url(after=self.next_cursor) if self.next_cursor else None
+
+    def prev_url(self):
+        return self.url(before=self.prev_cursor) if self.prev_cursor else None
+
+
+class AdminTable:
+    """
+    ✅ Server-side listing for an admin page.
+
+    Pages are fetched with keyset pagination on (sort column, id), so every
+    page costs one index range scan no matter how deep the admin browses —
+    no OFFSET and no COUNT(*). `names` resolves user names through a LEFT
+    JOIN on users instead of loading the whole users table.
+    """
+
+    def __init__(self, model, sorts, default_sort="id", default_direction="desc",
+                 filters=None, names=None):
+        self.model = model
+        self.sorts = sorts  # ✅ {"timestamp": Model.timestamp, ...}
+        self.default_sort = default_sort
+        self.default_direction = default_direction
+        self.filters = filters or {}  # ✅ {"status": Filter(Model.status, [...])}
+        self.names = names or {}  # ✅ {"user_name": Model.user_id}
+
+    # ------------------------------------------------------------------ cursor
+    def _encode(self, row, sort):
+        values = [_dump(getattr(row, self.sorts[sort].key)), row.id]
+        raw = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def _decode(self, token, sort):
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            value, row_id = json.loads(raw)
+            return _coerce(self.sorts[sort], value), int(row_id)
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError("Invalid page cursor")
+
+    def _after(self, sort_expr, descending, cursor):
+        """
+        ✅ Rows past the cursor. NULL sorts lowest (MySQL / SQLite), so on a
+        nullable column the NULL group is its own branch, ordered by id only:
+        `col < NULL` would match nothing and end the listing there.
+        """
+        value, row_id = cursor
+        nullable = getattr(getattr(sort_expr, "expression", sort_expr), "nullable", True)
+        if value is None:
+            in_nulls = and_(
+                sort_expr.is_(None),
+                self.model.id < row_id if descending else self.model.id > row_id,
+            )
+            return in_nulls if descending else or_(sort_expr.isnot(None), in_nulls)
+        if descending:
+            past = or_(sort_expr < value, and_(sort_expr == value, self.model.id < row_id))
+            return or_(past, sort_expr.is_(None)) if nullable else past
+        return or_(sort_expr > value, and_(sort_expr == value, self.model.id > row_id))
+
+    # ------------------------------------------------------------------- query
+    def _base_query(self):
+        query = db.session.query(self.model)
+        for label, user_fk in self.names.items():
+            users = aliased(User)
+            query = query.outerjoin(users, users.id == user_fk).add_columns(
+                users.name.label(label)
+            )
+        return query
+
+    def _attach_names(self, results):
+        if not self.names:
+            return list(results)
+        rows = []
+        for result in results:
+            row = result[0]
+            for label in self.names:
+                setattr(row, label, getattr(result, label))  # ✅ Plain attribute, not mapped
+            rows.append(row)
+        return rows
+
+    def page(self, args=None):
+        """✅ Builds a TablePage from request args (sort, dir, after/before, per_page, filters)"""
+        args = request.args if args is None else args
+
+        sort = args.get("sort", self.default_sort)
+        if sort not in self.sorts:
+            sort = self.default_sort
+        direction = args.get("dir", self.default_direction)
+        if direction not in ("asc", "desc"):
+            direction = self.default_direction
+        try:
+            per_page = min(max(int(args.get("per_page", PER_PAGE)), 1), MAX_PER_PAGE)
+        except ValueError:
+            per_page = PER_PAGE
+
+        query = self._base_query()
+        active = {}
+        for key, spec in self.filters.items():
+            raw = args.get(key, "").strip()
+            if not raw:
+                continue
+            try:
+                query = query.filter(spec.clause(raw))
+            except ValueError:
+                continue  # ✅ Ignore a malformed filter rather than 500
+            active[key] = raw
+
+        sort_expr = self.sorts[sort]
+        descending = direction == "desc"
+        before = args.get("before")
+        after = None if before else args.get("after")
+        token = before or after
+        cursor = None
+        if token:
+            try:
+                cursor = self._decode(token, sort)
+            except ValueError:
+                before = after = cursor = None
+
+        # ✅ Walking backwards = same predicate with the order flipped
+        backwards = bool(before and cursor)
+        scan_desc = descending != backwards
+        if cursor:
+            query = query.filter(self._after(sort_expr, scan_desc, cursor))
+        if scan_desc:
+            query = query.order_by(sort_expr.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(sort_expr.asc(), self.model.id.asc())
+
+        fetched = self._attach_names(query.limit(per_page + 1).all())
+        more = len(fetched) > per_page
+        rows = fetched[:per_page]
+
+        next_cursor = prev_cursor = None
+        if backwards:
+            rows.reverse()
+            if rows:
+                next_cursor = self._encode(rows[-1], sort)
+                if more:
+                    prev_cursor = self._encode(rows[0], sort)
+        elif rows:
+            if more:
+                next_cursor = self._encode(rows[-1], sort)
+            if cursor:
+                prev_cursor = self._encode(rows[0], sort)
+
+        return TablePage(
+            self, rows, sort, direction, active, per_page, next_cursor, prev_cursor
+        )
+
+
+def stream_page(template, **context):
+    """
+    ✅ Renders a listing with stream_template so the browser gets the first
+    rows while the rest of the table is still rendering.
+
+    Flashes and the CSRF token live in the session, which is saved before a
+    streamed body starts — so both are resolved up front.
+    """
+    get_flashed_messages(with_categories=True)
+    generate_csrf()
+    return Response(stream_template(template, **context))
+
+
+# ------------------------------------------------------------------ tables
+USERS = AdminTable(
+    User,
+    sorts={"id": User.id, "name": User.name, "date_created": User.date_created},
+    filters={
+        "role": Filter(User.role, ["user", "admin"]),
+        "name": Filter(User.name, prefix=True),
+        "email": Filter(User.email, prefix=True),
+    },
+)
+
+WALLET_DEPOSITS = AdminTable(
+    WalletDeposit,
+    sorts={
+        "id": WalletDeposit.id,
+        "timestamp": WalletDeposit.timestamp,
+        "amount": WalletDeposit.wltdps_amount,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(WalletDeposit.status, DEPOSIT_STATUSES),
+        "user_id": Filter(WalletDeposit.user_id),
+    },
+    names={"user_name": WalletDeposit.user_id},
+)
+
+GASFEE_DEPOSITS = AdminTable(
+    GasFeeDeposit,
+    sorts={
+        "id": GasFeeDeposit.id,
+        "timestamp": GasFeeDeposit.timestamp,
+        "amount": GasFeeDeposit.gsfdps_amount,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(GasFeeDeposit.status, DEPOSIT_STATUSES),
+        "user_id": Filter(GasFeeDeposit.user_id),
+    },
+    names={"user_name": GasFeeDeposit.user_id},
+)
+
+TRANSACTIONS = AdminTable(
+    Transaction,
+    sorts={
+        "id": Transaction.id,
+        "timestamp": Transaction.timestamp,
+        "amount": Transaction.listed_price,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(
+            Transaction.status,
+            [NFTStatus.PENDING.name, NFTStatus.SOLD.name, NFTStatus.REJECTED.name],
+        ),
+        "buyer_id": Filter(Transaction.buyer_id),
+        "owner_id": Filter(Transaction.owner_id),
+        "nft_id": Filter(Transaction.nft_id),
+    },
+)
+
+WITHDRAWALS = AdminTable(
+    Withdrawal,
+    sorts={
+        "id": Withdrawal.id,
+        "timestamp": Withdrawal.timestamp,
+        "amount": Withdrawal.eth_amount,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(Withdrawal.status, DEPOSIT_STATUSES),
+        "user_id": Filter(Withdrawal.user_id),
+    },
+    names={"user_name": Withdrawal.user_id},
+)
+
+OFFERS = AdminTable(
+    Offers,
+    sorts={
+        "id": Offers.id,
+        "timestamp": Offers.timestamp,
+        "amount": Offers.offered_price,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(Offers.action, ["Pending", "Accepted", "Declined", "Expired"]),
+        "user_id": Filter(Offers.user_id),
+    },
+    names={"user_name": Offers.user_id},
+)
+
+MINTING_REQUESTS = AdminTable(
+    PendingNFTs,
+    sorts={
+        "id": PendingNFTs.id,
+        "timestamp": PendingNFTs.timestamp,
+        "price": PendingNFTs.price,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(
+            PendingNFTs.status, [NFTStatus.PENDING.name, NFTStatus.AVAILABLE.name]
+        ),
+        "user_id": Filter(PendingNFTs.user_id),
+        "category": Filter(PendingNFTs.category),
+    },
+)
+
+NFTS = AdminTable(
+    NFT,
+    sorts={
+        "id": NFT.id,
+        "timestamp": NFT.timestamp,
+        "price": NFT.price,
+        "views": NFT.views,
+    },
+    default_sort="timestamp",
+    filters={
+        "status": Filter(
+            NFT.status,
+            [NFTStatus.LISTED.value, NFTStatus.AVAILABLE.value, NFTStatus.SOLD.value],
+        ),
+        "category": Filter(NFT.category),
+        "creator": Filter(NFT.creator),
+        "name": Filter(NFT.nft_name, prefix=True),
+    },
+)
+
+CONTACT_MESSAGES = AdminTable(
+    Contact,
+    sorts={"id": Contact.id, "timestamp": Contact.timestamp},
+    default_sort="timestamp",
+    filters={"email": Filter(Contact.email, prefix=True)},
+)
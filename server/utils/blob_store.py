@@ -0,0 +1,391 @@
+import os
+import glob
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, event, func, inspect, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from ..config.database import db
+from ..config.variables import BLOB_GC_GRACE_SECONDS
+from ..models import PendingNFTs
+from ..models import NFT
+from ..models import Transaction
+from ..models import GasFeeDeposit
+from ..models import WalletDeposit
+from ..models import Blob
+from .images import STATIC_ROOT, VARIANT_FOLDER, file_hash
+from .uploads import (
+    IMAGE_TYPES,
+    NFT_TYPES,
+    SNIFF_BYTES,
+    IngestFile,
+    UploadRejected,
+    check_image,
+    sniff,
+)
+
+UPLOAD_ROOT = os.path.join(STATIC_ROOT, "uploads")
+UPLOAD_URL = "/static/uploads/"
+BLOB_DIR = "blobs"
+
+
+# ✅ Columns that point at an upload. NFT images are stored as a URL
+# ("/static/uploads/blobs/..."), receipts as a path under uploads/ ("blobs/...")
+REFERENCES = [
+    (NFT, "nft_image"),
+    (PendingNFTs, "nft_image"),
+    (Transaction, "receipt_img"),
+    (WalletDeposit, "receipt_img"),
+    (GasFeeDeposit, "receipt_img"),
+]
+_BY_MODEL = {}
+for _model, _attr in REFERENCES:
+    _BY_MODEL.setdefault(_model, []).append(_attr)
+
+# ✅ Pass as execution_options on a bulk delete already reported via release_rows()
+ACCOUNTED = {"blobs_accounted": True}
+
+
+def url(path):
+    """✅ "blobs/ab/ab12….jpg" -> "/static/uploads/blobs/ab/ab12….jpg" """
+    return UPLOAD_URL + path
+
+
+def blob_sha(value):
+    """✅ Content hash behind a stored reference (None for legacy/foreign files)"""
+    if not value:
+        return None
+    if value.startswith(UPLOAD_URL):
+        value = value[len(UPLOAD_URL) :]
+    if not value.startswith(BLOB_DIR + "/"):
+        return None
+    sha = os.path.basename(value).split(".", 1)[0]
+    return sha if len(sha) == 64 else None
+
+
+def _blob_path(sha, ext):
+    return f"{BLOB_DIR}/{sha[:2]}/{sha}.{ext}"
+
+
+def _touch(sha, path, size):
+    """
+    ✅ Inserts the blob row, or marks an existing one as freshly used so a
+    concurrent garbage collection leaves it alone. Runs in the caller's
+    transaction: the row lock is held until the referencing row commits.
+    """
+    table = Blob.__table__
+    now = datetime.now()
+    row = {"sha256": sha, "path": path, "size": size, "ref_count": 0, "created_at": now}
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(**row)
+        stmt = stmt.on_duplicate_key_update(created_at=now, released_at=None)
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table).values(**row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sha256"], set_={"created_at": now, "released_at": None}
+        )
+    db.session.execute(stmt)
+    return db.session.execute(select(table.c.path).where(table.c.sha256 == sha)).scalar()
+
+
+def store(file_storage, allowed=NFT_TYPES):
+    """
+    ✅ Validates an upload and saves it once per unique content.
+
+    Uploads parsed by UploadRequest were already streamed to a temp file
+    (hashed, sniffed and size-checked on the way in); anything else is
+    copied through the same single pass. The file is then checked for an
+    `allowed` type — images by their header only — and atomically renamed
+    to blobs/<aa>/<sha>.<ext>, or dropped when that content is already
+    stored. Returns the path under uploads/ (use url() for image columns);
+    raises UploadRejected for unaccepted content.
+    """
+    ingest = file_storage.stream
+    if not isinstance(ingest, IngestFile) or ingest.claimed:
+        ingest = IngestFile().copy_from(file_storage.stream)
+    try:
+        kind = ingest.kind()
+        if kind not in allowed:
+            raise UploadRejected("Uploaded file is not an accepted file type.")
+        tmp_path = ingest.finish()
+    except BaseException:
+        ingest.close()
+        raise
+
+    try:
+        if kind in IMAGE_TYPES:
+            check_image(tmp_path, kind)
+        sha = ingest.sha256.hexdigest()
+        path = _touch(sha, _blob_path(sha, kind), ingest.size)
+        target = os.path.join(UPLOAD_ROOT, path)
+        if os.path.exists(target):
+            os.remove(tmp_path)  # ✅ Duplicate content: keep the stored copy
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(tmp_path, target)  # ✅ Readers never see a half-written file
+        return path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# ------------------------------------------------------------ session events
+def _deltas(session):
+    return session.info.setdefault("blob_deltas", Counter())
+
+
+def _before_flush(session, flush_context, instances):
+    # ✅ Read the reference before the row is gone
+    for obj in session.deleted:
+        for attr in _BY_MODEL.get(type(obj), ()):
+            sha = blob_sha(getattr(obj, attr))
+            if sha:
+                _deltas(session)[sha] -= 1
+
+
+def _after_flush(session, flush_context):
+    deltas = _deltas(session)
+    for obj in session.new:
+        for attr in _BY_MODEL.get(type(obj), ()):
+            sha = blob_sha(getattr(obj, attr))
+            if sha:
+                deltas[sha] += 1
+
+    for obj in session.dirty:
+        for attr in _BY_MODEL.get(type(obj), ()):
+            history = inspect(obj).attrs[attr].history
+            if not history.added:
+                continue
+            sha = blob_sha(history.added[0])
+            if sha:
+                deltas[sha] += 1
+            if not history.deleted or history.deleted[0] is NO_VALUE:
+                session.info["blob_recount"] = True  # ✅ Old reference unknown (expired row)
+                continue
+            old = blob_sha(history.deleted[0])
+            if old:
+                deltas[old] -= 1
+
+    _apply(session.connection(), session.info.pop("blob_deltas", None))
+
+
+def _apply(conn, deltas):
+    """✅ Counts move in the same transaction as the rows that reference them"""
+    deltas = {sha: n for sha, n in (deltas or {}).items() if n}
+    if not deltas:
+        return
+    table = Blob.__table__
+    now = datetime.now()
+    for sha, n in sorted(deltas.items()):  # ✅ Same lock order for every writer
+        conn.execute(
+            table.update()
+            .where(table.c.sha256 == sha)
+            # ✅ released_at first: MySQL evaluates SET left to right
+            .ordered_values(
+                (
+                    table.c.released_at,
+                    case((table.c.ref_count + n <= 0, now), else_=None),
+                ),
+                (table.c.ref_count, table.c.ref_count + n),
+            )
+        )
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ A bulk query.delete() bypasses the flush: recount after commit
+    if not orm_execute_state.is_delete:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in _BY_MODEL:
+        return
+    if not orm_execute_state.execution_options.get("blobs_accounted"):
+        orm_execute_state.session.info["blob_recount"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("blob_recount", None):
+        try:
+            recount()
+        except Exception:
+            logging.exception("Could not recount upload references (run `flask blobs recount`)")
+
+
+def _after_rollback(session):
+    session.info.pop("blob_deltas", None)
+    session.info.pop("blob_recount", None)
+
+
+def release_rows(rows):
+    """
+    ✅ Reports a set-based DELETE of `rows` that the flush can't see. Run
+    the statement with `.execution_options(**ACCOUNTED)`.
+    """
+    deltas = Counter()
+    for row in rows:
+        for attr in _BY_MODEL[type(row)]:
+            sha = blob_sha(getattr(row, attr))
+            if sha:
+                deltas[sha] -= 1
+    _apply(db.session.connection(), deltas)
+
+
+# -------------------------------------------------------------- maintenance
+def _remove_files(path, sha):
+    for target in [os.path.join(UPLOAD_ROOT, path)] + glob.glob(
+        os.path.join(VARIANT_FOLDER, sha[:2], f"{sha[:32]}_*")
+    ):
+        try:
+            os.remove(target)
+        except FileNotFoundError:
+            pass
+
+
+def collect_garbage(grace=None, limit=1000):
+    """
+    ✅ Deletes blobs nothing references any more, with their resized variants.
+
+    Released blobs (count dropped to 0) go straight away; blobs that were
+    never referenced get `grace` seconds, since an upload is stored before
+    the row that points at it is committed. Returns the number removed.
+    """
+    grace = BLOB_GC_GRACE_SECONDS if grace is None else grace
+    table = Blob.__table__
+    unused = (table.c.ref_count <= 0) & or_(
+        table.c.released_at.isnot(None),
+        table.c.created_at < datetime.now() - timedelta(seconds=grace),
+    )
+    removed = []
+    with db.engine.begin() as conn:
+        candidates = conn.execute(
+            select(table.c.sha256, table.c.path).where(unused).limit(limit)
+        ).all()
+        for sha, path in candidates:
+            # ✅ Re-checked under the row lock: an upload may have reused it
+            result = conn.execute(
+                table.delete().where(table.c.sha256 == sha, unused)
+            )
+            if result.rowcount:
+                removed.append((path, sha))
+    for path, sha in removed:
+        _remove_files(path, sha)
+    if removed:
+        logging.info(f"Removed {len(removed)} unreferenced upload(s)")
+    return len(removed)
+
+
+def remove_stray_files(grace=None):
+    """✅ Files under blobs/ without a row (an upload whose request failed)"""
+    grace = BLOB_GC_GRACE_SECONDS if grace is None else grace
+    cutoff = datetime.now().timestamp() - grace
+    known = set(db.session.execute(select(Blob.path)).scalars())
+    removed = 0
+    root = os.path.join(UPLOAD_ROOT, BLOB_DIR)
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, UPLOAD_ROOT).replace(os.sep, "/")
+            if rel in known or os.path.getmtime(full) > cutoff:
+                continue
+            os.remove(full)
+            removed += 1
+    return removed
+
+
+def recount():
+    """✅ Recomputes every ref_count from the referencing columns (one GROUP BY each)"""
+    counts = Counter()
+    table = Blob.__table__
+    with db.engine.begin() as conn:
+        for model, attr in REFERENCES:
+            column = getattr(model, attr)
+            rows = conn.execute(
+                select(column, func.count())
+                .where(column.like(f"%{BLOB_DIR}/%"))
+                .group_by(column)
+            )
+            for value, total in rows:
+                sha = blob_sha(value)
+                if sha:
+                    counts[sha] += total
+
+        now = datetime.now()
+        changed = 0
+        for sha, current, released_at in conn.execute(
+            select(table.c.sha256, table.c.ref_count, table.c.released_at)
+        ).all():
+            wanted = counts.get(sha, 0)
+            if wanted == current:
+                continue
+            conn.execute(
+                table.update()
+                .where(table.c.sha256 == sha)
+                .values(
+                    ref_count=wanted,
+                    released_at=(released_at or now) if wanted <= 0 else None,
+                )
+            )
+            changed += 1
+    return changed
+
+
+def import_legacy(folder=UPLOAD_ROOT):
+    """
+    ✅ Moves uuid-named uploads into the blob store, collapsing byte-identical
+    copies, and points the referencing rows at the blob. Returns
+    (files imported, bytes freed).
+    """
+    imported = freed = 0
+    for name in sorted(os.listdir(folder)):
+        legacy = os.path.join(folder, name)
+        if not os.path.isfile(legacy) or name.startswith("."):
+            continue
+
+        with open(legacy, "rb") as f:
+            kind = sniff(f.read(SNIFF_BYTES))
+        kind = kind or (name.rsplit(".", 1)[-1].lower() if "." in name else "bin")
+        sha = file_hash(legacy)
+        size = os.path.getsize(legacy)
+
+        path = _touch(sha, _blob_path(sha, kind), size)
+        target = os.path.join(UPLOAD_ROOT, path)
+        for model, attr in REFERENCES:
+            column = getattr(model, attr)
+            old, new = (url(name), url(path)) if attr == "nft_image" else (name, path)
+            db.session.query(model).filter(column == old).update(
+                {attr: new}, synchronize_session=False
+            )
+        db.session.commit()
+
+        if os.path.exists(target):
+            os.remove(legacy)
+            freed += size
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(legacy, target)
+        imported += 1
+
+    recount()
+    return imported, freed
+
+
+# ---------------------------------------------------------------- lifecycle
+def register_blob_listeners():
+    """✅ Keep blob reference counts in step with the rows that point at them"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
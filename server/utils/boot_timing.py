@@ -0,0 +1,34 @@
+import time
+import logging
+from contextlib import contextmanager
+
+
+class BootTimer:
+    """
+    ✅ Wall-clock time per create_app() phase.
+
+    Kept on app.extensions["boot_timings"] (and logged when
+    BOOT_TIMING_LOG is on) so slow worker starts can be traced to a phase.
+    """
+
+    def __init__(self, started=None):
+        self.started = started or time.perf_counter()
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0) + time.perf_counter() - started
+
+    def total(self):
+        return time.perf_counter() - self.started
+
+    def data(self):
+        return {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()}
+
+    def log(self):
+        parts = ", ".join(f"{name} {ms:.0f}ms" for name, ms in self.data().items())
+        logging.info(f"Boot {self.total() * 1000:.0f}ms: {parts}")
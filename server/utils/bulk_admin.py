@@ -0,0 +1,518 @@
+import logging
+from collections import Counter
+from decimal import Decimal
+
+from sqlalchemy import bindparam
+
+from ..config.database import db
+from ..models import NFTStatus
+from ..models import PendingNFTs
+from ..models import NFT
+from ..models import Offers
+from ..models import Withdrawal
+from ..models import Transaction
+from ..models import GasFeeDeposit
+from ..models import Ether
+from ..models import WalletDeposit
+from . import ledger
+from . import stats
+from . import blob_store
+from . import portfolio
+from . import order_book
+from .images import build_variants
+from .minting_fee_helper import calculate_minting_fee
+from .search import index_nft
+
+CHUNK_SIZE = 200  # rows per database transaction
+MAX_ITEMS = 5000  # rows per request
+
+APPROVE = "approve"
+REJECT = "reject"
+
+
+class BulkRequestError(ValueError):
+    """Raised for a malformed bulk request (unknown kind/action, bad ids...)."""
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _update_where_ids(model, rows, values, options=None):
+    """✅ One set-based UPDATE for the whole chunk (counters adjusted from the loaded rows)"""
+    stats.note_bulk(model, rows, values)
+    model.query.filter(model.id.in_([row.id for row in rows])).execution_options(
+        **stats.ACCOUNTED, **(options or {})
+    ).update(values, synchronize_session=False)
+
+
+def _ensure_wallets(user_ids):
+    """✅ Creates missing Ether rows for a chunk in one INSERT"""
+    existing = {
+        row.user_id
+        for row in db.session.query(Ether.user_id).filter(Ether.user_id.in_(user_ids))
+    }
+    missing = sorted(set(user_ids) - existing)
+    if missing:
+        db.session.add_all([Ether(user_id=user_id) for user_id in missing])
+        db.session.flush()
+
+
+def _debit_in_order(rows, account, amount_of, user_of, kind, reference_of, results):
+    """
+    ✅ Debits every row that the (locked) wallet can afford, in id order.
+
+    Rows the wallet can't cover get "insufficient_funds"; the rest are posted
+    with one ledger.post_many call. Returns the rows that were debited.
+    """
+    keys = {(user_of(row), account) for row in rows}
+    available = ledger.balances(keys, for_update=True)
+
+    accepted, postings = [], []
+    for row in rows:
+        key = (user_of(row), account)
+        amount = Decimal(str(amount_of(row)))
+        current = available[key]
+        if current is None or current < amount:
+            results[row.id] = (
+                "insufficient_funds",
+                f"Needs {amount} ETH, has {current or Decimal('0.0000')} ETH",
+            )
+            continue
+        available[key] = current - amount
+        accepted.append(row)
+        postings.append(
+            ledger.Posting(user_of(row), account, -amount, kind, reference_of(row))
+        )
+
+    ledger.post_many(postings)
+    return accepted
+
+
+class BulkHandler:
+    """
+    ✅ One admin queue (deposits, withdrawals, ...).
+
+    `skip()` returns a result for rows that need no work (this is what makes
+    re-submitting a request idempotent); `approve()` / `reject()` apply the
+    rest of a chunk with set-based statements and fill in `results`.
+    """
+
+    model = None
+    pending_filter = None
+
+    def pending_ids(self, user_id=None, limit=MAX_ITEMS):
+        query = db.session.query(self.model.id).filter(self.pending_filter())
+        if user_id is not None:
+            query = query.filter(self.model.user_id == user_id)
+        return [row.id for row in query.order_by(self.model.id).limit(limit)]
+
+    def load(self, ids):
+        rows = (
+            self.model.query.filter(self.model.id.in_(ids))
+            .order_by(self.model.id)
+            .with_for_update()
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    def skip(self, row, action):
+        return None
+
+    def after_commit(self, rows):
+        pass
+
+    def after_rollback(self):
+        pass
+
+
+class DepositHandler(BulkHandler):
+    account = None
+    amount_attr = None
+    reference_prefix = None
+
+    def pending_filter(self):
+        return self.model.status == "Pending"
+
+    def skip(self, row, action):
+        if row.status == "Approved":
+            return "already_approved"
+        if action == REJECT and row.status == "Rejected":
+            return "already_rejected"
+        return None
+
+    def approve(self, rows, results):
+        _ensure_wallets({row.user_id for row in rows})
+        ledger.post_many(
+            [
+                ledger.Posting(
+                    row.user_id,
+                    self.account,
+                    getattr(row, self.amount_attr),
+                    "deposit",
+                    f"{self.reference_prefix}:{row.id}",
+                )
+                for row in rows
+            ]
+        )
+        _update_where_ids(self.model, rows, {"status": "Approved"})
+        for row in rows:
+            results[row.id] = ("approved", None)
+
+    def reject(self, rows, results):
+        _update_where_ids(self.model, rows, {"status": "Rejected"})
+        for row in rows:
+            results[row.id] = ("rejected", None)
+
+
+class WalletDepositHandler(DepositHandler):
+    model = WalletDeposit
+    account = ledger.MAIN
+    amount_attr = "wltdps_amount"
+    reference_prefix = "wallet_deposit"
+
+
+class GasFeeDepositHandler(DepositHandler):
+    model = GasFeeDeposit
+    account = ledger.GAS
+    amount_attr = "gsfdps_amount"
+    reference_prefix = "gasfee_deposit"
+
+
+class WithdrawalHandler(BulkHandler):
+    model = Withdrawal
+
+    def pending_filter(self):
+        return Withdrawal.status == "Pending"
+
+    def skip(self, row, action):
+        if row.status == "Approved":
+            return "already_approved"
+        if action == REJECT and row.status == "Rejected":
+            return "already_rejected"
+        return None
+
+    def approve(self, rows, results):
+        accepted = _debit_in_order(
+            rows,
+            ledger.MAIN,
+            amount_of=lambda row: row.eth_amount,
+            user_of=lambda row: row.user_id,
+            kind="withdrawal",
+            reference_of=lambda row: f"withdrawal:{row.transaction_id}",
+            results=results,
+        )
+        if accepted:
+            _update_where_ids(Withdrawal, accepted, {"status": "Approved"})
+        for row in accepted:
+            results[row.id] = ("approved", None)
+
+    def reject(self, rows, results):
+        _update_where_ids(Withdrawal, rows, {"status": "Rejected"})
+        for row in rows:
+            results[row.id] = ("rejected", None)
+
+
+class TransactionHandler(BulkHandler):
+    model = Transaction
+
+    def pending_filter(self):
+        return Transaction.status == NFTStatus.PENDING
+
+    def skip(self, row, action):
+        if row.status == NFTStatus.SOLD:
+            return "already_approved"
+        if action == REJECT and row.status == NFTStatus.REJECTED:
+            return "already_rejected"
+        return None
+
+    def approve(self, rows, results):
+        nft_ids = {
+            row.id for row in db.session.query(NFT.id).filter(
+                NFT.id.in_({row.nft_id for row in rows})
+            )
+        }
+        for row in rows:
+            if row.nft_id not in nft_ids:
+                results[row.id] = ("error", "NFT not found for this transaction.")
+        rows = [row for row in rows if row.nft_id in nft_ids]
+
+        accepted = _debit_in_order(
+            rows,
+            ledger.MAIN,
+            amount_of=lambda row: row.listed_price,
+            user_of=lambda row: row.buyer_id,
+            kind="purchase",
+            reference_of=lambda row: f"transaction:{row.id}",
+            results=results,
+        )
+        if not accepted:
+            return
+
+        nfts = NFT.__table__
+        portfolio.note_users(
+            [row.buyer_id for row in accepted] + [row.owner_id for row in accepted]
+        )
+        db.session.execute(
+            nfts.update()
+            .execution_options(**portfolio.ACCOUNTED)
+            .where(nfts.c.id == bindparam("b_id"))
+            .values(
+                status=NFTStatus.SOLD.value,
+                buyer_id=bindparam("b_buyer_id"),
+                buyer=bindparam("b_buyer"),
+            ),
+            [
+                {"b_id": row.nft_id, "b_buyer_id": row.buyer_id, "b_buyer": row.buyer_name}
+                for row in accepted
+            ],
+        )
+        _update_where_ids(Transaction, accepted, {"status": NFTStatus.SOLD})
+        for row in accepted:
+            results[row.id] = ("approved", None)
+
+    def reject(self, rows, results):
+        _update_where_ids(Transaction, rows, {"status": NFTStatus.REJECTED})
+        for row in rows:
+            results[row.id] = ("rejected", None)
+
+
+class OfferHandler(BulkHandler):
+    model = Offers
+
+    def pending_filter(self):
+        return Offers.action == "Pending"
+
+    def skip(self, row, action):
+        if action == APPROVE and row.action == "Accepted":
+            return "already_approved"
+        if action == APPROVE and row.action != "Pending":
+            return "already_rejected"  # ✅ Declined or Expired: the NFT may be settled
+        if action == REJECT and row.action == "Declined":
+            return "already_rejected"
+        return None
+
+    def approve(self, rows, results):
+        # ✅ One accepted offer per NFT: the best selected one wins, and
+        # order_book.accept declines every other pending offer on it
+        best = {}
+        for row in sorted(rows, key=lambda row: (-row.offered_price, row.id)):
+            if row.nft_id is None:
+                order_book.accept(row)  # ✅ Legacy offer not linked to an NFT
+                results[row.id] = ("approved", None)
+            elif row.nft_id in best:
+                winner = best[row.nft_id]
+                results[row.id] = ("declined", f"Offer {winner.id} on the same NFT was accepted.")
+            else:
+                best[row.nft_id] = row
+                order_book.accept(row)
+                results[row.id] = ("approved", None)
+
+    def reject(self, rows, results):
+        _update_where_ids(Offers, rows, {"action": "Declined"})
+        for row in rows:
+            results[row.id] = ("rejected", None)
+
+
+class MintingHandler(BulkHandler):
+    model = PendingNFTs
+
+    def __init__(self):
+        self.minting_fee = None
+        self.minted = []
+
+    def pending_filter(self):
+        return PendingNFTs.status == NFTStatus.PENDING
+
+    def skip(self, row, action):
+        if row.status != NFTStatus.PENDING:
+            return "already_approved"
+        return None
+
+    def approve(self, rows, results):
+        taken = {
+            row.nft_name
+            for row in db.session.query(NFT.nft_name).filter(
+                NFT.nft_name.in_({row.nft_name for row in rows})
+            )
+        }
+        unique, seen = [], set()
+        for row in rows:
+            if row.nft_name in taken:
+                results[row.id] = ("error", "An NFT with this name already exists.")
+            elif row.nft_name in seen:
+                # ✅ Same name twice in one request: the unique index would fail
+                # the flush and roll back the whole chunk
+                results[row.id] = ("error", "duplicate name in this request")
+            else:
+                seen.add(row.nft_name)
+                unique.append(row)
+        rows = unique
+
+        accepted = _debit_in_order(
+            rows,
+            ledger.GAS,
+            amount_of=lambda row: self.minting_fee,
+            user_of=lambda row: row.user_id,
+            kind="minting_fee",
+            reference_of=lambda row: f"minting:{row.id}",
+            results=results,
+        )
+        if not accepted:
+            return
+
+        minted = [
+            NFT(
+                nft_name=row.nft_name,
+                nft_image=row.nft_image,
+                image_variants=build_variants(row.nft_image),  # ✅ Cached at upload
+                category=row.category,
+                collection_name=row.collection_name,
+                creator=row.creator,
+                creator_id=row.user_id,
+                price=row.price,
+                royalties=row.royalties,
+                description=row.description,
+                user_id=row.user_id,
+                status=NFTStatus.AVAILABLE.value,
+            )
+            for row in accepted
+        ]
+        db.session.add_all(minted)
+        db.session.flush()  # ✅ Ids for the pending -> minted links
+        portfolio.note_users([row.user_id for row in accepted])
+        _update_where_ids(
+            PendingNFTs, accepted, {"status": NFTStatus.AVAILABLE}, portfolio.ACCOUNTED
+        )
+        pending = PendingNFTs.__table__
+        db.session.execute(
+            pending.update()
+            .execution_options(**portfolio.ACCOUNTED)
+            .where(pending.c.id == bindparam("b_id"))
+            .values(nft_id=bindparam("b_nft_id")),
+            [{"b_id": row.id, "b_nft_id": nft.id} for row, nft in zip(accepted, minted)],
+        )
+        self.minted.extend(minted)  # ✅ Indexed for search once committed
+        for row in accepted:
+            results[row.id] = ("approved", None)
+
+    def reject(self, rows, results):
+        # ✅ Same as the single endpoint: rejected requests are removed
+        stats.note_bulk(PendingNFTs, rows)
+        blob_store.release_rows(rows)
+        portfolio.note_users([row.user_id for row in rows])
+        PendingNFTs.query.filter(
+            PendingNFTs.id.in_([row.id for row in rows])
+        ).execution_options(
+            **stats.ACCOUNTED, **blob_store.ACCOUNTED, **portfolio.ACCOUNTED
+        ).delete(
+            synchronize_session=False
+        )
+        for row in rows:
+            results[row.id] = ("rejected", None)
+
+    def after_commit(self, rows):
+        for nft in self.minted:
+            index_nft(nft)
+        self.minted = []
+
+    def after_rollback(self):
+        self.minted = []
+
+
+HANDLERS = {
+    "wallet_deposits": WalletDepositHandler,
+    "gasfee_deposits": GasFeeDepositHandler,
+    "withdrawals": WithdrawalHandler,
+    "transactions": TransactionHandler,
+    "offers": OfferHandler,
+    "minting_requests": MintingHandler,
+}
+
+
+def _parse_ids(payload, handler):
+    """✅ {"ids": [...]} or {"filter": {"user_id": 3}} (pending items only)"""
+    if "ids" in payload:
+        ids = payload["ids"]
+        if not isinstance(ids, list) or not ids:
+            raise BulkRequestError("'ids' must be a non-empty list.")
+        try:
+            ids = list(dict.fromkeys(int(i) for i in ids))  # ✅ De-duplicate, keep order
+        except (TypeError, ValueError):
+            raise BulkRequestError("'ids' must contain integers.")
+    elif "filter" in payload:
+        filters = payload["filter"] or {}
+        unknown = set(filters) - {"user_id"}
+        if unknown:
+            raise BulkRequestError(f"Unsupported filter: {', '.join(sorted(unknown))}")
+        ids = handler.pending_ids(user_id=filters.get("user_id"))
+    else:
+        raise BulkRequestError("Provide 'ids' or 'filter'.")
+
+    if len(ids) > MAX_ITEMS:
+        raise BulkRequestError(f"At most {MAX_ITEMS} items per request.")
+    return ids
+
+
+def run_bulk_action(kind, action, payload):
+    """
+    ✅ Approves/rejects many admin queue items.
+
+    Work is done in chunks of CHUNK_SIZE, each in its own transaction with
+    the rows locked. A failing chunk is rolled back and reported as "error"
+    without affecting the chunks already committed.
+    """
+    if kind not in HANDLERS:
+        raise BulkRequestError(f"Unknown queue '{kind}'.")
+    if action not in (APPROVE, REJECT):
+        raise BulkRequestError(f"Unknown action '{action}'.")
+
+    handler = HANDLERS[kind]()
+    ids = _parse_ids(payload, handler)
+
+    if kind == "minting_requests" and action == APPROVE:
+        handler.minting_fee = calculate_minting_fee()
+        if handler.minting_fee is None:
+            raise BulkRequestError("Failed to retrieve real-time minting fee.")
+
+    results = {}
+    for chunk in _chunks(ids):
+        chunk_results = {}
+        try:
+            rows = handler.load(chunk)
+            todo = []
+            for item_id in chunk:
+                row = rows.get(item_id)
+                if row is None:
+                    chunk_results[item_id] = ("not_found", None)
+                    continue
+                skipped = handler.skip(row, action)
+                if skipped:
+                    chunk_results[item_id] = (skipped, None)
+                else:
+                    todo.append(row)
+
+            if todo:
+                getattr(handler, action)(todo, chunk_results)
+            db.session.commit()
+            handler.after_commit(todo)
+        except Exception as e:
+            logging.exception(f"Bulk {action} of {kind} failed for a chunk")
+            db.session.rollback()
+            handler.after_rollback()
+            chunk_results = {item_id: ("error", str(e)) for item_id in chunk}
+        results.update(chunk_results)
+
+    report = [
+        {"id": item_id, "result": results[item_id][0], "message": results[item_id][1]}
+        for item_id in ids
+    ]
+    return {
+        "status": "success",
+        "kind": kind,
+        "action": action,
+        "requested": len(ids),
+        "summary": dict(Counter(item["result"] for item in report)),
+        "results": report,
+    }
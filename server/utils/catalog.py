@@ -0,0 +1,176 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from flask_login import current_user
+from sqlalchemy import and_, or_
+
+from ..config.database import db
+from ..models import NFT
+from ..models import NFTStatus
+from .images import srcsets, thumbnail_url
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# ✅ Public fields a catalog client may project (same keys as NFT.data())
+CATALOG_FIELDS = {
+    "id": NFT.id,
+    "ref_number": NFT.ref_number,
+    "nft_name": NFT.nft_name,
+    "nft_image": NFT.nft_image,
+    "thumbnail": NFT.image_variants,  # Derived from the variants (or nft_image)
+    "image_srcset": NFT.image_variants,
+    "category": NFT.category,
+    "collection_name": NFT.collection_name,
+    "price": NFT.price,
+    "description": NFT.description,
+    "royalties": NFT.royalties,
+    "views": NFT.views,
+    "status": NFT.buyer_id,  # Display status is derived from the buyer
+    "creator": NFT.creator,
+    "buyer_id": NFT.buyer_id,
+    "user_id": NFT.user_id,
+    "timestamp": NFT.timestamp,
+}
+
+
+class InvalidCatalogQuery(ValueError):
+    """Raised when catalog query parameters cannot be honoured."""
+
+
+def encode_cursor(timestamp, nft_id):
+    """✅ Opaque keyset cursor for the (timestamp, id) position of a row"""
+    payload = json.dumps({"t": timestamp.isoformat(), "i": nft_id})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), int(payload["i"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise InvalidCatalogQuery("Invalid cursor.")
+
+
+def parse_fields(raw):
+    """✅ Validate a comma separated `fields=` projection (None = every field)"""
+    if not raw:
+        return list(CATALOG_FIELDS)
+
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in CATALOG_FIELDS]
+    if unknown:
+        raise InvalidCatalogQuery(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def parse_limit(raw):
+    if raw is None or raw == "":
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise InvalidCatalogQuery("limit must be an integer.")
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _parse_price(raw, name):
+    if raw is None or raw == "":
+        return None
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise InvalidCatalogQuery(f"{name} must be a number.")
+
+
+def _format(field, value, row):
+    if field == "status":
+        # ✅ Mirrors NFT.data(): the viewer sees "Sold" only on NFTs they bought
+        if current_user.is_authenticated and row.buyer_id == current_user.id:
+            return NFTStatus.SOLD.value
+        return NFTStatus.AVAILABLE.value
+    if field == "thumbnail":
+        return thumbnail_url(row.image_variants, row.nft_image)
+    if field == "image_srcset":
+        return srcsets(row.image_variants)
+    if field in ("price", "royalties"):
+        return str(value) if value is not None else None
+    if field == "timestamp":
+        return value.strftime("%d-%m-%Y %H:%M:%S") if value else None
+    return value
+
+
+def catalog_page(args, category=None):
+    """
+    ✅ Returns one keyset-paginated page of the NFT catalog.
+
+    `args` is a mapping of request arguments (cursor, limit, fields, category,
+    status, min_price, max_price). Pages are ordered newest first on
+    (timestamp, id) so cursors stay stable while new NFTs are minted.
+    """
+    fields = parse_fields(args.get("fields"))
+    limit = parse_limit(args.get("limit"))
+    min_price = _parse_price(args.get("min_price"), "min_price")
+    max_price = _parse_price(args.get("max_price"), "max_price")
+
+    # ✅ Only SELECT what the client asked for, plus the keyset columns
+    columns = {"id": NFT.id, "timestamp": NFT.timestamp}
+    for field in fields:
+        column = CATALOG_FIELDS[field]
+        if field in ("thumbnail", "image_srcset"):
+            columns["image_variants"] = NFT.image_variants
+            columns["nft_image"] = NFT.nft_image
+            continue
+        columns["buyer_id" if field == "status" else field] = column
+    query = db.session.query(*[c.label(name) for name, c in columns.items()])
+
+    category = category or args.get("category")
+    if category:
+        query = query.filter(NFT.category == category)
+    if args.get("status"):
+        query = query.filter(NFT.status == args.get("status"))
+    if min_price is not None:
+        query = query.filter(NFT.price >= min_price)
+    if max_price is not None:
+        query = query.filter(NFT.price <= max_price)
+
+    if args.get("cursor"):
+        ts, nft_id = decode_cursor(args.get("cursor"))
+        query = query.filter(
+            or_(NFT.timestamp < ts, and_(NFT.timestamp == ts, NFT.id < nft_id))
+        )
+
+    rows = (
+        query.order_by(NFT.timestamp.desc(), NFT.id.desc()).limit(limit + 1).all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = [
+        {field: _format(field, getattr(row, field, None), row) for field in fields}
+        for row in rows
+    ]
+    next_cursor = (
+        encode_cursor(rows[-1].timestamp, rows[-1].id) if has_more and rows else None
+    )
+
+    return {
+        "items": items,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+        "limit": limit,
+    }
+
+
+# ✅ Any of these switches a legacy list endpoint to paging (the legacy
+# full dump can't honour filters, so they must not fall through to it)
+CATALOG_ARGS = ("cursor", "limit", "fields", "category", "status", "min_price", "max_price")
+
+
+def wants_catalog_page(args):
+    """✅ Legacy list endpoints switch to paging when any catalog arg is sent"""
+    return any(key in args for key in CATALOG_ARGS)
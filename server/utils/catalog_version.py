@@ -0,0 +1,99 @@
+import os
+import time
+import uuid
+import logging
+from itertools import chain
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..config.variables import CACHE_FOLDER
+from ..models import NFT
+
+VERSION_FILE = os.path.join(CACHE_FOLDER, "catalog.version")
+
+# ✅ Columns whose changes don't alter what the public catalog shows
+_IGNORED_COLUMNS = {"views"}
+
+
+def current_version():
+    """
+    ✅ Returns the catalog version token shared by every worker.
+
+    The token is a random string rewritten on every NFT insert/update/delete,
+    so caches only need to compare it for equality.
+    """
+    try:
+        with open(VERSION_FILE) as f:
+            version = f.read().strip()
+        if version:
+            return version
+    except FileNotFoundError:
+        pass
+    return bump_version()
+
+
+def version_age():
+    """✅ Seconds since the catalog version last changed"""
+    try:
+        return time.time() - os.path.getmtime(VERSION_FILE)
+    except OSError:
+        return 0.0
+
+
+def bump_version():
+    """✅ Publishes a fresh catalog version (atomic rename, safe across workers)"""
+    version = uuid.uuid4().hex
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    tmp_path = f"{VERSION_FILE}.{os.getpid()}.{version}"
+    with open(tmp_path, "w") as f:
+        f.write(version)
+    os.replace(tmp_path, VERSION_FILE)
+    return version
+
+
+def _content_changed(nft):
+    return any(
+        attr.history.has_changes()
+        for attr in inspect(nft).attrs
+        if attr.key not in _IGNORED_COLUMNS
+    )
+
+
+def _before_flush(session, flush_context, instances):
+    changed = any(
+        isinstance(obj, NFT) for obj in chain(session.new, session.deleted)
+    ) or any(
+        isinstance(obj, NFT) and _content_changed(obj) for obj in session.dirty
+    )
+    if changed:
+        session.info["catalog_changed"] = True
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ Bulk `query(NFT).delete()` / `.update()` bypass the flush
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        orm_execute_state.bind_mapper is inspect(NFT)
+    ):
+        orm_execute_state.session.info["catalog_changed"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("catalog_changed", False):
+        try:
+            bump_version()
+        except OSError:
+            logging.exception("Could not bump the catalog version")
+
+
+def _after_rollback(session):
+    session.info.pop("catalog_changed", None)
+
+
+def register_catalog_listeners():
+    """✅ Bump the catalog version whenever a committed change touches NFTs"""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,279 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request, session as cookie_session
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from ..config.variables import (
+    MYSQL_REPLICA_URIS,
+    MYSQL_REPLICA_WEIGHTS,
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_HEALTH_INTERVAL,
+    REPLICA_MAX_LAG,
+    REPLICA_READ_BLUEPRINTS,
+)
+
+# ✅ Longest a committed write may be missing from a replica we still read
+# from: lag limit plus the time until the next health check notices more
+MAX_STALENESS = max(READ_YOUR_WRITES_SECONDS, REPLICA_MAX_LAG + REPLICA_HEALTH_INTERVAL)
+
+READ_METHODS = ("GET", "HEAD")
+STICKY_KEY = "db_primary_until"  # ✅ Flask session key: this client wrote recently
+
+_replicas = []
+_lock = threading.Lock()
+_local = threading.local()
+_thread = None
+_stopping = threading.Event()
+
+
+class Replica:
+    """✅ One read replica: its engine, weight and last health check"""
+
+    def __init__(self, uri, weight=1, **engine_options):
+        self.engine = create_engine(uri, **engine_options)
+        self.name = self.engine.url.render_as_string(hide_password=True)
+        self.weight = max(weight, 0)
+        self.current = 0  # ✅ Smooth weighted round-robin credit
+        self.healthy = False
+        self.lag = None  # ✅ Seconds behind the primary (None: not reported)
+        self.error = None
+        self.checked_at = None
+        self.reads = 0
+        self._status_sql = None
+        event.listen(self.engine, "handle_error", self._on_error)
+
+    def available(self):
+        return (
+            self.healthy
+            and self.weight > 0
+            and (self.lag is None or self.lag <= REPLICA_MAX_LAG)
+        )
+
+    def _on_error(self, context):
+        # ✅ A dropped connection takes the replica out until the next check
+        if context.is_disconnect and self.healthy:
+            self.healthy, self.error = False, str(context.original_exception)
+            logging.warning(f"Replica {self.name} disconnected; reads go to the primary")
+
+    def _replication_lag(self, conn):
+        """✅ Seconds_Behind_Source on MySQL; None where it can't be read"""
+        if conn.dialect.name != "mysql":
+            return None
+        statements = [self._status_sql] if self._status_sql else [
+            "SHOW REPLICA STATUS",  # ✅ MySQL 8.0.22+
+            "SHOW SLAVE STATUS",
+        ]
+        for statement in statements:
+            try:
+                row = conn.execute(text(statement)).mappings().first()
+            except Exception:
+                continue  # ✅ Older server, or no REPLICATION CLIENT grant
+            self._status_sql = statement
+            if row is None:
+                return None  # ✅ Not replicating (e.g. the primary itself in development)
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            if lag is None:
+                raise RuntimeError("replication is not running")
+            return float(lag)
+        return None
+
+    def check(self):
+        was_available = self.available() if self.checked_at is not None else True
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                self.lag = self._replication_lag(conn)
+            self.healthy, self.error = True, None
+        except Exception as e:
+            self.healthy, self.error = False, str(e)
+        self.checked_at = time.time()
+        if was_available != self.available():  # ✅ First check: only report a down replica
+            state = "back in rotation" if self.available() else "out of rotation"
+            logging.warning(
+                f"Replica {self.name} {state} (lag={self.lag}, error={self.error})"
+            )
+
+    def status(self):
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "available": self.available(),
+            "lag": self.lag,
+            "error": self.error,
+            "checked_at": self.checked_at,
+            "reads": self.reads,
+        }
+
+
+def _pick():
+    """✅ Smooth weighted round-robin over the available replicas (None: primary)"""
+    with _lock:
+        candidates = [replica for replica in _replicas if replica.available()]
+        if not candidates:
+            return None
+        total = sum(replica.weight for replica in candidates)
+        for replica in candidates:
+            replica.current += replica.weight
+        chosen = max(candidates, key=lambda replica: replica.current)
+        chosen.current -= total
+        chosen.reads += 1
+        return chosen
+
+
+# ---------------------------------------------------------------- routing
+def read_replica(view):
+    """
+    ✅ Marks a GET view as safe to serve from a replica (admin listings).
+    Put it directly under the route decorator.
+    """
+    view.db_route = "replica"
+    return view
+
+
+def primary_only(view):
+    """✅ Keeps a view's reads on the primary, even in a replica blueprint"""
+    view.db_route = "primary"
+    return view
+
+
+@contextmanager
+def primary_reads():
+    """
+    ✅ Reads inside the block go to the primary. For results kept after the
+    request (caches keyed by the catalog version) that must not predate it.
+    """
+    _local.primary_depth = getattr(_local, "primary_depth", 0) + 1
+    try:
+        yield
+    finally:
+        _local.primary_depth -= 1
+
+
+def _wants_replica():
+    if request.method not in READ_METHODS:
+        return False
+    if cookie_session.get(STICKY_KEY, 0) > time.time():
+        return False  # ✅ Read-your-writes: this client committed something recently
+    view = current_app.view_functions.get(request.endpoint)
+    route = getattr(view, "db_route", None)
+    if route is not None:
+        return route == "replica"
+    return request.blueprint in REPLICA_READ_BLUEPRINTS
+
+
+def request_replica():
+    """✅ The replica serving this request's reads (one per request), or None"""
+    if not _replicas or not has_request_context():
+        return None
+    if getattr(_local, "primary_depth", 0):
+        return None
+    if "db_replica" not in g:
+        g.db_replica = _pick() if _wants_replica() else None
+    return g.db_replica
+
+
+def _is_read(clause):
+    return (
+        getattr(clause, "is_select", False)
+        and getattr(clause, "_for_update_arg", None) is None
+    )
+
+
+class RoutingSession(FlaskSession):
+    """
+    ✅ Sends SELECTs of read-only requests to a replica. Flushes, DML, text()
+    statements, FOR UPDATE and everything outside a request use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _is_read(clause):
+            replica = request_replica()
+            if replica is not None:
+                return replica.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# -------------------------------------------------------------- listeners
+def _wrote(session):
+    session.info["db_router_wrote"] = True
+    if has_request_context():
+        g.db_replica = None  # ✅ The rest of this request reads its own writes
+
+
+def _after_flush(session, flush_context):
+    _wrote(session)
+
+
+def _do_orm_execute(orm_execute_state):
+    if not orm_execute_state.is_select:
+        _wrote(orm_execute_state.session)
+
+
+def _after_commit(session):
+    if session.info.pop("db_router_wrote", False) and has_request_context():
+        cookie_session[STICKY_KEY] = time.time() + MAX_STALENESS
+
+
+def _after_rollback(session):
+    session.info.pop("db_router_wrote", None)
+
+
+def register_router_listeners():
+    """✅ Pins a client to the primary after it commits a write"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+def check_replicas():
+    for replica in list(_replicas):
+        replica.check()
+
+
+def replica_status():
+    """✅ Health, lag and read counts per replica (admin metrics)"""
+    return {
+        "max_lag": REPLICA_MAX_LAG,
+        "max_staleness": MAX_STALENESS,
+        "replicas": [replica.status() for replica in _replicas],
+    }
+
+
+def init_db_router(app):
+    """✅ Replica engines (MYSQL_REPLICA_URIS), listeners and health checks"""
+    global _thread
+    if not MYSQL_REPLICA_URIS:
+        return
+    if not _replicas:
+        engine_options = {
+            "pool_recycle": app.config.get("SQLALCHEMY_POOL_RECYCLE", 280),
+            "pool_pre_ping": app.config.get("SQLALCHEMY_POOL_PRE_PING", True),
+        }
+        for i, uri in enumerate(MYSQL_REPLICA_URIS):
+            weight = MYSQL_REPLICA_WEIGHTS[i] if i < len(MYSQL_REPLICA_WEIGHTS) else 1
+            _replicas.append(Replica(uri, weight, **engine_options))
+    register_router_listeners()
+    check_replicas()  # ✅ Known state before the first request
+    if REPLICA_HEALTH_INTERVAL <= 0 or app.testing:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+
+    def run():
+        while not _stopping.wait(REPLICA_HEALTH_INTERVAL):
+            try:
+                check_replicas()
+            except Exception:
+                logging.exception("Replica health check failed")
+
+    _stopping.clear()
+    _thread = threading.Thread(target=run, name="replica-health", daemon=True)
+    _thread.start()
@@ -1,14 +1,7 @@
 import re
 from flask import flash
-import smtplib
-from email.message import EmailMessage
-from ..config.variables import (
-    MAIL_PASSWORD,
-    MAIL_PORT,
-    MAIL_USERNAME,
-    MAIL_SERVER,
-    MAIL_DEFAULT_FROM,
-)
+from ..config.database import db
+from .mail_queue import enqueue_email
 
 
 # Custom password validation function
@@ -45,22 +38,9 @@ def validate_password(
 
 def send_predefined_email(subject, recipient, plain_text, html_content):
     """
-    Sends an email using credentials from environment variables.
+    Queues an email in the mail outbox and commits it (with anything else
+    pending); the mail workers send it over a pooled SMTP session.
     """
-    smtp_server = MAIL_SERVER
-    smtp_port = MAIL_PORT
-    smtp_user = MAIL_USERNAME
-    smtp_password = MAIL_PASSWORD
-    sender = MAIL_DEFAULT_FROM
-
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = sender
-    msg["To"] = recipient
-    msg.set_content(plain_text)
-    msg.add_alternative(html_content, subtype="html")
-
-    with smtplib.SMTP_SSL(smtp_server, smtp_port) as smtp:
-        smtp.login(smtp_user, smtp_password)
-        smtp.send_message(msg)
+    enqueue_email(subject, recipient, plain_text, html_content)
+    db.session.commit()
     return True
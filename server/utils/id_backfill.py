@@ -0,0 +1,70 @@
+import time
+
+from sqlalchemy import func, select
+
+from ..config.database import db
+from ..models import NFT
+from ..models import NFTStatus
+from ..models import PendingNFTs
+from ..models import User
+
+
+def _in_chunks(table, values, condition, batch_size, pause):
+    """
+    ✅ Runs UPDATE ... WHERE id BETWEEN a AND b chunk by chunk, each in its
+    own short transaction, so no lock is held for longer than one chunk and
+    the job can be stopped and resumed (rows already done no longer match
+    `condition`). Returns the number of rows updated.
+    """
+    with db.engine.connect() as conn:
+        low, high = conn.execute(select(func.min(table.c.id), func.max(table.c.id))).one()
+    if low is None:
+        return 0
+
+    updated = 0
+    for start in range(low, high + 1, batch_size):
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                table.update()
+                .where(table.c.id.between(start, start + batch_size - 1), condition)
+                .values(**values)
+            )
+        updated += result.rowcount
+        if pause:
+            time.sleep(pause)  # ✅ Leave room for the live traffic between chunks
+    return updated
+
+
+def backfill_creator_ids(batch_size=1000, pause=0.0):
+    """
+    ✅ nfts.creator_id from the creator name. Names aren't unique, so the
+    NFT's own user wins when it has that name, else the oldest user with it.
+    """
+    nfts, users = NFT.__table__, User.__table__
+    own = select(users.c.id).where(
+        users.c.id == nfts.c.user_id, users.c.name == nfts.c.creator
+    ).scalar_subquery()
+    oldest = select(func.min(users.c.id)).where(users.c.name == nfts.c.creator).scalar_subquery()
+    named = select(users.c.id).where(users.c.name == nfts.c.creator).exists()
+    return _in_chunks(
+        nfts,
+        {"creator_id": func.coalesce(own, oldest)},
+        nfts.c.creator_id.is_(None) & named,
+        batch_size,
+        pause,
+    )
+
+
+def backfill_minted_links(batch_size=1000, pause=0.0):
+    """✅ pending_nfts.nft_id for approved requests, by the (unique) NFT name"""
+    pending, nfts = PendingNFTs.__table__, NFT.__table__
+    match = select(nfts.c.id).where(nfts.c.nft_name == pending.c.nft_name)
+    return _in_chunks(
+        pending,
+        {"nft_id": match.scalar_subquery()},
+        pending.c.nft_id.is_(None)
+        & (pending.c.status != NFTStatus.PENDING)
+        & match.exists(),
+        batch_size,
+        pause,
+    )
@@ -0,0 +1,135 @@
+import os
+import hashlib
+import logging
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from ..config.variables import IMAGE_VARIANT_FORMATS, IMAGE_VARIANT_WIDTHS
+
+STATIC_ROOT = os.path.join("server", "static")
+VARIANT_FOLDER = os.path.join(STATIC_ROOT, "uploads", "variants")
+VARIANT_URL = "/static/uploads/variants"
+
+QUALITY = {"webp": 80, "avif": 55}
+ORIENTATION = 0x0112  # EXIF tag
+
+_formats = None
+
+
+def variant_formats():
+    """✅ Configured formats this Pillow build can actually encode (best first)"""
+    global _formats
+    if _formats is None:
+        _formats = [fmt for fmt in IMAGE_VARIANT_FORMATS if features.check(fmt)]
+        skipped = set(IMAGE_VARIANT_FORMATS) - set(_formats)
+        if skipped:
+            logging.warning(f"Pillow cannot encode {', '.join(sorted(skipped))}; skipped")
+    return _formats
+
+
+def source_path(image_url):
+    """✅ "/static/uploads/x.jpg" -> filesystem path (None for anything outside static/)"""
+    if not image_url or not image_url.startswith("/static/"):
+        return None
+    path = os.path.normpath(os.path.join(STATIC_ROOT, image_url[len("/static/") :]))
+    if not path.startswith(STATIC_ROOT + os.sep):
+        return None
+    return path
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _variant_name(digest, width, fmt):
+    # ✅ Content-hash names: identical uploads share files, URLs never go stale
+    return f"{digest[:2]}/{digest[:32]}_{width}.{fmt}"
+
+
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)  # ✅ Phone photos carry rotation in EXIF
+    if image.mode in ("P", "LA", "PA"):
+        return image.convert("RGBA")
+    if image.mode not in ("RGB", "RGBA"):
+        return image.convert("RGB")
+    return image
+
+
+def _save(image, path, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    image.save(tmp_path, format=fmt.upper(), quality=QUALITY.get(fmt, 80))
+    os.replace(tmp_path, path)  # ✅ Readers never see a half-written file
+
+
+def build_variants(image_url):
+    """
+    ✅ Generates resized AVIF/WebP copies of an uploaded image.
+
+    Returns {"webp": {"320": url, ...}, "avif": {...}}, or None when the
+    image can't be processed (missing, not an image, animated GIF...). Files
+    that already exist are reused, so calling this again is cheap.
+    """
+    path = source_path(image_url)
+    formats = variant_formats()
+    if path is None or not formats or not os.path.isfile(path):
+        return None
+
+    try:
+        digest = file_hash(path)
+        with Image.open(path) as image:
+            if getattr(image, "is_animated", False):
+                return None  # ✅ Keep animations as uploaded
+
+            # ✅ EXIF orientations 5-8 rotate by 90°, so plan sizes on the rotated image
+            raw_width, raw_height = image.size
+            width = raw_height if image.getexif().get(ORIENTATION) in (5, 6, 7, 8) else raw_width
+            widths = sorted({min(w, width) for w in IMAGE_VARIANT_WIDTHS})
+
+            variants = {fmt: {} for fmt in formats}
+            missing = []
+            for w in widths:
+                for fmt in formats:
+                    name = _variant_name(digest, w, fmt)
+                    variants[fmt][str(w)] = f"{VARIANT_URL}/{name}"
+                    target = os.path.join(VARIANT_FOLDER, name)
+                    if not os.path.exists(target):
+                        missing.append((w, fmt, target))
+            if not missing:
+                return variants
+
+            # ✅ JPEG decoders can downscale while decoding (much faster)
+            scale = max(w for w, _, _ in missing) / width
+            image.draft("RGB", (round(raw_width * scale), round(raw_height * scale)))
+            source = _prepare(image)
+            for w in sorted({w for w, _, _ in missing}, reverse=True):
+                resized = source.copy()
+                resized.thumbnail((w, resized.height), Image.LANCZOS)
+                for _, fmt, target in (m for m in missing if m[0] == w):
+                    _save(resized, target, fmt)
+            return variants
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logging.warning(f"Could not build image variants for {image_url}: {e}")
+        return None
+
+
+def srcsets(variants):
+    """✅ {"webp": "url 320w, url 640w", ...} for <source srcset=...>"""
+    return {
+        fmt: ", ".join(
+            f"{url} {w}w" for w, url in sorted(sizes.items(), key=lambda i: int(i[0]))
+        )
+        for fmt, sizes in (variants or {}).items()
+    }
+
+
+def thumbnail_url(variants, fallback):
+    """✅ Smallest WebP (widest browser support) or the original image"""
+    sizes = (variants or {}).get("webp") or next(iter((variants or {}).values()), None)
+    if not sizes:
+        return fallback
+    return sizes[min(sizes, key=int)]
@@ -0,0 +1,187 @@
+from collections import OrderedDict, namedtuple
+from decimal import Decimal
+
+from sqlalchemy import bindparam, func, select
+
+from ..config.database import db
+from ..models import Ether
+from ..models import LedgerEntry
+
+MAIN = "main"
+GAS = "gas"
+
+# ✅ Ledger account -> cached running-balance column on `ethers`
+BALANCE_COLUMNS = {MAIN: "main_wallet_balance", GAS: "gas_fee_balance"}
+
+HISTORY_LIMIT = 50
+
+Posting = namedtuple("Posting", "user_id account amount kind reference")
+Posting.__new__.__defaults__ = (None,)
+
+
+class InsufficientFunds(Exception):
+    """Raised when a debit would take a balance below zero (or no wallet exists)."""
+
+    def __init__(self, user_id, account, amount, available):
+        self.user_id = user_id
+        self.account = account
+        self.amount = amount
+        self.available = available
+        super().__init__(
+            f"Insufficient {account} balance for user {user_id}: "
+            f"needs {abs(amount)} ETH, has {available} ETH"
+        )
+
+
+def _as_decimal(amount):
+    return amount if isinstance(amount, Decimal) else Decimal(str(amount))
+
+
+def _column(account):
+    try:
+        return Ether.__table__.c[BALANCE_COLUMNS[account]]
+    except KeyError:
+        raise ValueError(f"Unknown ledger account: {account}")
+
+
+def ensure_wallet(user_id):
+    """✅ Creates the user's Ether row if missing (credits need a row to update)"""
+    if Ether.query.filter_by(user_id=user_id).first() is None:
+        db.session.add(Ether(user_id=user_id))
+        db.session.flush()
+
+
+def balances(keys, for_update=False):
+    """✅ {(user_id, account): balance} — one query over the cached balances"""
+    user_ids = {user_id for user_id, _ in keys}
+    query = select(
+        Ether.user_id, Ether.main_wallet_balance, Ether.gas_fee_balance
+    ).where(Ether.user_id.in_(user_ids))
+    if for_update:
+        query = query.with_for_update()  # ✅ Hold the wallets until commit
+    rows = db.session.execute(query)
+    found = {}
+    for row in rows:
+        found[(row.user_id, MAIN)] = row.main_wallet_balance
+        found[(row.user_id, GAS)] = row.gas_fee_balance
+    return {key: found.get(key) for key in keys}
+
+
+def balance(user_id, account=MAIN):
+    """✅ O(1) balance read (the cached running balance, not a SUM over entries)"""
+    return balances([(user_id, account)])[(user_id, account)] or Decimal("0.0000")
+
+
+def post_many(postings):
+    """
+    ✅ Applies a batch of postings atomically and appends their ledger entries.
+
+    Amounts are netted per (user, account) and applied with one executemany
+    conditional UPDATE per account:
+
+        UPDATE ethers SET balance = balance + :net
+        WHERE user_id = :user AND balance + :net >= 0
+
+    so concurrent workers can never overdraw a wallet. Nothing is committed;
+    on InsufficientFunds the caller must roll back the session.
+    """
+    postings = [
+        Posting(p.user_id, p.account, _as_decimal(p.amount), p.kind, p.reference)
+        for p in postings
+    ]
+    if not postings:
+        return []
+
+    net = OrderedDict()
+    for p in postings:
+        _column(p.account)
+        key = (p.user_id, p.account)
+        net[key] = net.get(key, Decimal("0")) + p.amount
+
+    for account in BALANCE_COLUMNS:
+        params = [
+            {"b_user_id": user_id, "b_amount": amount}
+            for (user_id, acct), amount in net.items()
+            if acct == account and amount != 0
+        ]
+        if not params:
+            continue
+
+        column = _column(account)
+        result = db.session.execute(
+            Ether.__table__.update()
+            .where(
+                Ether.__table__.c.user_id == bindparam("b_user_id"),
+                column + bindparam("b_amount") >= 0,
+            )
+            .values(
+                {
+                    column.name: column + bindparam("b_amount"),
+                    "last_updated": func.now(),
+                }
+            ),
+            params,
+        )
+        if result.rowcount != len(params):
+            _raise_insufficient(account, params)
+
+    # ✅ Walk back from the final balances to give every entry its balance_after
+    running = balances(list(net))
+    for (user_id, account), current in running.items():
+        if current is None:  # ✅ Zero net posting against a missing wallet
+            raise InsufficientFunds(user_id, account, net[(user_id, account)], 0)
+
+    entries = []
+    for p in reversed(postings):
+        key = (p.user_id, p.account)
+        entries.append(
+            {
+                "user_id": p.user_id,
+                "account": p.account,
+                "amount": p.amount,
+                "balance_after": running[key],
+                "kind": p.kind,
+                "reference": p.reference,
+            }
+        )
+        running[key] -= p.amount
+    entries.reverse()
+
+    db.session.execute(LedgerEntry.__table__.insert(), entries)
+    return entries
+
+
+def _raise_insufficient(account, params):
+    """Finds which wallet rejected the conditional UPDATE"""
+    current = balances([(p["b_user_id"], account) for p in params])
+    for p in params:
+        available = current[(p["b_user_id"], account)]
+        if available is None or available + p["b_amount"] < 0:
+            raise InsufficientFunds(
+                p["b_user_id"], account, p["b_amount"], available or Decimal("0.0000")
+            )
+    first = params[0]
+    raise InsufficientFunds(first["b_user_id"], account, first["b_amount"], 0)
+
+
+def post(user_id, account, amount, kind, reference=None):
+    """✅ Single credit (amount > 0) or debit (amount < 0); see post_many"""
+    return post_many([Posting(user_id, account, amount, kind, reference)])[0]
+
+
+def credit(user_id, account, amount, kind, reference=None):
+    return post(user_id, account, abs(_as_decimal(amount)), kind, reference)
+
+
+def debit(user_id, account, amount, kind, reference=None):
+    return post(user_id, account, -abs(_as_decimal(amount)), kind, reference)
+
+
+def history(user_id, account=None, before_id=None, limit=HISTORY_LIMIT):
+    """✅ Newest-first entries for a user; pass the last id back as `before_id`"""
+    query = LedgerEntry.query.filter(LedgerEntry.user_id == user_id)
+    if account is not None:
+        query = query.filter(LedgerEntry.account == account)
+    if before_id is not None:
+        query = query.filter(LedgerEntry.id < before_id)
+    return query.order_by(LedgerEntry.id.desc()).limit(limit).all()
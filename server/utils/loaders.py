@@ -0,0 +1,146 @@
+import time
+import threading
+from contextlib import nullcontext
+
+from flask import g, has_app_context
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..config.database import db
+from ..config.variables import USER_CACHE_TTL
+from ..models import Ether
+from ..models import User
+from .db_router import primary_reads
+
+_users = {}  # ✅ user id -> (expires_at, detached snapshot)
+_lock = threading.Lock()
+
+
+# ------------------------------------------------------------ request scope
+def _memo():
+    """✅ Per-request cache on flask.g (gone when the app context ends)"""
+    if "loader_cache" not in g:
+        g.loader_cache = {}
+    return g.loader_cache
+
+
+def _memoized(key, load):
+    cache = _memo()
+    if key in cache:
+        return cache[key]
+    value = load()
+    if value is not None:  # ✅ A row created later in the request must still be found
+        cache[key] = value
+    return value
+
+
+def get_user(user_id):
+    """✅ User by primary key; the session identity map answers repeat calls"""
+    return db.session.get(User, user_id)
+
+
+def get_user_by_name(name):
+    return _memoized(("user_name", name), lambda: User.query.filter_by(name=name).first())
+
+
+def get_ether(user_id):
+    """✅ The user's Ether row, fetched at most once per request"""
+    return _memoized(
+        ("ether", user_id), lambda: Ether.query.filter_by(user_id=user_id).first()
+    )
+
+
+def get_current_ether():
+    return get_ether(current_user.id)
+
+
+# ------------------------------------------------------- cross-request cache
+def _snapshot(user):
+    """✅ Detached copy of the loaded columns, safe to share between sessions"""
+    mapper = User.__mapper__
+    copy = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        set_committed_value(copy, attr.key, getattr(user, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def load_user(user_id):
+    """
+    ✅ Flask-Login user_loader.
+
+    With USER_CACHE_TTL > 0 the row is served from a per-process cache and
+    merged into the request's session without a SELECT (merge(load=False));
+    any committed change to a user drops its entry, and the TTL bounds how
+    stale other workers can be. 0 (default) always reads the database.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    if USER_CACHE_TTL > 0:
+        hit = _users.get(user_id)
+        if hit is not None and hit[0] > time.monotonic():
+            return db.session.merge(hit[1], load=False)
+
+    # ✅ A cached row lives for the TTL: don't start it from a lagging replica
+    with primary_reads() if USER_CACHE_TTL > 0 else nullcontext():
+        user = db.session.get(User, user_id)
+    if user is not None and USER_CACHE_TTL > 0:
+        with _lock:
+            _users[user_id] = (time.monotonic() + USER_CACHE_TTL, _snapshot(user))
+    return user
+
+
+def invalidate_user(user_id=None):
+    """✅ Drops one cached user (or all of them)"""
+    with _lock:
+        if user_id is None:
+            _users.clear()
+        else:
+            _users.pop(user_id, None)
+
+
+def _after_flush(session, flush_context):
+    changed = [
+        obj.id
+        for obj in list(session.dirty) + list(session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    ]
+    if changed:
+        session.info.setdefault("users_changed", set()).update(changed)
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ Bulk query.update()/.delete() on users: ids unknown, drop everything
+    mapper = orm_execute_state.bind_mapper
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and (
+        mapper is not None and mapper.class_ is User
+    ):
+        orm_execute_state.session.info["users_changed_all"] = True
+
+
+def _after_commit(session):
+    if session.info.pop("users_changed_all", None):
+        invalidate_user()
+    for user_id in session.info.pop("users_changed", ()):
+        invalidate_user(user_id)
+    if has_app_context():
+        g.pop("loader_cache", None)  # ✅ Committed rows may have moved on
+
+
+def _after_rollback(session):
+    session.info.pop("users_changed", None)
+    session.info.pop("users_changed_all", None)
+
+
+def register_loader_listeners():
+    """✅ Keeps the load_user cache in step with committed user changes"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
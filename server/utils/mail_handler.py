@@ -1,15 +1,29 @@
 import logging
 from flask import current_app, url_for
-from email.message import EmailMessage
-import smtplib
+from itsdangerous import BadSignature, URLSafeTimedSerializer
 
-from ..config.variables import (
-    MAIL_PASSWORD,
-    MAIL_PORT,
-    MAIL_USERNAME,
-    MAIL_SERVER,
-    MAIL_DEFAULT_FROM,
-)
+from ..config.database import db
+from .mail_queue import enqueue_email
+
+TOKEN_SALT = "password-reset"
+TOKEN_MAX_AGE = 3600  # ✅ Reset links expire after an hour
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config["SECRET_KEY"], salt=TOKEN_SALT)
+
+
+def generate_verification_token(email):
+    """✅ Signed, timestamped token carrying the email (password reset links)"""
+    return _serializer().dumps(email)
+
+
+def verify_token(token, max_age=TOKEN_MAX_AGE):
+    """✅ The email inside a valid token, or None if tampered with or expired"""
+    try:
+        return _serializer().loads(token, max_age=max_age)
+    except BadSignature:  # ✅ SignatureExpired is a subclass
+        return None
 
 
 def send_verification_code(user):
@@ -82,18 +96,12 @@ def send_verification_code(user):
         </html>
         """
 
-        msg = EmailMessage()
-        msg["Subject"] = subject
-        msg["From"] = MAIL_DEFAULT_FROM
-        msg["To"] = recipient
-        msg.set_content(plain_text)
-        msg.add_alternative(html_content, subtype="html")
-
-        with smtplib.SMTP_SSL(MAIL_SERVER, int(MAIL_PORT)) as smtp:
-            smtp.login(MAIL_USERNAME, MAIL_PASSWORD)
-            smtp.send_message(msg)
+        # ✅ Queued: the request no longer waits on the SMTP handshake
+        enqueue_email(subject, recipient, plain_text, html_content)
+        db.session.commit()
         return True
     except Exception as e:
-        logging.exception(f"Error sending verification email: {e}")
-        print(f"❌ Failed to send verification email: {e}")
+        db.session.rollback()
+        logging.exception(f"Error queueing verification email: {e}")
+        print(f"❌ Failed to queue verification email: {e}")
         return False
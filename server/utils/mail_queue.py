@@ -0,0 +1,302 @@
+import os
+import time
+import random
+import socket
+import smtplib
+import logging
+import threading
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..config.database import db
+from ..config.variables import (
+    MAIL_PASSWORD,
+    MAIL_PORT,
+    MAIL_USERNAME,
+    MAIL_SERVER,
+    MAIL_DEFAULT_FROM,
+    MAIL_SMTP_SSL,
+    MAIL_QUEUE_WORKERS,
+    MAIL_QUEUE_BATCH_SIZE,
+    MAIL_QUEUE_MAX_ATTEMPTS,
+    MAIL_QUEUE_POLL_INTERVAL,
+)
+from ..models import MailOutbox
+from ..models import MailStatus
+
+BACKOFF_BASE = 30  # seconds; doubles on every failed attempt
+BACKOFF_MAX = 60 * 60
+LEASE_TIMEOUT = 10 * 60  # "Sending" rows older than this were abandoned by a dead worker
+SESSION_IDLE_TIMEOUT = 60  # close pooled SMTP sessions idle for longer than this
+SESSION_MAX_MESSAGES = 100  # recycle a session after this many messages
+
+_wakeup = threading.Event()
+_workers = []
+
+
+def enqueue_email(subject, recipient, plain_text, html_content=None):
+    """
+    ✅ Adds an email to the outbox in the caller's transaction and returns.
+
+    Only flushed: the caller commits, so the email is only sent if the
+    surrounding work was saved (a rollback drops it too).
+    """
+    mail = MailOutbox(
+        recipient=recipient,
+        subject=subject,
+        plain_text=plain_text,
+        html_content=html_content,
+    )
+    db.session.add(mail)
+    db.session.flush()
+    db.session.info["mail_enqueued"] = True
+    return mail
+
+
+def _after_commit(session):
+    if session.info.pop("mail_enqueued", False):
+        _wakeup.set()  # ✅ Nudge an idle worker instead of waiting for the next poll
+
+
+def _after_rollback(session):
+    session.info.pop("mail_enqueued", None)
+
+
+def build_message(mail):
+    msg = EmailMessage()
+    msg["Subject"] = mail.subject
+    msg["From"] = MAIL_DEFAULT_FROM
+    msg["To"] = mail.recipient
+    msg.set_content(mail.plain_text)
+    if mail.html_content:
+        msg.add_alternative(mail.html_content, subtype="html")
+    return msg
+
+
+class SMTPSession:
+    """✅ One reusable, logged-in SMTP connection (reconnects when dropped)"""
+
+    def __init__(
+        self,
+        host=MAIL_SERVER,
+        port=MAIL_PORT,
+        username=MAIL_USERNAME,
+        password=MAIL_PASSWORD,
+        use_ssl=MAIL_SMTP_SSL,
+        timeout=30,
+    ):
+        self.host = host
+        self.port = int(port) if port else (465 if use_ssl else 25)
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._smtp = None
+        self._last_used = 0.0
+        self._sent = 0
+
+    def _connect(self):
+        cls = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = cls(self.host, self.port, timeout=self.timeout)
+        if self.username:
+            smtp.login(self.username, self.password)
+        self._smtp, self._sent = smtp, 0
+
+    def _usable(self):
+        if self._smtp is None:
+            return False
+        if self._sent >= SESSION_MAX_MESSAGES:
+            return False
+        if time.monotonic() - self._last_used > SESSION_IDLE_TIMEOUT:
+            return False
+        return True
+
+    def send(self, msg):
+        if not self._usable():
+            self.close()
+            self._connect()
+        try:
+            self._smtp.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout):
+            # ✅ The server dropped an idle session: reconnect once and retry
+            self.close()
+            self._connect()
+            self._smtp.send_message(msg)
+        self._sent += 1
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self._smtp = None
+
+    def close_if_idle(self):
+        if self._smtp is not None and (
+            time.monotonic() - self._last_used > SESSION_IDLE_TIMEOUT
+        ):
+            self.close()
+
+
+def backoff_delay(attempts):
+    """✅ Exponential backoff with jitter: 30s, 60s, 120s ... capped at an hour"""
+    delay = min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_batch(worker_id, batch_size=MAIL_QUEUE_BATCH_SIZE):
+    """
+    ✅ Atomically claims up to `batch_size` due emails for this worker.
+
+    Candidates are read with SKIP LOCKED where supported, then flipped to
+    "Sending" with a conditional UPDATE so two workers never claim one row.
+    """
+    now = datetime.now()
+
+    # ✅ Release rows abandoned by a crashed worker
+    MailOutbox.query.filter(
+        MailOutbox.status == MailStatus.SENDING.value,
+        MailOutbox.claimed_at < now - timedelta(seconds=LEASE_TIMEOUT),
+    ).update({"status": MailStatus.PENDING.value}, synchronize_session=False)
+
+    ids = [
+        row.id
+        for row in db.session.query(MailOutbox.id)
+        .filter(
+            MailOutbox.status == MailStatus.PENDING.value,
+            MailOutbox.next_attempt_at <= now,
+        )
+        .order_by(MailOutbox.next_attempt_at, MailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ]
+    if not ids:
+        db.session.commit()
+        return []
+
+    MailOutbox.query.filter(
+        MailOutbox.id.in_(ids), MailOutbox.status == MailStatus.PENDING.value
+    ).update(
+        {
+            "status": MailStatus.SENDING.value,
+            "claimed_by": worker_id,
+            "claimed_at": now,
+        },
+        synchronize_session=False,
+    )
+    db.session.commit()
+
+    return (
+        MailOutbox.query.filter(
+            MailOutbox.id.in_(ids),
+            MailOutbox.status == MailStatus.SENDING.value,
+            MailOutbox.claimed_by == worker_id,
+        )
+        .order_by(MailOutbox.id)
+        .all()
+    )
+
+
+def _mark_sent(mail):
+    mail.status = MailStatus.SENT.value
+    mail.attempts += 1
+    mail.sent_at = datetime.now()
+    mail.last_error = None
+    mail.claimed_by = None
+
+
+def _mark_failed(mail, error, max_attempts):
+    mail.attempts += 1
+    mail.last_error = str(error)[:1000]
+    mail.claimed_by = None
+    if mail.attempts >= max_attempts:
+        mail.status = MailStatus.FAILED.value
+        logging.error(f"Giving up on email {mail.id} to {mail.recipient}: {error}")
+    else:
+        mail.status = MailStatus.PENDING.value
+        mail.next_attempt_at = datetime.now() + timedelta(
+            seconds=backoff_delay(mail.attempts)
+        )
+
+
+def process_batch(session, worker_id, batch_size=MAIL_QUEUE_BATCH_SIZE,
+                  max_attempts=MAIL_QUEUE_MAX_ATTEMPTS):
+    """✅ Claims one batch and sends it over a single SMTP session. Returns #claimed"""
+    batch = claim_batch(worker_id, batch_size)
+    for mail in batch:
+        try:
+            session.send(build_message(mail))
+            _mark_sent(mail)
+        except (smtplib.SMTPException, OSError) as e:
+            logging.warning(f"Error sending email {mail.id}: {e}")
+            session.close()
+            _mark_failed(mail, e, max_attempts)
+        except Exception as e:
+            # ✅ A bad message (e.g. invalid headers) fails alone, not the batch
+            logging.exception(f"Could not build or send email {mail.id}")
+            _mark_failed(mail, e, max_attempts)
+        # ✅ Record each outcome so a crash mid-batch never re-sends delivered mail
+        db.session.commit()
+    return len(batch)
+
+
+class MailWorker(threading.Thread):
+    """✅ Drains the outbox in batches, reusing its own SMTP session"""
+
+    def __init__(self, app, index=0, poll_interval=MAIL_QUEUE_POLL_INTERVAL):
+        super().__init__(name=f"mail-worker-{index}", daemon=True)
+        self.app = app
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"[:64]
+        self.poll_interval = poll_interval
+        self.session = SMTPSession()
+        self._stopping = threading.Event()
+
+    def run(self):
+        with self.app.app_context():
+            while not self._stopping.is_set():
+                try:
+                    claimed = process_batch(self.session, self.worker_id)
+                except Exception:
+                    logging.exception("Mail worker failed to process a batch")
+                    db.session.rollback()
+                    claimed = 0
+                finally:
+                    db.session.remove()
+
+                if claimed:
+                    continue  # ✅ More may be waiting: drain before sleeping
+                self.session.close_if_idle()
+                _wakeup.wait(self.poll_interval)
+                _wakeup.clear()
+        self.session.close()
+
+    def stop(self):
+        self._stopping.set()
+        _wakeup.set()
+
+
+def start_mail_workers(app, count=MAIL_QUEUE_WORKERS):
+    """✅ Starts the in-process worker pool (MAIL_QUEUE_WORKERS=0 to run them elsewhere)"""
+    if app.testing or count <= 0 or _workers:
+        return _workers
+    if not event.contains(Session, "after_commit", _after_commit):
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+    for index in range(count):
+        worker = MailWorker(app, index)
+        worker.start()
+        _workers.append(worker)
+    return _workers
+
+
+def stop_mail_workers():
+    for worker in _workers:
+        worker.stop()
+    for worker in _workers:
+        worker.join(timeout=5)
+    _workers.clear()
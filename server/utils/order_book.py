@@ -0,0 +1,329 @@
+import heapq
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from ..config.database import db
+from ..config.variables import (
+    OFFER_EXPIRE_INTERVAL,
+    OFFER_TTL_HOURS,
+    ORDER_BOOK_PRELOAD,
+    ORDER_BOOK_TTL,
+)
+from ..models import Offers
+from . import stats
+
+PENDING = "Pending"
+ACCEPTED = "Accepted"
+DECLINED = "Declined"
+EXPIRED = "Expired"
+
+# ✅ Pass as execution_options on a bulk offers update already reported to the books
+ACCOUNTED = {"order_book_accounted": True}
+
+_books = {}  # ✅ nft id -> OrderBook (this process only; the offers table is the truth)
+_lock = threading.Lock()  # ✅ Guards _books; each book has its own lock for its heap
+_thread = None
+_stopping = threading.Event()
+
+
+class OrderBook:
+    """
+    ✅ Pending offers on one NFT, best first: highest price, then the
+    earliest offer (lowest id).
+
+    A binary heap gives O(log n) insert and best-offer lookup. Cancelling
+    only marks the entry (O(1)); marked and expired entries are dropped
+    when they reach the top, and the heap is compacted once they outnumber
+    the live ones.
+
+    Request threads read it while `_after_commit` applies other threads'
+    commits, so every method holds the book's lock. It only serves display
+    (the "best offer" on the buy page); settle() ranks in the database.
+    """
+
+    def __init__(self, nft_id):
+        self.nft_id = nft_id
+        self.loaded_at = time.monotonic()
+        self._lock = threading.RLock()
+        self._heap = []
+        self._live = {}  # offer id -> heap entry [-price, offer id, expires_at, live]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._live)
+
+    def add(self, offer_id, price, expires_at=None):
+        with self._lock:
+            self.cancel(offer_id)
+            entry = [-price, offer_id, expires_at, True]
+            self._live[offer_id] = entry
+            heapq.heappush(self._heap, entry)
+
+    def cancel(self, offer_id):
+        with self._lock:
+            entry = self._live.pop(offer_id, None)
+            if entry is not None:
+                entry[3] = False
+                if len(self._heap) > 2 * len(self._live) + 16:
+                    self._heap = [e for e in self._heap if e[3]]
+                    heapq.heapify(self._heap)
+
+    def best(self, now=None):
+        """✅ (offer id, price) of the best unexpired offer, or None"""
+        now = now or datetime.now()
+        with self._lock:
+            while self._heap:
+                price, offer_id, expires_at, live = self._heap[0]
+                if live and (expires_at is None or expires_at > now):
+                    return offer_id, -price
+                heapq.heappop(self._heap)
+                if live:
+                    self._live.pop(offer_id, None)  # ✅ Expired: `expire_offers` declines the row
+            return None
+
+
+# ------------------------------------------------------------------- books
+def _load(nft_ids=None):
+    """✅ Builds books from the pending offers (all NFTs, or just `nft_ids`)"""
+    query = select(Offers.id, Offers.nft_id, Offers.offered_price, Offers.expires_at).where(
+        Offers.action == PENDING, Offers.nft_id.isnot(None)
+    )
+    if nft_ids is not None:
+        query = query.where(Offers.nft_id.in_(nft_ids))
+    books = {nft_id: OrderBook(nft_id) for nft_id in nft_ids or ()}
+    for offer_id, nft_id, price, expires_at in db.session.execute(query):
+        if nft_id not in books:
+            books[nft_id] = OrderBook(nft_id)
+        books[nft_id].add(offer_id, price, expires_at)
+    return books
+
+
+def order_book(nft_id):
+    """✅ The NFT's book, loaded on first use and reloaded after ORDER_BOOK_TTL"""
+    with _lock:
+        book = _books.get(nft_id)
+    if book is None or time.monotonic() - book.loaded_at > ORDER_BOOK_TTL:
+        book = _load([nft_id])[nft_id]
+        with _lock:
+            _books[nft_id] = book
+    return book
+
+
+def rebuild():
+    """✅ Replaces every book from the offers table; returns (books, offers)"""
+    books = _load()
+    with _lock:
+        _books.clear()
+        _books.update(books)
+    return len(books), sum(len(book) for book in books.values())
+
+
+def best_offer(nft_id):
+    """✅ The NFT's best live Offers row, or None"""
+    book = order_book(nft_id)
+    while True:
+        best = book.best()
+        if best is None:
+            return None
+        offer = db.session.get(Offers, best[0])
+        if offer is not None and offer.action == PENDING:
+            return offer
+        book.cancel(best[0])  # ✅ Settled elsewhere (another worker): skip it
+
+
+def new_offer_expiry():
+    """✅ expires_at for an offer placed now (None when OFFER_TTL_HOURS is 0)"""
+    if OFFER_TTL_HOURS <= 0:
+        return None
+    return datetime.now() + timedelta(hours=OFFER_TTL_HOURS)
+
+
+# -------------------------------------------------------------- settlement
+def _set_action(rows, action):
+    """✅ One set-based UPDATE; counters and books told from the loaded rows"""
+    if not rows:
+        return
+    stats.note_bulk(Offers, rows, {"action": action})
+    removed = db.session.info.setdefault("order_book_ops", [])
+    removed.extend(("remove", row.nft_id, row.id, None, None) for row in rows)
+    Offers.query.filter(
+        Offers.id.in_([row.id for row in rows]), Offers.action == PENDING
+    ).execution_options(**stats.ACCOUNTED, **ACCOUNTED).update(
+        {"action": action}, synchronize_session=False
+    )
+
+
+def accept(offer):
+    """
+    ✅ Accepts `offer` and declines every other pending offer on the same
+    NFT in one UPDATE. The caller commits.
+    """
+    offer.action = ACCEPTED
+    if offer.nft_id is None:
+        return 0  # ✅ Legacy offer not linked to an NFT: nothing to settle against
+    competing = (
+        db.session.query(Offers.id, Offers.nft_id, Offers.action)
+        .filter(Offers.nft_id == offer.nft_id, Offers.action == PENDING, Offers.id != offer.id)
+        .all()
+    )
+    _set_action(competing, DECLINED)
+    return len(competing)
+
+
+def settle(nft_id):
+    """
+    ✅ Accepts the NFT's best live offer and declines the rest.
+
+    The best offer is picked in the database, not from this worker's book:
+    a higher offer committed through another worker since the book was
+    loaded must win. The row is locked (FOR UPDATE) and read through
+    ix_offers_nft_action_price. Returns (accepted offer or None, number
+    declined). The caller commits.
+    """
+    now = datetime.now()
+    expire_offers(nft_id=nft_id, now=now, commit=False)
+    offer = (
+        Offers.query.filter(
+            Offers.nft_id == nft_id,
+            Offers.action == PENDING,
+            or_(Offers.expires_at.is_(None), Offers.expires_at > now),
+        )
+        .order_by(Offers.offered_price.desc(), Offers.id)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if offer is None:
+        return None, 0
+    return offer, accept(offer)
+
+
+def expire_offers(nft_id=None, now=None, batch_size=1000, commit=True):
+    """
+    ✅ Marks pending offers past expires_at as Expired; returns how many.
+    commit=False leaves the batches in the caller's transaction (settle()).
+    """
+    now = now or datetime.now()
+    total = 0
+    while True:
+        query = db.session.query(Offers.id, Offers.nft_id, Offers.action).filter(
+            Offers.action == PENDING, Offers.expires_at <= now
+        )
+        if nft_id is not None:
+            query = query.filter(Offers.nft_id == nft_id)
+        rows = query.order_by(Offers.id).limit(batch_size).all()
+        if rows:
+            _set_action(rows, EXPIRED)
+            if commit:
+                db.session.commit()
+        total += len(rows)
+        if len(rows) < batch_size:
+            return total
+
+
+# --------------------------------------------------------------- listeners
+def _after_flush(session, flush_context):
+    ops = []
+    for obj in session.new:
+        if isinstance(obj, Offers) and obj.action == PENDING and obj.nft_id is not None:
+            ops.append(("add", obj.nft_id, obj.id, obj.offered_price, obj.expires_at))
+    for obj in session.dirty:
+        if not isinstance(obj, Offers):
+            continue
+        state = inspect(obj)
+        changed = any(
+            state.attrs[key].history.has_changes()
+            for key in ("action", "nft_id", "offered_price", "expires_at")
+        )
+        if not changed:
+            continue
+        old_nft = state.attrs.nft_id.history.deleted
+        ops.append(("remove", old_nft[0] if old_nft else obj.nft_id, obj.id, None, None))
+        if obj.action == PENDING and obj.nft_id is not None:
+            ops.append(("add", obj.nft_id, obj.id, obj.offered_price, obj.expires_at))
+    for obj in session.deleted:
+        if isinstance(obj, Offers):
+            ops.append(("remove", obj.nft_id, obj.id, None, None))
+    if ops:
+        session.info.setdefault("order_book_ops", []).extend(ops)
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ Bulk query.update()/.delete() on offers: drop the books after commit
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Offers:
+        return
+    if not orm_execute_state.execution_options.get("order_book_accounted"):
+        orm_execute_state.session.info["order_book_reset"] = True
+
+
+def _after_commit(session):
+    ops = session.info.pop("order_book_ops", ())
+    if session.info.pop("order_book_reset", None):
+        with _lock:
+            _books.clear()
+        return
+    with _lock:
+        for op, nft_id, offer_id, price, expires_at in ops:
+            book = _books.get(nft_id)
+            if book is None:
+                continue  # ✅ Not loaded here: the next reader loads it fresh
+            if op == "add":
+                book.add(offer_id, price, expires_at)
+            else:
+                book.cancel(offer_id)
+
+
+def _after_rollback(session):
+    session.info.pop("order_book_ops", None)
+    session.info.pop("order_book_reset", None)
+
+
+def register_order_book_listeners():
+    """✅ Keeps this process's books in step with committed offer changes"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+def init_order_book(app):
+    """✅ Listeners, optional preload (ORDER_BOOK_PRELOAD) and periodic expiry (OFFER_EXPIRE_INTERVAL)"""
+    global _thread
+    register_order_book_listeners()
+    if (OFFER_EXPIRE_INTERVAL <= 0 and not ORDER_BOOK_PRELOAD) or app.testing:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+
+    def run():
+        with app.app_context():
+            if ORDER_BOOK_PRELOAD:
+                try:
+                    rebuild()
+                except Exception:
+                    logging.exception("Order book preload failed")
+                finally:
+                    db.session.remove()
+            if OFFER_EXPIRE_INTERVAL <= 0:
+                return
+            while not _stopping.wait(OFFER_EXPIRE_INTERVAL):
+                try:
+                    expire_offers()
+                except Exception:
+                    db.session.rollback()
+                    logging.exception("Periodic offer expiry failed")
+                finally:
+                    db.session.remove()
+
+    _stopping.clear()
+    _thread = threading.Thread(target=run, name="offer-expiry", daemon=True)
+    _thread.start()
@@ -0,0 +1,257 @@
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import delete, event, func, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from ..config.database import db
+from ..models import NFT
+from ..models import NFTStatus
+from ..models import PendingNFTs
+from ..models import User
+from ..models import UserPortfolio
+
+# ✅ "Listed" in My Collection means for sale and approved (what the listed tab shows)
+FOR_SALE = NFTStatus.AVAILABLE.value
+SOLD = NFTStatus.SOLD.value
+
+# ✅ Columns whose changes move a holding (views, names, images don't)
+_NFT_COLUMNS = ("user_id", "buyer_id", "status", "price", "timestamp")
+_PENDING_COLUMNS = ("user_id", "status")
+
+# ✅ Pass as execution_options on a bulk NFT/PendingNFTs write reported via note_users()
+ACCOUNTED = {"portfolio_accounted": True}
+
+
+# ------------------------------------------------------------- projection
+def _empty(user_id):
+    return {
+        "user_id": user_id,
+        "created_count": 0,
+        "listed_count": 0,
+        "sold_count": 0,
+        "bought_count": 0,
+        "pending_count": 0,
+        "listed_value": Decimal("0"),
+        "owned_value": Decimal("0"),
+        "listed_ids": [],
+        "bought_ids": [],
+        "last_activity_at": None,
+    }
+
+
+def _latest(current, moment):
+    if moment is None:
+        return current
+    if moment.tzinfo is not None:
+        moment = moment.replace(tzinfo=None)
+    return moment if current is None or moment > current else current
+
+
+def _compute(conn, user_ids):
+    """✅ Projections for `user_ids` from two indexed queries (nfts, pending_nfts)"""
+    wanted = set(user_ids)
+    projections = {user_id: _empty(user_id) for user_id in wanted}
+    nfts = conn.execute(
+        select(NFT.id, NFT.user_id, NFT.buyer_id, NFT.status, NFT.price, NFT.timestamp)
+        .where(or_(NFT.user_id.in_(wanted), NFT.buyer_id.in_(wanted)))
+        .order_by(NFT.timestamp.desc(), NFT.id.desc())
+    )
+    for nft_id, owner, buyer, status, price, timestamp in nfts:
+        if owner in wanted:
+            p = projections[owner]
+            p["created_count"] += 1
+            if status == FOR_SALE:
+                p["listed_count"] += 1
+                p["listed_value"] += price or 0
+                p["listed_ids"].append(nft_id)
+            elif status == SOLD:
+                p["sold_count"] += 1
+            p["last_activity_at"] = _latest(p["last_activity_at"], timestamp)
+        if buyer in wanted and status == SOLD:
+            p = projections[buyer]
+            p["bought_count"] += 1
+            p["owned_value"] += price or 0
+            p["bought_ids"].append(nft_id)
+            p["last_activity_at"] = _latest(p["last_activity_at"], timestamp)
+
+    pending = conn.execute(
+        select(PendingNFTs.user_id, func.count(), func.max(PendingNFTs.timestamp))
+        .where(PendingNFTs.user_id.in_(wanted), PendingNFTs.status == NFTStatus.PENDING)
+        .group_by(PendingNFTs.user_id)
+    )
+    for user_id, count, latest in pending:
+        projections[user_id]["pending_count"] = count
+        projections[user_id]["last_activity_at"] = _latest(
+            projections[user_id]["last_activity_at"], latest
+        )
+    return projections
+
+
+def _upsert(conn, projections):
+    """✅ Writes whole projection rows (absolute values, so replays are harmless)"""
+    table = UserPortfolio.__table__
+    now = datetime.now()
+    rows = [dict(p, updated_at=now) for _, p in sorted(projections.items())]
+    columns = [key for key in rows[0] if key != "user_id"]
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in columns})
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"], set_={c: stmt.excluded[c] for c in columns}
+        )
+    conn.execute(stmt, rows)
+
+
+def refresh(user_ids):
+    """✅ Recomputes and stores the given users' projections on their own connection"""
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if not user_ids:
+        return {}
+    with db.engine.begin() as conn:
+        projections = _compute(conn, user_ids)
+        _upsert(conn, projections)
+    return projections
+
+
+def rebuild(batch_size=500):
+    """✅ Recomputes every user's projection in batches; returns how many were written"""
+    written = 0
+    last_id = 0
+    while True:
+        user_ids = db.session.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+        ).all()
+        db.session.commit()  # ✅ Don't pin a snapshot while the batches are written
+        if not user_ids:
+            break
+        written += len(refresh(user_ids))
+        last_id = user_ids[-1]
+    with db.engine.begin() as conn:
+        # ✅ Users deleted without a cascading FK (SQLite) leave orphans behind
+        table = UserPortfolio.__table__
+        conn.execute(delete(table).where(table.c.user_id.notin_(select(User.__table__.c.id))))
+    return written
+
+
+def get_portfolio(user_id):
+    """
+    ✅ The user's projection by primary key. A user without one yet (new, or
+    after a bulk reset) gets it computed and stored on first read.
+    """
+    portfolio = db.session.get(UserPortfolio, user_id)
+    if portfolio is None:
+        projection = refresh([user_id])[user_id]
+        portfolio = UserPortfolio(**projection)  # ✅ Transient copy of the row just written
+    return portfolio
+
+
+# -------------------------------------------------------------- listeners
+def note_users(user_ids):
+    """✅ Reports users touched by a set-based write the flush can't see"""
+    db.session.info.setdefault("portfolio_users", set()).update(
+        user_id for user_id in user_ids if user_id is not None
+    )
+
+
+def _touched(obj, columns):
+    """✅ Current and previous owners of a row whose holding-relevant columns changed"""
+    state = inspect(obj)
+    if not any(state.attrs[key].history.has_changes() for key in columns):
+        return ()
+    users = {getattr(obj, "user_id", None), getattr(obj, "buyer_id", None)}
+    for key in ("user_id", "buyer_id"):
+        if key in columns:
+            users.update(state.attrs[key].history.deleted)
+    return users
+
+
+def _after_flush(session, flush_context):
+    users = set()
+    for obj in session.new | session.deleted:
+        if isinstance(obj, NFT):
+            users.update((obj.user_id, obj.buyer_id))
+        elif isinstance(obj, PendingNFTs):
+            users.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, NFT):
+            users.update(_touched(obj, _NFT_COLUMNS))
+        elif isinstance(obj, PendingNFTs):
+            users.update(_touched(obj, _PENDING_COLUMNS))
+    users.discard(None)
+    if users:
+        session.info.setdefault("portfolio_users", set()).update(users)
+
+
+def _set_columns(orm_execute_state):
+    """✅ Column names a bulk UPDATE writes, or None when they can't be told"""
+    statement = orm_execute_state.statement
+    values = statement._ordered_values or list((statement._values or {}).items())
+    names = {key if isinstance(key, str) else getattr(key, "key", None) for key, _ in values}
+    params = orm_execute_state.parameters
+    for row in params if isinstance(params, (list, tuple)) else [params or {}]:
+        names.update(row)
+    if None in names or not names:
+        return None
+    return names
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ Bulk writes to nfts/pending_nfts bypass the flush: drop every projection
+    # unless the UPDATE provably leaves the holding columns alone (e.g. views)
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if orm_execute_state.execution_options.get("portfolio_accounted"):
+        return
+    mapper = orm_execute_state.bind_mapper
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = mapper.local_table.name if mapper is not None else getattr(table, "name", None)
+    if name not in ("nfts", "pending_nfts"):
+        return
+    if orm_execute_state.is_update:
+        columns = _set_columns(orm_execute_state)
+        watched = _NFT_COLUMNS if name == "nfts" else _PENDING_COLUMNS
+        if columns is not None and not columns.intersection(watched):
+            return
+    orm_execute_state.session.info["portfolio_reset"] = True
+
+
+def _after_commit(session):
+    users = session.info.pop("portfolio_users", None)
+    reset = session.info.pop("portfolio_reset", None)
+    if not users and not reset:
+        return
+    try:
+        if reset:
+            # ✅ Recomputed lazily by get_portfolio() (or `flask portfolio rebuild`)
+            with db.engine.begin() as conn:
+                conn.execute(delete(UserPortfolio.__table__))
+        else:
+            refresh(users)
+    except Exception:
+        logging.exception("Could not update portfolios (run `flask portfolio rebuild`)")
+
+
+def _after_rollback(session):
+    session.info.pop("portfolio_users", None)
+    session.info.pop("portfolio_reset", None)
+
+
+def register_portfolio_listeners():
+    """✅ Refresh the projections of users whose NFTs or minting requests changed"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
@@ -0,0 +1,283 @@
+import os
+import json
+import time
+import logging
+import threading
+from decimal import Decimal, InvalidOperation
+
+import requests
+
+from ..config.variables import (
+    CACHE_FOLDER,
+    PRICE_ORACLE_SOURCES,
+    PRICE_ORACLE_TTL,
+    PRICE_ORACLE_STALE_TTL,
+    PRICE_ORACLE_REFRESH_INTERVAL,
+)
+
+CRYPTOCOMPARE_URL = "https://min-api.cryptocompare.com/data/price?fsym=ETH&tsyms=USD"
+LAST_GOOD_FILE = os.path.join(CACHE_FOLDER, "eth_price.json")
+
+
+class PriceSourceError(Exception):
+    """Raised when a price source cannot produce a usable price."""
+
+
+def _to_price(value):
+    try:
+        price = Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise PriceSourceError(f"Invalid price value: {value!r}")
+    if price <= 0:
+        raise PriceSourceError(f"Invalid price value: {value!r}")
+    return price
+
+
+class CryptoCompareSource:
+    """✅ Live ETH/USD price from cryptocompare"""
+
+    name = "cryptocompare"
+
+    def __init__(self, url=CRYPTOCOMPARE_URL, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        try:
+            response = requests.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            return _to_price(response.json()["USD"])
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            raise PriceSourceError(f"cryptocompare: {e}")
+
+
+class FilePriceSource:
+    """✅ Reads {"USD": <price>} (or a bare number) from a local file — offline/tests"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = f"file:{path}"
+
+    def fetch(self):
+        try:
+            with open(self.path) as f:
+                raw = f.read().strip()
+        except OSError as e:
+            raise PriceSourceError(f"{self.name}: {e}")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        if isinstance(value, dict):
+            value = value.get("USD")
+        return _to_price(value)
+
+
+def build_sources(spec):
+    """✅ "cryptocompare,file:/path/price.json" -> source objects, tried in order"""
+    sources = []
+    for item in (s.strip() for s in spec.split(",")):
+        if item == "cryptocompare":
+            sources.append(CryptoCompareSource())
+        elif item.startswith("file:"):
+            sources.append(FilePriceSource(item[len("file:") :]))
+        elif item:
+            logging.warning(f"Unknown price source '{item}' ignored")
+    return sources
+
+
+class PriceOracle:
+    """
+    ✅ TTL-cached ETH/USD price with stale-while-revalidate.
+
+    - fresh (age < ttl): served from memory
+    - stale (age < stale_ttl): served from memory, refreshed in the background
+    - expired / empty: fetched synchronously; on failure the last known good
+      price (kept in memory and on disk) is served instead
+    """
+
+    def __init__(self, sources, ttl=60, stale_ttl=900, last_good_file=LAST_GOOD_FILE):
+        self.sources = sources
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.last_good_file = last_good_file
+
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._price = None
+        self._fetched_at = 0.0
+        self._failed_at = None
+        self._source = None
+        self._thread = None
+        self._stop = threading.Event()
+
+        self._stats = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "fallbacks": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "fetch_time_total_ms": 0.0,
+            "last_fetch_ms": None,
+        }
+
+    # ---------------------------------------------------------------- fetching
+    def _fetch(self):
+        for source in self.sources:
+            started = time.perf_counter()
+            try:
+                price = source.fetch()
+            except PriceSourceError as e:
+                logging.warning(f"Error fetching ETH price: {e}")
+                self._record_fetch(started, ok=False)
+                continue
+            self._record_fetch(started, ok=True)
+            return price, source.name
+        return None, None
+
+    def _record_fetch(self, started, ok):
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["fetches"] += 1
+            self._stats["fetch_time_total_ms"] += elapsed_ms
+            self._stats["last_fetch_ms"] = round(elapsed_ms, 2)
+            if not ok:
+                self._stats["fetch_errors"] += 1
+
+    def refresh(self):
+        """✅ Fetch now; keeps the previous price if every source fails"""
+        if not self._refreshing.acquire(blocking=False):
+            return self._price  # ✅ Single flight: a refresh is already running
+        try:
+            price, source = self._fetch()
+            if price is not None:
+                with self._lock:
+                    self._price, self._source = price, source
+                    self._fetched_at = time.monotonic()
+                    self._failed_at = None
+                self._save_last_good(price, source)
+            else:
+                self._failed_at = time.monotonic()
+            return price
+        finally:
+            self._refreshing.release()
+
+    def _refresh_in_background(self):
+        threading.Thread(target=self.refresh, daemon=True).start()
+
+    # ----------------------------------------------------------- last known good
+    def _save_last_good(self, price, source):
+        try:
+            os.makedirs(os.path.dirname(self.last_good_file), exist_ok=True)
+            tmp_path = f"{self.last_good_file}.{os.getpid()}"
+            with open(tmp_path, "w") as f:
+                json.dump({"USD": str(price), "source": source, "at": time.time()}, f)
+            os.replace(tmp_path, self.last_good_file)
+        except OSError:
+            logging.exception("Could not persist last known ETH price")
+
+    def _load_last_good(self):
+        try:
+            return FilePriceSource(self.last_good_file).fetch()
+        except PriceSourceError:
+            return None
+
+    # ------------------------------------------------------------------ reading
+    def get_price(self):
+        """✅ ETH price in USD as Decimal, or None if no price was ever known"""
+        age = time.monotonic() - self._fetched_at
+        if self._price is not None and age < self.ttl:
+            self._count("hits")
+            return self._price
+
+        if self._price is not None and age < self.stale_ttl:
+            self._count("stale_hits")
+            self._refresh_in_background()
+            return self._price
+
+        # ✅ Upstream failed recently: don't stall every request retrying it
+        if (
+            self._price is not None
+            and self._failed_at is not None
+            and time.monotonic() - self._failed_at < self.ttl
+        ):
+            self._count("fallbacks")
+            self._refresh_in_background()
+            return self._price
+
+        self._count("misses")
+        price = self.refresh()
+        if price is not None:
+            return price
+
+        # ✅ Every source failed: fall back to the last known good price
+        fallback = self._price or self._load_last_good()
+        if fallback is not None:
+            self._count("fallbacks")
+            with self._lock:
+                if self._price is None:
+                    # ✅ Keep it (already past stale_ttl) so the next requests take
+                    # the "failed recently" branch instead of blocking on the fetch
+                    self._price, self._source = fallback, "last_good"
+                    self._fetched_at = time.monotonic() - self.stale_ttl
+                    self._failed_at = self._failed_at or time.monotonic()
+        return fallback
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    # --------------------------------------------------------------- background
+    def start(self, interval):
+        """✅ Refresh every `interval` seconds in a daemon thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            while not self._stop.is_set():
+                self.refresh()
+                self._stop.wait(interval)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=run, name="price-oracle", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ------------------------------------------------------------------ metrics
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+            price, source, fetched_at = self._price, self._source, self._fetched_at
+
+        reads = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round((stats["hits"] + stats["stale_hits"]) / reads, 4) if reads else None
+        )
+        stats["avg_fetch_ms"] = (
+            round(stats["fetch_time_total_ms"] / stats["fetches"], 2)
+            if stats["fetches"]
+            else None
+        )
+        del stats["fetch_time_total_ms"]
+        stats["price"] = str(price) if price is not None else None
+        stats["source"] = source
+        stats["age_seconds"] = (
+            round(time.monotonic() - fetched_at, 1) if price is not None else None
+        )
+        return stats
+
+
+eth_price_oracle = PriceOracle(
+    build_sources(PRICE_ORACLE_SOURCES),
+    ttl=PRICE_ORACLE_TTL,
+    stale_ttl=PRICE_ORACLE_STALE_TTL,
+)
+
+
+def init_price_oracle(app):
+    """✅ Optional background refresh so requests never wait on the upstream"""
+    if PRICE_ORACLE_REFRESH_INTERVAL > 0 and not app.testing:
+        eth_price_oracle.start(PRICE_ORACLE_REFRESH_INTERVAL)
@@ -0,0 +1,91 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import wraps
+
+from flask import Response, make_response, request
+from flask_login import current_user
+
+from .catalog_version import current_version, version_age
+from .db_router import MAX_STALENESS, primary_reads
+
+MAX_ENTRIES = 512
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+def _cache_key(version):
+    """✅ (endpoint, args, version) plus the viewer, since NFT.data() is per-user"""
+    viewer = current_user.id if current_user.is_authenticated else None
+    return (
+        request.endpoint,
+        tuple(sorted((request.view_args or {}).items())),
+        tuple(sorted(request.args.items(multi=True))),
+        viewer,
+        version,
+    )
+
+
+def _lookup(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            _entries.move_to_end(key)
+        return entry
+
+
+def _store(key, entry):
+    with _lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _respond(body, etag, mimetype):
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"  # ✅ Always revalidate
+    return response
+
+
+def clear_response_cache():
+    with _lock:
+        _entries.clear()
+
+
+def cached_catalog_response(view):
+    """
+    ✅ Caches a public catalog JSON view until the catalog version changes.
+
+    Responses are stored pre-encoded with a strong ETag; a matching
+    `If-None-Match` gets an empty 304 without touching the database.
+    """
+
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        key = _cache_key(current_version())
+        entry = _lookup(key)
+        if entry is not None:
+            return _respond(*entry)
+
+        # ✅ The entry outlives replica lag: fill it from the primary while a
+        # replica may still be missing the change that made this version
+        fresh = version_age() < MAX_STALENESS
+        with primary_reads() if fresh else nullcontext():
+            response = make_response(view(*args, **kwargs))
+        if response.status_code != 200 or response.direct_passthrough:
+            return response
+
+        body = response.get_data()
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        entry = (body, etag, response.mimetype)
+        _store(key, entry)
+        return _respond(*entry)
+
+    return decorated_function
@@ -0,0 +1,284 @@
+import re
+import math
+import time
+import bisect
+import threading
+from collections import defaultdict
+
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import match
+
+from ..config.database import db
+from ..config.variables import SEARCH_BACKEND
+from ..models import NFT
+from ..models import User
+from .catalog_version import current_version
+from .db_router import primary_reads
+
+PER_PAGE = 20
+USER_INDEX_TTL = 300  # seconds before the fallback user index is rebuilt
+
+# ✅ Field weights used by the fallback ranking (name matches rank highest)
+NFT_FIELDS = {
+    "nft_name": 3.0,
+    "category": 2.0,
+    "creator": 2.0,
+    "collection_name": 1.0,
+    "description": 1.0,
+}
+USER_FIELDS = {"name": 3.0, "email": 2.0, "id": 1.0, "usr_id": 1.0}
+
+PREFIX_WEIGHT = 0.5  # a prefix hit counts half as much as an exact token
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    if text is None:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+class InvertedIndex:
+    """
+    ✅ Pure-Python inverted index with weighted fields and prefix matching.
+
+    Postings map token -> {doc_id: weight}; a sorted vocabulary gives prefix
+    lookups by bisect. Every query term must match (exact or as a prefix).
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.postings = defaultdict(dict)
+        self.doc_tokens = {}
+        self.vocabulary = []
+
+    def add(self, doc_id, doc):
+        self.remove(doc_id)
+        weights = defaultdict(float)
+        for field, weight in self.fields.items():
+            for token in tokenize(getattr(doc, field, None)):
+                weights[token] += weight
+
+        for token, weight in weights.items():
+            if token not in self.postings:
+                bisect.insort(self.vocabulary, token)
+            self.postings[token][doc_id] = weight
+        self.doc_tokens[doc_id] = list(weights)
+
+    def remove(self, doc_id):
+        for token in self.doc_tokens.pop(doc_id, ()):
+            docs = self.postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[token]
+                i = bisect.bisect_left(self.vocabulary, token)
+                if i < len(self.vocabulary) and self.vocabulary[i] == token:
+                    del self.vocabulary[i]
+
+    def _expand(self, term):
+        """✅ Exact token first, then every vocabulary token starting with it"""
+        i = bisect.bisect_left(self.vocabulary, term)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(term):
+            token = self.vocabulary[i]
+            yield token, 1.0 if token == term else PREFIX_WEIGHT
+            i += 1
+
+    def search(self, query, offset=0, limit=PER_PAGE):
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        total_docs = max(len(self.doc_tokens), 1)
+        scores = None
+        for term in terms:
+            term_scores = defaultdict(float)
+            for token, factor in self._expand(term):
+                docs = self.postings[token]
+                idf = math.log(1 + total_docs / len(docs))
+                for doc_id, weight in docs.items():
+                    term_scores[doc_id] = max(
+                        term_scores[doc_id], weight * factor * idf
+                    )
+
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [doc_id for doc_id, _ in ranked[offset : offset + limit]]
+
+
+def _fetch_in_order(model, ids):
+    if not ids:
+        return []
+    rows = {row.id: row for row in model.query.filter(model.id.in_(ids)).all()}
+    return [rows[i] for i in ids if i in rows]
+
+
+class PythonSearchBackend:
+    """✅ Fallback for SQLite / tests: in-process indexes kept in sync incrementally"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nft_index = None
+        self._nft_version = None
+        self._user_index = None
+        self._user_signature = None
+
+    def _nfts(self):
+        version = current_version()
+        with self._lock:
+            # ✅ Another worker changed the catalog: rebuild from the table
+            if self._nft_index is None or self._nft_version != version:
+                index = InvertedIndex(NFT_FIELDS)
+                with primary_reads():  # ✅ Kept for the whole version: no replica lag
+                    for nft in NFT.query.all():
+                        index.add(nft.id, nft)
+                self._nft_index, self._nft_version = index, version
+            return self._nft_index
+
+    def _users(self):
+        signature = db.session.query(func.count(User.id), func.max(User.id)).one()
+        signature = (tuple(signature), int(time.time() // USER_INDEX_TTL))
+        with self._lock:
+            if self._user_index is None or self._user_signature != signature:
+                index = InvertedIndex(USER_FIELDS)
+                for user in User.query.all():
+                    index.add(user.id, user)
+                self._user_index, self._user_signature = index, signature
+            return self._user_index
+
+    def search_nfts(self, query, page=1, per_page=PER_PAGE):
+        ids = self._nfts().search(query, (page - 1) * per_page, per_page + 1)
+        return _fetch_in_order(NFT, ids[:per_page]), len(ids) > per_page
+
+    def search_users(self, query, page=1, per_page=PER_PAGE):
+        ids = self._users().search(query, (page - 1) * per_page, per_page + 1)
+        return _fetch_in_order(User, ids[:per_page]), len(ids) > per_page
+
+    def index_nft(self, nft):
+        with self._lock:
+            if self._nft_index is None:
+                return
+            self._nft_index.add(nft.id, nft)
+            self._nft_version = current_version()
+
+    def remove_nft(self, nft_id):
+        with self._lock:
+            if self._nft_index is not None:
+                self._nft_index.remove(nft_id)
+                self._nft_version = current_version()
+
+
+class MySQLSearchBackend:
+    """✅ InnoDB FULLTEXT indexes (ft_nfts_search / ft_users_search), ranked by relevance"""
+
+    @staticmethod
+    def _boolean_query(query):
+        # ✅ Every term is required and matched as a prefix: "+blue* +ape*"
+        return " ".join(f"+{term}*" for term in tokenize(query))
+
+    def search_nfts(self, query, page=1, per_page=PER_PAGE):
+        against = self._boolean_query(query)
+        if not against:
+            return [], False
+
+        relevance = match(
+            NFT.nft_name,
+            NFT.category,
+            NFT.collection_name,
+            NFT.creator,
+            NFT.description,
+            against=against,
+        ).in_boolean_mode()
+        results = (
+            NFT.query.filter(relevance)
+            .order_by(relevance.desc(), NFT.id.desc())
+            .offset((page - 1) * per_page)
+            .limit(per_page + 1)
+            .all()
+        )
+        return results[:per_page], len(results) > per_page
+
+    @staticmethod
+    def _exact_users(query):
+        """✅ Users whose id or usr_id is exactly `query`: primary / unique key probes"""
+        query = query.strip()
+        if not query:
+            return []
+        users = User.query.filter(User.usr_id == query).all()
+        if query.isdigit():
+            user = db.session.get(User, int(query))
+            if user is not None and user not in users:
+                users.insert(0, user)
+        return users
+
+    def search_users(self, query, page=1, per_page=PER_PAGE):
+        # ✅ Identifier hits first, then the MATCH-only query. OR-ing them into
+        # one WHERE stops MySQL using ft_users_search (a full scan per search)
+        exact = self._exact_users(query)
+        offset = (page - 1) * per_page
+        results = exact[offset:offset + per_page + 1]
+
+        against = self._boolean_query(query)
+        if against and len(results) <= per_page:
+            relevance = match(User.name, User.email, against=against).in_boolean_mode()
+            matches = User.query.filter(relevance)
+            if exact:
+                matches = matches.filter(User.id.notin_([user.id for user in exact]))
+            results += (
+                matches.order_by(relevance.desc(), User.id.desc())
+                .offset(max(offset - len(exact), 0))
+                .limit(per_page + 1 - len(results))
+                .all()
+            )
+        return results[:per_page], len(results) > per_page
+
+    def index_nft(self, nft):
+        pass  # ✅ InnoDB maintains FULLTEXT indexes on write
+
+    def remove_nft(self, nft_id):
+        pass
+
+
+_backends = {}
+
+
+def get_search_backend():
+    """✅ SEARCH_BACKEND=mysql|python, or auto (FULLTEXT on MySQL, else Python)"""
+    name = SEARCH_BACKEND
+    if name == "auto":
+        name = "mysql" if db.engine.dialect.name == "mysql" else "python"
+
+    if name not in _backends:
+        _backends[name] = (
+            MySQLSearchBackend() if name == "mysql" else PythonSearchBackend()
+        )
+    return _backends[name]
+
+
+def search_nfts(query, page=1, per_page=PER_PAGE):
+    return get_search_backend().search_nfts(query, page, per_page)
+
+
+def search_users(query, page=1, per_page=PER_PAGE):
+    return get_search_backend().search_users(query, page, per_page)
+
+
+def index_nft(nft):
+    """✅ Call after committing a created/edited NFT"""
+    get_search_backend().index_nft(nft)
+
+
+def remove_nft(nft_id):
+    get_search_backend().remove_nft(nft_id)
@@ -0,0 +1,274 @@
+import os
+import json
+import glob
+import random
+import logging
+import threading
+
+from flask import Response, current_app
+from flask_login import current_user
+from sqlalchemy import and_, func, or_
+
+from ..config.database import db
+from ..config.variables import CACHE_FOLDER
+from ..models import NFT
+from ..models import NFTStatus
+from .catalog_version import current_version
+from .db_router import primary_reads
+from .images import srcsets, thumbnail_url
+
+# ✅ Categories the rotating homepage sections (ttp / nl) pick from
+SHELF_CATEGORIES = [
+    "3d-art",
+    "abstract-art",
+    "category-art",
+    "digital-art",
+    "fantasy-art",
+    "generative-art",
+    "gif-art",
+    "installation-art",
+    "pop-art",
+    "minimalism",
+    "painting",
+    "photography",
+    "photorealism",
+    "printmaking",
+    "sculpture",
+    "surrealism",
+    "drawing",
+    "comic-art",
+    "outsider-art",
+]
+
+RECENT_COUNT = 5  # hero: newest NFTs overall
+NEWEST_PER_CATEGORY = 2  # nl: newest NFTs per category
+BSL_POSITION = 3  # bsl: 3rd listed NFT per category
+EXP_POSITION = 4  # exp: 4th NFT per category (any status)
+
+EMPTY_WARNINGS = {
+    "hero": "No NFTs found!",
+    "bsl": "No NFTs found with at least 3 listed items in each category",
+    "exp": "No NFTs found with at least 6 listed items in each category",
+    "nl": "No recent NFTs found in selected categories",
+    "ttp": "No NFTs found in these categories",
+}
+
+_lock = threading.Lock()
+# ✅ Swapped whole for each catalog version, so the pre-encoded JSON always
+# sits next to the data it was encoded from
+_shelves = {"version": None, "data": None, "encoded": {}}
+
+
+def _item(row):
+    """✅ Viewer-neutral NFT.data(); the buyer's own status is patched on serve"""
+    return {
+        "id": row.id,
+        "ref_number": row.ref_number,
+        "nft_name": row.nft_name,
+        "nft_image": row.nft_image,
+        "thumbnail": thumbnail_url(row.image_variants, row.nft_image),
+        "image_srcset": srcsets(row.image_variants),
+        "category": row.category,
+        "collection_name": row.collection_name,
+        "price": str(row.price),
+        "description": row.description,
+        "royalties": str(row.royalties),
+        "views": row.views,
+        "status": NFTStatus.AVAILABLE.value,
+        "creator": row.creator,
+        "buyer_id": row.buyer_id,
+        "user_id": row.user_id,
+        "timestamp": row.timestamp.strftime("%d-%m-%Y %H:%M:%S"),
+    }
+
+
+def build_shelves():
+    """
+    ✅ Materializes every homepage section in a single window-function pass.
+
+    Each NFT is ranked inside its category (and status) once; the outer query
+    keeps only the rows some shelf needs, replacing the DISTINCT category +
+    one-query-per-category pattern the endpoints used to run.
+    """
+    available = NFTStatus.AVAILABLE.value
+    by_category_status = (NFT.category, NFT.status)
+
+    ranked = db.session.query(
+        *NFT.__table__.columns,
+        func.row_number()
+        .over(partition_by=by_category_status, order_by=(NFT.timestamp, NFT.id))
+        .label("rn_oldest"),
+        func.row_number()
+        .over(
+            partition_by=by_category_status,
+            order_by=(NFT.timestamp.desc(), NFT.id.desc()),
+        )
+        .label("rn_newest"),
+        func.row_number()
+        .over(partition_by=by_category_status, order_by=NFT.id)
+        .label("rn_listed"),
+        func.row_number()
+        .over(partition_by=NFT.category, order_by=NFT.id)
+        .label("rn_any"),
+        func.row_number()
+        .over(partition_by=NFT.status, order_by=(NFT.timestamp.desc(), NFT.id.desc()))
+        .label("rn_recent"),
+    ).subquery()
+
+    rows = (
+        db.session.query(ranked)
+        .filter(
+            or_(
+                and_(
+                    ranked.c.status == available,
+                    or_(
+                        ranked.c.rn_oldest == 1,
+                        ranked.c.rn_newest <= NEWEST_PER_CATEGORY,
+                        ranked.c.rn_listed.in_((1, BSL_POSITION)),
+                        ranked.c.rn_recent <= RECENT_COUNT,
+                    ),
+                ),
+                ranked.c.rn_any == EXP_POSITION,
+            )
+        )
+        .all()
+    )
+
+    recent, oldest, bsl, exp = [], {}, {}, {}
+    newest, first_listed = {}, {}
+    for row in rows:
+        item = _item(row)
+        if row.rn_any == EXP_POSITION:
+            exp[row.category] = item
+        if row.status != available:
+            continue
+        if row.rn_recent <= RECENT_COUNT:
+            recent.append((row.rn_recent, item))
+        if row.rn_oldest == 1:
+            oldest[row.category] = item
+        if row.rn_newest <= NEWEST_PER_CATEGORY:
+            newest.setdefault(row.category, []).append((row.rn_newest, item))
+        if row.rn_listed == 1:
+            first_listed[row.category] = item
+        if row.rn_listed == BSL_POSITION:
+            bsl[row.category] = item
+
+    return {
+        "hero": [i for _, i in sorted(recent, key=lambda r: r[0])]
+        + [oldest[c] for c in sorted(oldest)],
+        "bsl": [bsl[c] for c in sorted(bsl)],
+        "exp": [exp[c] for c in sorted(exp)],
+        "newest": {
+            c: [i for _, i in sorted(items, key=lambda r: r[0])]
+            for c, items in newest.items()
+        },
+        "first_listed": first_listed,
+    }
+
+
+def _shelf_file(version):
+    return os.path.join(CACHE_FOLDER, f"shelves-{version}.json")
+
+
+def _load_from_disk(version):
+    try:
+        with open(_shelf_file(version)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _store_on_disk(version, data):
+    """✅ Share the materialization with the other workers on this host"""
+    try:
+        os.makedirs(CACHE_FOLDER, exist_ok=True)
+        path = _shelf_file(version)
+        tmp_path = f"{path}.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+        for stale in glob.glob(os.path.join(CACHE_FOLDER, "shelves-*.json")):
+            if stale != path:
+                os.remove(stale)
+    except OSError:
+        logging.exception("Could not write the shelves cache file")
+
+
+def _current_shelves():
+    """✅ {"version", "data", "encoded"} for the current catalog version"""
+    global _shelves
+    version = current_version()
+    shelves = _shelves
+    if shelves["version"] == version:
+        return shelves
+
+    with _lock:
+        if _shelves["version"] != version:
+            data = _load_from_disk(version)
+            if data is None:
+                with primary_reads():  # ✅ Kept for the whole version: no replica lag
+                    data = build_shelves()
+                _store_on_disk(version, data)
+            _shelves = {"version": version, "data": data, "encoded": {}}
+        return _shelves
+
+
+def get_shelves():
+    """✅ Current shelves, rebuilt at most once per catalog version"""
+    return _current_shelves()["data"]
+
+
+def _for_viewer(items):
+    """✅ NFT.data() shows "Sold" to the buyer; patch only when it applies"""
+    if not current_user.is_authenticated:
+        return items, False
+    if not any(item["buyer_id"] == current_user.id for item in items):
+        return items, False
+    return [
+        dict(item, status=NFTStatus.SOLD.value)
+        if item["buyer_id"] == current_user.id
+        else item
+        for item in items
+    ], True
+
+
+def _json(payload):
+    return Response(current_app.json.dumps(payload), mimetype="application/json")
+
+
+def shelf_response(name):
+    """✅ Serves a precomputed shelf (hero / bsl / exp) as pre-encoded JSON"""
+    shelves = _current_shelves()  # ✅ One snapshot: data and encoding from the same version
+    items = shelves["data"][name]
+    if not items:
+        return _json({"warning": EMPTY_WARNINGS[name]})
+
+    items, patched = _for_viewer(items)
+    if patched:
+        return _json(items)
+
+    encoded = shelves["encoded"].get(name)
+    if encoded is None:
+        encoded = current_app.json.dumps(items)
+        shelves["encoded"][name] = encoded
+    return Response(encoded, mimetype="application/json")
+
+
+def rotating_shelf_response(name, count=4):
+    """✅ ttp / nl: pick random categories, then read their precomputed rows"""
+    shelves = get_shelves()
+    categories = random.sample(SHELF_CATEGORIES, count)
+
+    if name == "ttp":
+        items = [
+            shelves["first_listed"][c]
+            for c in categories
+            if c in shelves["first_listed"]
+        ]
+    else:
+        items = [i for c in categories for i in shelves["newest"].get(c, [])]
+
+    if not items:
+        return _json({"warning": EMPTY_WARNINGS[name]})
+    return _json(_for_viewer(items)[0])
@@ -0,0 +1,190 @@
+import re
+import json
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config.variables import (
+    SQL_PROFILE,
+    SQL_SLOW_QUERY_MS,
+    SQL_N_PLUS_ONE_THRESHOLD,
+)
+
+logger = logging.getLogger("sql_profile")
+
+_local = threading.local()  # ✅ Active assert_max_queries()/capture_queries() blocks
+_endpoints = {}
+_endpoints_lock = threading.Lock()
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:\?|%s|:\w+|__\[POSTCOMPILE_\w+\])\s*,?)+\)", re.I)
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def fingerprint(statement):
+    """✅ Statement with literals and IN-lists folded, so repeats group together"""
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    return _IN_LIST.sub("IN (...)", text)
+
+
+class RequestProfile:
+    """✅ Queries issued while handling one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.fingerprints = Counter()
+        self.slow = []
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.db_seconds += seconds
+        self.fingerprints[fingerprint(statement)] += 1
+        if seconds * 1000 >= SQL_SLOW_QUERY_MS:
+            self.slow.append((round(seconds * 1000, 1), statement))
+
+    def repeated(self, threshold=None):
+        """✅ Statements run `threshold`+ times: the usual shape of an N+1"""
+        threshold = threshold or SQL_N_PLUS_ONE_THRESHOLD
+        return {sql: n for sql, n in self.fingerprints.most_common() if n >= threshold}
+
+
+# ------------------------------------------------------------ engine events
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # ✅ Kept on the execution context, which dies with the statement: a
+    # statement that raises leaves nothing behind on the pooled connection
+    if context is not None:
+        context._sql_profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_profile_started", None)
+    if started is None:
+        return  # ✅ Statement began before the listener was attached
+    seconds = time.perf_counter() - started
+
+    for captured in getattr(_local, "captures", ()):
+        captured.append(statement)
+
+    if has_request_context():
+        profile = g.get("sql_profile")
+        if profile is not None:
+            profile.record(statement, seconds)
+    elif seconds * 1000 >= SQL_SLOW_QUERY_MS:
+        logger.warning(f"Slow query ({seconds * 1000:.0f}ms): {statement}")
+
+
+# ------------------------------------------------------------ request hooks
+def _start_profile():
+    g.sql_profile = RequestProfile()
+
+
+def _finish_profile(response):
+    profile = g.pop("sql_profile", None)
+    if profile is None:
+        return response
+
+    total_ms = (time.perf_counter() - profile.started) * 1000
+    db_ms = profile.db_seconds * 1000
+    repeated = profile.repeated()
+    endpoint = request.endpoint or "<unmatched>"
+
+    response.headers.add(
+        "Server-Timing", f'db;dur={db_ms:.1f};desc="{profile.count} queries"'
+    )
+    response.headers.add("Server-Timing", f"app;dur={total_ms:.1f}")
+
+    with _endpoints_lock:
+        stats = _endpoints.setdefault(
+            endpoint,
+            {"requests": 0, "queries": 0, "db_ms": 0.0, "max_queries": 0, "n_plus_one": Counter()},
+        )
+        stats["requests"] += 1
+        stats["queries"] += profile.count
+        stats["db_ms"] += db_ms
+        stats["max_queries"] = max(stats["max_queries"], profile.count)
+        stats["n_plus_one"].update(repeated)
+
+    record = {
+        "endpoint": endpoint,
+        "method": request.method,
+        "status": response.status_code,
+        "queries": profile.count,
+        "db_ms": round(db_ms, 1),
+        "total_ms": round(total_ms, 1),
+    }
+    if repeated:
+        record["n_plus_one"] = repeated
+        logger.warning(json.dumps(record))
+    else:
+        logger.info(json.dumps(record))
+    for ms, statement in profile.slow:
+        logger.warning(f"Slow query on {endpoint} ({ms}ms): {statement}")
+    return response
+
+
+def endpoint_stats():
+    """✅ {endpoint: {requests, queries, avg_queries, db_ms, max_queries, n_plus_one}}"""
+    with _endpoints_lock:
+        return {
+            endpoint: {
+                "requests": s["requests"],
+                "queries": s["queries"],
+                "avg_queries": round(s["queries"] / s["requests"], 1),
+                "db_ms": round(s["db_ms"], 1),
+                "max_queries": s["max_queries"],
+                "n_plus_one": dict(s["n_plus_one"].most_common(5)),
+            }
+            for endpoint, s in sorted(_endpoints.items())
+        }
+
+
+# --------------------------------------------------------------- test API
+@contextmanager
+def capture_queries():
+    """✅ Collects every statement run on this thread inside the block"""
+    captured = []
+    captures = getattr(_local, "captures", None)
+    if captures is None:
+        captures = _local.captures = []
+    captures.append(captured)
+    try:
+        yield captured
+    finally:
+        captures.remove(captured)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """
+    ✅ Fails when the block issues more than `limit` queries, e.g.
+
+        with assert_max_queries(5):
+            client.get("/user/dashboard")
+    """
+    with capture_queries() as captured:
+        yield captured
+    if len(captured) > limit:
+        listing = "\n".join(f"  {i}. {fingerprint(sql)}" for i, sql in enumerate(captured, 1))
+        raise AssertionError(f"{len(captured)} queries issued, expected at most {limit}:\n{listing}")
+
+
+# ---------------------------------------------------------------- lifecycle
+def init_sql_profiler(app):
+    """✅ Engine timing always (slow-query log, test API); per-request profiles with SQL_PROFILE"""
+    if not event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    if SQL_PROFILE or app.debug or app.testing:
+        app.before_request(_start_profile)
+        app.after_request(_finish_profile)
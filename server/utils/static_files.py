@@ -0,0 +1,179 @@
+import os
+import gzip
+import hashlib
+import mimetypes
+import threading
+
+from flask import abort, current_app, request, send_file
+from werkzeug.security import safe_join
+
+from ..config.variables import (
+    STATIC_ACCEL_PREFIX,
+    STATIC_MAX_AGE,
+    STATIC_OFFLOAD,
+)
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# ✅ Upload names are content hashes or uuids: a path never changes content
+IMMUTABLE_PREFIXES = ("uploads/",)
+
+COMPRESSIBLE = {".css", ".js", ".svg", ".json", ".map", ".txt", ".xml", ".html"}
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]  # best first
+
+_fingerprints = {}
+_lock = threading.Lock()
+
+
+def fingerprint(filename):
+    """
+    ✅ Short content hash of a static file (None if it doesn't exist).
+    Cached per file; in debug mode a changed mtime recomputes it.
+    """
+    path = safe_join(current_app.static_folder, filename)
+    if path is None:
+        return None
+    cached = _fingerprints.get(filename)
+    if cached is not None and not current_app.debug:
+        return cached[1]
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    with _lock:
+        _fingerprints[filename] = (mtime, digest.hexdigest()[:12])
+    return _fingerprints[filename][1]
+
+
+def add_fingerprint(endpoint, values):
+    """✅ url_for("static", filename=...) -> ...?v=<content hash>"""
+    if endpoint != "static" or "v" in values:
+        return
+    filename = values.get("filename")
+    if not filename or filename.startswith(IMMUTABLE_PREFIXES):
+        return
+    version = fingerprint(filename)
+    if version:
+        values["v"] = version
+
+
+def _is_immutable(filename):
+    if filename.startswith(IMMUTABLE_PREFIXES):
+        return True
+    version = request.args.get("v")
+    return bool(version) and version == fingerprint(filename)
+
+
+def _precompressed(path):
+    """✅ The .br/.gz sibling built by `flask compress-static`, if the client accepts it"""
+    accepted = request.accept_encodings
+    for encoding, suffix in ENCODINGS:
+        if not accepted[encoding]:
+            continue
+        candidate = path + suffix
+        try:
+            if os.stat(candidate).st_mtime >= os.stat(path).st_mtime:
+                return encoding, candidate
+        except OSError:
+            continue
+    return None, path
+
+
+def serve_static(filename):
+    """
+    ✅ Replacement for Flask's static view.
+
+    Fingerprinted and upload URLs get a year-long `immutable` cache,
+    everything else STATIC_MAX_AGE. Text assets are served from their
+    precompressed .br/.gz copy when one exists. With STATIC_OFFLOAD a front
+    proxy sends the bytes (X-Accel-Redirect for nginx, X-Sendfile for
+    Apache/lighttpd); otherwise send_file answers conditional and Range
+    requests itself.
+    """
+    path = safe_join(current_app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    max_age = IMMUTABLE_MAX_AGE if _is_immutable(filename) else STATIC_MAX_AGE
+    compressible = os.path.splitext(filename)[1].lower() in COMPRESSIBLE
+
+    if STATIC_OFFLOAD == "x-accel":
+        # ✅ nginx serves the file (gzip_static/brotli_static pick the variant)
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers["X-Accel-Redirect"] = STATIC_ACCEL_PREFIX + filename
+    else:
+        encoding, served = _precompressed(path) if compressible else (None, path)
+        response = send_file(served, mimetype=mimetype, conditional=True, max_age=max_age)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+
+    if compressible:
+        response.vary.add("Accept-Encoding")
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if max_age == IMMUTABLE_MAX_AGE:
+        response.cache_control.immutable = True
+    return response
+
+
+def compress_static(root, min_size=1024):
+    """
+    ✅ Writes .gz (and .br when the optional `brotli` package is installed)
+    next to each text asset. Up-to-date copies are skipped. Returns
+    (files compressed, bytes saved).
+    """
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = saved = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE:
+                continue
+            path = os.path.join(dirpath, name)
+            size = os.path.getsize(path)
+            if size < min_size:
+                continue
+            mtime = os.path.getmtime(path)
+
+            data = None
+            for suffix, compress in (
+                (".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0)),
+                (".br", brotli and (lambda d: brotli.compress(d, quality=11))),
+            ):
+                target = path + suffix
+                if not compress:
+                    continue
+                if os.path.exists(target) and os.path.getmtime(target) >= mtime:
+                    continue
+                if data is None:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                packed = compress(data)
+                if len(packed) >= size:
+                    continue  # ✅ No gain (already compressed content)
+                tmp_path = f"{target}.{os.getpid()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(packed)
+                os.replace(tmp_path, target)
+                written += 1
+                saved += size - len(packed)
+    return written, saved
+
+
+def init_static(app):
+    """✅ Fingerprinted static URLs + the caching/offloading static view"""
+    app.url_defaults(add_fingerprint)
+    app.view_functions["static"] = serve_static
+    if STATIC_OFFLOAD == "x-sendfile":
+        app.config["USE_X_SENDFILE"] = True  # ✅ Honoured by send_file()
@@ -0,0 +1,276 @@
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.base import NO_VALUE
+
+from ..config.database import db
+from ..config.variables import STATS_RECONCILE_INTERVAL
+from ..models import PendingNFTs
+from ..models import Offers
+from ..models import Withdrawal
+from ..models import Transaction
+from ..models import GasFeeDeposit
+from ..models import WalletDeposit
+from ..models import Contact
+from ..models import User
+from ..models import StatCounter
+
+ALL = "all"  # bucket for tables counted without a status breakdown
+META = "_meta"
+
+# ✅ Counter name -> (model, status attribute or None)
+TRACKED = {
+    "users": (User, None),
+    "contacts": (Contact, None),
+    "wallet_deposits": (WalletDeposit, "status"),
+    "gasfee_deposits": (GasFeeDeposit, "status"),
+    "withdrawals": (Withdrawal, "status"),
+    "transactions": (Transaction, "status"),
+    "pending_nfts": (PendingNFTs, "status"),
+    "offers": (Offers, "action"),
+}
+_BY_MODEL = {model: (name, attr) for name, (model, attr) in TRACKED.items()}
+
+# ✅ Table -> counters whose rows the database deletes along with it (ON DELETE
+# CASCADE); those rows never reach the session, so the counters are recounted
+_CASCADES = {}
+for _name, (_model, _) in TRACKED.items():
+    for _fk in _model.__table__.foreign_keys:
+        if (_fk.ondelete or "").upper() == "CASCADE":
+            _CASCADES.setdefault(_fk.target_fullname.split(".")[0], set()).add(_name)
+
+# ✅ Pass as execution_options on a bulk update/delete already reported via note_bulk()
+ACCOUNTED = {"stats_accounted": True}
+
+_thread = None
+_stopping = threading.Event()
+
+
+def _bucket(value):
+    if value is None:
+        return "none"
+    return str(getattr(value, "value", value))[:32]  # ✅ Enums count by their value
+
+
+# ------------------------------------------------------------ session events
+def _deltas(session):
+    return session.info.setdefault("stat_deltas", Counter())
+
+
+def _needs_reconcile(session, name):
+    session.info.setdefault("stat_reconcile", set()).add(name)
+
+
+def _before_flush(session, flush_context, instances):
+    # ✅ Deletes are counted before the row (and its status) is gone
+    for obj in session.deleted:
+        for name in _CASCADES.get(inspect(obj).mapper.local_table.name, ()):
+            _needs_reconcile(session, name)
+        spec = _BY_MODEL.get(type(obj))
+        if spec is None:
+            continue
+        name, attr = spec
+        _deltas(session)[(name, ALL if attr is None else _bucket(getattr(obj, attr)))] -= 1
+
+
+def _after_flush(session, flush_context):
+    # ✅ Inserts are counted after the flush so column defaults are applied
+    for obj in session.new:
+        spec = _BY_MODEL.get(type(obj))
+        if spec is None:
+            continue
+        name, attr = spec
+        _deltas(session)[(name, ALL if attr is None else _bucket(getattr(obj, attr)))] += 1
+
+    for obj in session.dirty:
+        spec = _BY_MODEL.get(type(obj))
+        if spec is None or spec[1] is None:
+            continue
+        name, attr = spec
+        history = inspect(obj).attrs[attr].history
+        if not history.added:
+            continue
+        if not history.deleted or history.deleted[0] is NO_VALUE:
+            _needs_reconcile(session, name)  # ✅ Old status unknown (expired row)
+            continue
+        old, new = _bucket(history.deleted[0]), _bucket(history.added[0])
+        if old != new:
+            _deltas(session)[(name, old)] -= 1
+            _deltas(session)[(name, new)] += 1
+
+
+def _do_orm_execute(orm_execute_state):
+    # ✅ Bulk query.update()/.delete() bypass the flush: recount those tables
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and orm_execute_state.is_delete:
+        for name in _CASCADES.get(mapper.local_table.name, ()):
+            _needs_reconcile(orm_execute_state.session, name)
+    spec = _BY_MODEL.get(mapper.class_) if mapper is not None else None
+    if spec and not orm_execute_state.execution_options.get("stats_accounted"):
+        _needs_reconcile(orm_execute_state.session, spec[0])
+
+
+def _after_commit(session):
+    deltas = session.info.pop("stat_deltas", None)
+    names = session.info.pop("stat_reconcile", None)
+    deltas = {key: n for key, n in (deltas or {}).items() if n}
+    if not deltas and not names:
+        return
+    try:
+        # ✅ Applied after commit on its own connection: the counter rows are
+        # hot, so they must never be locked for the length of a request
+        with db.engine.begin() as conn:
+            if deltas:
+                _upsert(conn, deltas)
+        if names:
+            reconcile(names)
+    except Exception:
+        logging.exception("Could not update stat counters (run `flask reconcile-stats`)")
+
+
+def _after_rollback(session):
+    session.info.pop("stat_deltas", None)
+    session.info.pop("stat_reconcile", None)
+
+
+def note_bulk(model, rows, values=None):
+    """
+    ✅ Reports a set-based UPDATE of `rows` to `values` (or a DELETE when
+    values is None) that the flush can't see; `rows` still hold their old
+    status. Run the statement with `.execution_options(**ACCOUNTED)`.
+    """
+    name, attr = _BY_MODEL[model]
+    if values is not None and (attr is None or attr not in values):
+        return  # ✅ Counts unchanged
+    deltas = _deltas(db.session)
+    for row in rows:
+        old = ALL if attr is None else _bucket(getattr(row, attr))
+        deltas[(name, old)] -= 1
+        if values is not None:
+            deltas[(name, _bucket(values[attr]))] += 1
+
+
+# ------------------------------------------------------------------ storage
+def _upsert(conn, values, absolute=False):
+    """✅ One statement for all counters; rows sorted so writers lock in the same order"""
+    table = StatCounter.__table__
+    now = datetime.now()
+    rows = [
+        {"name": name, "bucket": bucket, "value": value, "updated_at": now}
+        for (name, bucket), value in sorted(values.items())
+    ]
+    dialect = conn.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update(
+            value=stmt.inserted.value if absolute else table.c.value + stmt.inserted.value,
+            updated_at=stmt.inserted.updated_at,
+        )
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name", "bucket"],
+            set_={
+                "value": stmt.excluded.value
+                if absolute
+                else table.c.value + stmt.excluded.value,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    conn.execute(stmt, rows)
+
+
+def _count(conn, name):
+    model, attr = TRACKED[name]
+    if attr is None:
+        total = conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+        return {(name, ALL): total}
+    column = getattr(model, attr)
+    # ✅ GROUP BY on the status column is answered from its index
+    rows = conn.execute(select(column, func.count()).group_by(column))
+    counts = Counter()
+    for value, total in rows:
+        counts[(name, _bucket(value))] += total
+    return counts
+
+
+def reconcile(names=None):
+    """✅ Recounts tables with one aggregate query each and overwrites their counters"""
+    names = sorted(names or TRACKED)
+    table = StatCounter.__table__
+    with db.engine.begin() as conn:
+        values = {}
+        for name in names:
+            values.update(_count(conn, name))
+        conn.execute(table.delete().where(table.c.name.in_(names)))
+        values[(META, "reconciled_at")] = int(time.time())
+        if values:
+            _upsert(conn, values, absolute=True)
+    return values
+
+
+def get_counts():
+    """
+    ✅ {"wallet_deposits": {"total": 12, "by_status": {"Pending": 3, ...}}, ...}
+    from the counters table — one small query instead of a COUNT(*) per table.
+    """
+    rows = db.session.query(StatCounter).all()
+    if not any(row.name == META for row in rows):
+        reconcile()  # ✅ First read on a fresh database
+        rows = db.session.query(StatCounter).all()
+
+    counts = {name: {"total": 0, "by_status": {}} for name in TRACKED}
+    for row in rows:
+        if row.name not in counts:
+            continue
+        counts[row.name]["total"] += row.value
+        if row.bucket != ALL:
+            counts[row.name]["by_status"][row.bucket] = row.value
+    return counts
+
+
+# ---------------------------------------------------------------- lifecycle
+def register_stats_listeners():
+    """✅ Keep the counters in step with every committed insert/update/delete"""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "do_orm_execute", _do_orm_execute)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+
+
+def init_stats(app):
+    """✅ Listeners plus an optional periodic reconcile (STATS_RECONCILE_INTERVAL)"""
+    global _thread
+    register_stats_listeners()
+    if STATS_RECONCILE_INTERVAL <= 0 or app.testing:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+
+    def run():
+        with app.app_context():
+            while not _stopping.wait(STATS_RECONCILE_INTERVAL):
+                try:
+                    reconcile()
+                except Exception:
+                    logging.exception("Periodic stats reconcile failed")
+
+    _stopping.clear()
+    _thread = threading.Thread(target=run, name="stats-reconcile", daemon=True)
+    _thread.start()
@@ -0,0 +1,124 @@
+import os
+import hashlib
+import tempfile
+
+from flask import Request
+from PIL import Image, UnidentifiedImageError
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from ..config.variables import UPLOAD_MAX_BYTES
+from .images import STATIC_ROOT
+
+# ✅ Same directory as the blobs, so claiming a file is a rename, not a copy
+INGEST_FOLDER = os.path.join(STATIC_ROOT, "uploads", "blobs")
+
+SNIFF_BYTES = 16
+CHUNK_SIZE = 64 * 1024
+
+IMAGE_TYPES = {"jpg", "png", "gif", "webp"}
+RECEIPT_TYPES = {"jpg", "png", "webp"}
+NFT_TYPES = IMAGE_TYPES | {"glb", "mp4", "mp3"}
+
+PILLOW_FORMATS = {"jpg": "JPEG", "png": "PNG", "gif": "GIF", "webp": "WEBP"}
+
+
+class UploadRejected(ValueError):
+    """Raised when an uploaded file's content isn't one of the accepted types."""
+
+
+def sniff(head):
+    """✅ File type from its first bytes (the filename and Content-Type are client-controlled)"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[:4] == b"glTF":
+        return "glb"
+    if head[4:8] == b"ftyp":
+        return "mp4"
+    if head[:3] == b"ID3" or head[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "mp3"
+    return None
+
+
+class IngestFile:
+    """
+    ✅ Temp file an upload is streamed into, chunk by chunk.
+
+    Hashing, the size limit and magic-byte sniffing happen as the bytes are
+    written, so the upload is read exactly once and never held in memory.
+    Whatever isn't claimed by the blob store is deleted on close().
+    """
+
+    def __init__(self, folder=INGEST_FOLDER, max_size=None):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=folder, suffix=".part")
+        self._file = os.fdopen(fd, "w+b")
+        self.max_size = UPLOAD_MAX_BYTES if max_size is None else max_size
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+        self.claimed = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise RequestEntityTooLarge(
+                f"Uploads are limited to {round(self.max_size / (1024 * 1024), 1):g} MB."
+            )
+        if len(self.head) < SNIFF_BYTES:
+            self.head += bytes(data[: SNIFF_BYTES - len(self.head)])
+        self.sha256.update(data)
+        return self._file.write(data)
+
+    def copy_from(self, stream):
+        """✅ Same single pass for a stream that didn't come through UploadRequest"""
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+            self.write(chunk)
+        return self
+
+    def kind(self):
+        return sniff(self.head)
+
+    def finish(self):
+        """✅ Flushes to disk and hands the file over (the caller renames it)"""
+        self._file.flush()
+        self._file.close()
+        self.claimed = True
+        return self.path
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        if not self.claimed and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)  # ✅ read/seek/tell for form libraries
+
+
+def check_image(path, kind):
+    """
+    ✅ Header-only Pillow check: Image.open() parses dimensions and format
+    without decoding pixels, and refuses decompression bombs.
+    """
+    try:
+        with Image.open(path) as image:
+            if image.format != PILLOW_FORMATS[kind]:
+                raise UploadRejected("Uploaded file is not a valid image.")
+            if not image.width or not image.height:
+                raise UploadRejected("Uploaded file is not a valid image.")
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        raise UploadRejected("Uploaded file is not a valid image.")
+
+
+class UploadRequest(Request):
+    """✅ Multipart file parts are streamed straight into the blob store's folder"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return IngestFile()
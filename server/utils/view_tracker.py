@@ -0,0 +1,211 @@
+import time
+import atexit
+import logging
+import threading
+from collections import Counter, OrderedDict
+
+from sqlalchemy import bindparam
+
+from ..config.database import db
+from ..config.variables import VIEW_FLUSH_INTERVAL, VIEW_FLUSH_MAX_PENDING
+from ..models import NFT
+from ..models import NFTViews
+
+SEEN_CAPACITY = 200_000  # (nft_id, user_id) pairs remembered per process
+QUERY_CHUNK = 500  # rows per insert statement
+
+
+def _insert_ignore(table):
+    """✅ INSERT that skips rows hitting the (nft_id, user_id) unique key"""
+    dialect = db.engine.dialect.name
+    if dialect == "mysql":
+        return table.insert().prefix_with("IGNORE")
+    if dialect == "sqlite":
+        return table.insert().prefix_with("OR IGNORE")
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        return insert(table).on_conflict_do_nothing()
+    return table.insert()
+
+
+def _chunks(items, size=QUERY_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+class ViewTracker:
+    """
+    ✅ Write-coalescing NFT view counter.
+
+    `record()` only touches memory: pairs already seen are dropped, new ones
+    are buffered. `flush()` writes the buffer in bulk — INSERT IGNOREs into
+    nft_views, then one executemany `views = views + n` on nfts where n is
+    what those inserts actually added.
+    """
+
+    def __init__(self, flush_interval=VIEW_FLUSH_INTERVAL,
+                 max_pending=VIEW_FLUSH_MAX_PENDING):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._seen = OrderedDict()
+        self._pending = {}  # (nft_id, user_id) -> monotonic time recorded
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+        self._stats = {
+            "recorded": 0,
+            "deduplicated": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "views_written": 0,
+            "last_flush_ms": None,
+            "last_flush_lag_seconds": None,
+            "last_flush_at": None,
+        }
+
+    # ----------------------------------------------------------------- record
+    def _remember(self, key):
+        self._seen[key] = None
+        self._seen.move_to_end(key)
+        while len(self._seen) > SEEN_CAPACITY:
+            self._seen.popitem(last=False)
+
+    def record(self, nft_id, user_id):
+        """✅ Count a buy-page view; never touches the database"""
+        key = (int(nft_id), int(user_id))
+        with self._lock:
+            if key in self._seen or key in self._pending:
+                self._stats["deduplicated"] += 1
+                return False
+            self._pending[key] = time.monotonic()
+            self._stats["recorded"] += 1
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wakeup.set()  # ✅ Flush early instead of growing unbounded
+        return True
+
+    # ------------------------------------------------------------------ flush
+    def _insert_views(self, pairs):
+        """
+        ✅ {nft_id: rows inserted}. One INSERT IGNORE per NFT (and chunk), so
+        the rowcount says how many of its views are really new, even when
+        another worker wrote the same pair first.
+        """
+        by_nft = {}
+        for nft_id, user_id in pairs:
+            by_nft.setdefault(nft_id, []).append(user_id)
+        views = NFTViews.__table__
+        inserted = Counter()
+        for nft_id, user_ids in by_nft.items():
+            for chunk in _chunks(user_ids):
+                result = db.session.execute(
+                    _insert_ignore(views),
+                    [{"nft_id": nft_id, "user_id": u} for u in chunk],
+                )
+                inserted[nft_id] += max(result.rowcount, 0)
+        return +inserted
+
+    def flush(self):
+        """✅ Persist buffered views; returns the number of new views written"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            started = time.perf_counter()
+            oldest = min(pending.values())
+            try:
+                increments = self._insert_views(list(pending))
+                if increments:
+                    nfts = NFT.__table__
+                    db.session.execute(
+                        nfts.update()
+                        .where(nfts.c.id == bindparam("b_id"))
+                        .values(views=nfts.c.views + bindparam("b_n")),
+                        [{"b_id": i, "b_n": n} for i, n in increments.items()],
+                    )
+                db.session.commit()
+                written = sum(increments.values())
+            except Exception:
+                db.session.rollback()
+                logging.exception("Could not flush NFT views; re-queued")
+                with self._lock:
+                    for key, recorded_at in pending.items():
+                        self._pending.setdefault(key, recorded_at)
+                    self._stats["flush_errors"] += 1
+                return 0
+
+            with self._lock:
+                for key in pending:
+                    self._remember(key)
+                self._stats["flushes"] += 1
+                self._stats["views_written"] += written
+                self._stats["last_flush_ms"] = round(
+                    (time.perf_counter() - started) * 1000, 2
+                )
+                self._stats["last_flush_lag_seconds"] = round(
+                    time.monotonic() - oldest, 3
+                )
+                self._stats["last_flush_at"] = time.time()
+            return written
+
+    # ------------------------------------------------------------- background
+    def start(self, app):
+        """✅ Flush every `flush_interval` seconds (or when the buffer fills)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        def run():
+            with app.app_context():
+                while not self._stopping.is_set():
+                    self._wakeup.wait(self.flush_interval)
+                    self._wakeup.clear()
+                    self.flush()
+                    db.session.remove()
+                self.flush()  # ✅ Don't drop buffered views on shutdown
+                db.session.remove()
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=run, name="view-tracker", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    # ---------------------------------------------------------------- metrics
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+            pending = len(self._pending)
+            oldest = min(self._pending.values()) if self._pending else None
+        stats["flush_interval_seconds"] = self.flush_interval
+        stats["pending"] = pending
+        # ✅ How far the nfts.views column currently trails reality
+        stats["lag_seconds"] = (
+            round(time.monotonic() - oldest, 3) if oldest is not None else 0
+        )
+        stats["seen_cached"] = len(self._seen)
+        return stats
+
+
+view_tracker = ViewTracker()
+
+
+def record_view(nft_id, user_id):
+    return view_tracker.record(nft_id, user_id)
+
+
+def init_view_tracker(app):
+    if app.testing:
+        return  # ✅ Tests call view_tracker.flush() explicitly
+    view_tracker.start(app)
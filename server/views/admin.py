@@ -1,20 +1,40 @@
-import os
-import uuid
 import logging
 from decimal import Decimal
 
-from flask import Blueprint, request, render_template, redirect, flash, url_for
+from flask import (
+    Blueprint,
+    request,
+    render_template,
+    redirect,
+    flash,
+    url_for,
+    jsonify,
+)
 from flask_login import login_required, current_user, login_user
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
 from email_validator import validate_email, EmailNotValidError
-from sqlalchemy import or_
 
-from server import UPLOAD_FOLDER, csrf
+from server import csrf
 from ..config.database import db
+from ..utils.loaders import get_user, get_user_by_name
 from ..utils.minting_fee_helper import calculate_minting_fee
+from ..utils.price_oracle import eth_price_oracle
+from ..utils.view_tracker import view_tracker
+from ..utils import ledger
+from ..utils import admin_tables
+from ..utils import stats
+from ..utils import blob_store
+from ..utils import order_book
+from ..utils import sql_profiler
+from ..utils import db_router
+from ..utils.ledger import InsufficientFunds
+from ..utils.bulk_admin import BulkRequestError, run_bulk_action
 from ..utils.decorators import admin_required
+from ..utils.db_router import read_replica
+from ..utils.images import build_variants
+from ..utils.uploads import NFT_TYPES, UploadRejected
 from ..utils.helpers import validate_password
+from ..utils.search import index_nft, remove_nft, search_nfts, search_users
 from ..models import NFTStatus
 from ..models import PendingNFTs
 from ..models import NFT
@@ -24,7 +44,6 @@ from ..models import Transaction
 from ..models import GasFeeDeposit
 from ..models import Ether
 from ..models import WalletDeposit
-from ..models import Contact
 from ..models import User
 from .forms import (
     AddToOrSubtractFromBalancesForm,
@@ -36,7 +55,6 @@ from .forms import (
     SearchForm,
     AdminEditUserProfileForm,
 )
-from PIL import Image
 
 admin = Blueprint("admin", __name__)
 
@@ -47,22 +65,6 @@ def is_real_admin():
     )
 
 
-def get_image_type(file_storage):
-    """
-    Returns the image type (e.g., 'jpeg', 'png', etc.) if valid, else None.
-    """
-    try:
-        file_storage.seek(0)
-        img = Image.open(file_storage)
-        img.verify()  # Will raise if not an image
-        image_type = img.format.lower()
-    except Exception:
-        image_type = None
-    finally:
-        file_storage.seek(0)
-    return image_type
-
-
 @admin.route("/dashboard", methods=["GET"])
 @login_required
 def admin_dashboard():
@@ -71,18 +73,17 @@ def admin_dashboard():
         return redirect(url_for("mintverse.home_page"))
     search_form = SearchForm()
     try:
-        user_count = User.query.count()
-        contact_msg = Contact.query.count()
-        wallet_deposit_count = WalletDeposit.query.count()
-        transaction_count = Transaction.query.count()
+        # ✅ Pre-aggregated counters: one small read instead of a COUNT(*) per table
+        counts = stats.get_counts()
         return render_template(
             "admin/admin-dashboard.html",
             title="Admin Dashboard",
             current_user=current_user,
-            user_count=user_count,
-            contact_msg=contact_msg,
-            wallet_deposit_count=wallet_deposit_count,
-            transaction_count=transaction_count,
+            counts=counts,
+            user_count=counts["users"]["total"],
+            contact_msg=counts["contacts"]["total"],
+            wallet_deposit_count=counts["wallet_deposits"]["total"],
+            transaction_count=counts["transactions"]["total"],
             search_form=search_form,
         )
     except Exception as e:
@@ -99,7 +100,7 @@ def admin_profile():
         return redirect(url_for("mintverse.home_page"))
     search_form = SearchForm()
     try:
-        user = User.query.filter_by(id=current_user.id).first()
+        user = get_user(current_user.id)
         return render_template(
             "admin/admin-profile.html",
             current_user=current_user,
@@ -209,14 +210,17 @@ def create_admin_page():
 
 # HANDLE USERS LISTING
 @admin.get("/users_listing")
+@read_replica
 @login_required
 @admin_required
 def users_listing():
     try:
-        users = User.query.all()
-        return render_template(
+        page = admin_tables.USERS.page()
+        return admin_tables.stream_page(
             "admin/users-listing.html",
-            users=users,
+            page=page,
+            counts=stats.get_counts()["users"],
+            users=page,
             current_user=current_user,
             title="Users Listing | MintVerse",
         )
@@ -228,26 +232,19 @@ def users_listing():
 
 # HANDLE WALLET DEPOSITS
 @admin.get("/wallet_deposits")
+@read_replica
 @login_required
 @admin_required
 def wallet_deposits():
     try:
-        # ✅ Fetch all users
-        users = User.query.all()
+        # ✅ One page of deposits (newest first), user names joined in
+        page = admin_tables.WALLET_DEPOSITS.page()
 
-        # ✅ Fetch all wallet deposits sorted by status (Pending first)
-        wallet_deposits = WalletDeposit.query.order_by(
-            WalletDeposit.status.asc(), WalletDeposit.timestamp.desc()
-        ).all()
-
-        # ✅ Count the total number of wallet deposits
-        wallet_deposit_count = WalletDeposit.query.count()
-
-        return render_template(
+        return admin_tables.stream_page(
             "admin/wallet-deposits.html",
-            users=users,
-            wallet_deposits=wallet_deposits,  # ✅ Pass deposits to template
-            wallet_deposit_count=wallet_deposit_count,  # ✅ Pass count to frontend
+            page=page,
+            counts=stats.get_counts()["wallet_deposits"],
+            wallet_deposits=page,  # ✅ Pass deposits to template
             current_user=current_user,
             title="Wallet Deposits | MintVerse",
         )
@@ -268,17 +265,15 @@ def approve_wallet_deposit(deposit_id):
         flash("This deposit has already been approved.", "warning")
         return redirect(url_for("admin.wallet_deposits"))
 
-    # ✅ Fetch user's wallet balance
-    ether = Ether.query.filter_by(user_id=deposit.user_id).first()
-    if ether:
-        ether.main_wallet_balance += (
-            deposit.wltdps_amount
-        )  # ✅ Update balance upon approval
-    else:
-        ether = Ether(
-            user_id=deposit.user_id, main_wallet_balance=deposit.wltdps_amount
-        )
-        db.session.add(ether)
+    # ✅ Credit the main wallet through the ledger (atomic, posted once per deposit)
+    ledger.ensure_wallet(deposit.user_id)
+    ledger.credit(
+        deposit.user_id,
+        ledger.MAIN,
+        deposit.wltdps_amount,
+        "deposit",
+        reference=f"wallet_deposit:{deposit.id}",
+    )
 
     deposit.status = "Approved"
     db.session.commit()
@@ -310,22 +305,19 @@ def reject_wallet_deposit(deposit_id):
 
 # HANDLE GASFEE DEPOSITS
 @admin.get("/gasfee_deposits")
+@read_replica
 @login_required
 @admin_required
 def gasfee_deposits():
     try:
-        # ✅ Fetch all users
-        users = User.query.all()
-
-        # ✅ Fetch all gasfee deposits sorted by status (e.g., Pending first)
-        gasfee_deposits = GasFeeDeposit.query.order_by(
-            GasFeeDeposit.status.asc(), GasFeeDeposit.timestamp.desc()
-        ).all()
+        # ✅ One page of deposits (newest first), user names joined in
+        page = admin_tables.GASFEE_DEPOSITS.page()
 
-        return render_template(
+        return admin_tables.stream_page(
             "admin/gasfee-deposits.html",
-            users=users,
-            gasfee_deposits=gasfee_deposits,  # ✅ Pass deposits to template
+            page=page,
+            counts=stats.get_counts()["gasfee_deposits"],
+            gasfee_deposits=page,  # ✅ Pass deposits to template
             current_user=current_user,
             title="Gasfee Deposits | MintVerse",
         )
@@ -346,15 +338,15 @@ def approve_gasfee_deposit(deposit_id):
         flash("This deposit has already been approved.", "warning")
         return redirect(url_for("admin.gasfee_deposits"))
 
-    # ✅ Fetch user's gasfee balance
-    ether = Ether.query.filter_by(user_id=deposit.user_id).first()
-    if ether:
-        ether.gas_fee_balance += (
-            deposit.gsfdps_amount
-        )  # ✅ Update balance upon approval
-    else:
-        ether = Ether(user_id=deposit.user_id, gas_fee_balance=deposit.gsfdps_amount)
-        db.session.add(ether)
+    # ✅ Credit the gas fee wallet through the ledger
+    ledger.ensure_wallet(deposit.user_id)
+    ledger.credit(
+        deposit.user_id,
+        ledger.GAS,
+        deposit.gsfdps_amount,
+        "deposit",
+        reference=f"gasfee_deposit:{deposit.id}",
+    )
 
     deposit.status = "Approved"
     db.session.commit()
@@ -386,22 +378,19 @@ def reject_gasfee_deposit(deposit_id):
 
 # HANDLE TRANSACTIONS
 @admin.get("/transactions")
+@read_replica
 @login_required
 @admin_required
 def transactions():
     try:
-        # ✅ Fetch all transactions sorted by status (Pending first, then newest completed)
-        transactions = Transaction.query.order_by(
-            Transaction.status.asc(), Transaction.timestamp.desc()
-        ).all()
-
-        # ✅ Count the total number of transactions
-        transaction_count = Transaction.query.count()
+        # ✅ One page of transactions (filter by status for the pending queue)
+        page = admin_tables.TRANSACTIONS.page()
 
-        return render_template(
+        return admin_tables.stream_page(
             "admin/transactions.html",
-            transactions=transactions,  # ✅ Pass transactions to template
-            transaction_count=transaction_count,  # ✅ Pass count to frontend
+            page=page,
+            counts=stats.get_counts()["transactions"],
+            transactions=page,  # ✅ Pass transactions to template
             current_user=current_user,
             title="Transactions | MintVerse",
         )
@@ -422,22 +411,28 @@ def approve_transaction(transaction_id):
         flash("This transaction has already been finalized.", "warning")
         return redirect(url_for("admin.transactions"))
 
-    ether = Ether.query.filter_by(user_id=transaction.buyer_id).first()
+    nft = NFT.query.get(transaction.nft_id)
+    if not nft:
+        flash("NFT not found for this transaction.", "warning")
+        return redirect(url_for("admin.transactions"))
 
-    if not ether or ether.main_wallet_balance < transaction.listed_price:
+    # ✅ Conditional debit: fails instead of overdrawing under concurrent approvals
+    try:
+        ledger.debit(
+            transaction.buyer_id,
+            ledger.MAIN,
+            transaction.listed_price,
+            "purchase",
+            reference=f"transaction:{transaction.id}",
+        )
+    except InsufficientFunds as e:
+        db.session.rollback()
         flash(
-            f"Insufficient funds! Buyer needs {transaction.listed_price} ETH, but has {ether.main_wallet_balance if ether else 0.0000} ETH.",
+            f"Insufficient funds! Buyer needs {transaction.listed_price} ETH, but has {e.available} ETH.",
             "warning",
         )
         return redirect(url_for("admin.transactions"))
 
-    ether.main_wallet_balance -= transaction.listed_price
-
-    nft = NFT.query.get(transaction.nft_id)
-    if not nft:
-        flash("NFT not found for this transaction.", "warning")
-        return redirect(url_for("admin.transactions"))
-
     # ✅ Update NFT to reflect the sale
     nft.status = NFTStatus.SOLD
     nft.buyer_id = transaction.buyer_id  # ✅ Track buyer ID directly
@@ -463,12 +458,12 @@ def approve_transaction(transaction_id):
 def reject_transaction(transaction_id):
     transaction = Transaction.query.get_or_404(transaction_id)
 
-    if transaction.status == "Rejected":
+    if transaction.status == NFTStatus.REJECTED:
         flash("This transaction has already been rejected.", "warning")
         return redirect(url_for("admin.transactions"))
 
     # ✅ Mark transaction as "Rejected"
-    transaction.status = "Rejected"
+    transaction.status = NFTStatus.REJECTED
     db.session.commit()
 
     flash(
@@ -480,22 +475,19 @@ def reject_transaction(transaction_id):
 
 # HANDLE WITHDRAWALS
 @admin.get("/withdrawals")
+@read_replica
 @login_required
 @admin_required
 def withdrawals():
     try:
-        # ✅ Fetch all withdrawals sorted by status (Pending first, then newest completed)
-        withdrawals = Withdrawal.query.order_by(
-            Withdrawal.status.asc(), Withdrawal.timestamp.desc()
-        ).all()
+        # ✅ One page of withdrawals (filter by status for the pending queue)
+        page = admin_tables.WITHDRAWALS.page()
 
-        # ✅ Count the total number of withdrawals
-        withdrawal_count = Withdrawal.query.count()
-
-        return render_template(
+        return admin_tables.stream_page(
             "admin/withdrawals.html",
-            withdrawals=withdrawals,  # ✅ Pass withdrawals to template
-            withdrawal_count=withdrawal_count,  # ✅ Pass count to frontend
+            page=page,
+            counts=stats.get_counts()["withdrawals"],
+            withdrawals=page,  # ✅ Pass withdrawals to template
             current_user=current_user,
             title="Withdrawal | MintVerse",
         )
@@ -518,20 +510,15 @@ def approve_withdrawal(transaction_id):
         flash("This withdrawal has already been approved.", "warning")
         return redirect(url_for("admin.withdrawals"))
 
-    # ✅ Fetch user's wallet balance
-    ether = Ether.query.filter_by(user_id=withdrawal.user_id).first()
-
-    # ✅ Ensure user has enough balance to approve transaction
-    if not ether or ether.main_wallet_balance < withdrawal.eth_amount:
-        flash(
-            f"Insufficient funds! User needs {withdrawal.eth_amount} ETH, but has {ether.main_wallet_balance if ether else 0.0000} ETH.",
-            "warning",
-        )
-        return redirect(url_for("admin.withdrawals"))
-
     try:
-        # ✅ Deduct ETH balance upon approval
-        ether.main_wallet_balance -= withdrawal.eth_amount
+        # ✅ Deduct ETH balance upon approval (fails if the balance is too low)
+        ledger.debit(
+            withdrawal.user_id,
+            ledger.MAIN,
+            withdrawal.eth_amount,
+            "withdrawal",
+            reference=f"withdrawal:{withdrawal.transaction_id}",
+        )
 
         # ✅ Mark withdrawal as "Approved"
         withdrawal.status = "Approved"  # ✅ Use Enum for clarity
@@ -541,6 +528,13 @@ def approve_withdrawal(transaction_id):
             "success",
         )
 
+    except InsufficientFunds as e:
+        db.session.rollback()
+        flash(
+            f"Insufficient funds! User needs {withdrawal.eth_amount} ETH, but has {e.available} ETH.",
+            "warning",
+        )
+
     except Exception as e:
         logging.exception("Error occurred approving withdrawal")
         db.session.rollback()
@@ -582,22 +576,19 @@ def reject_withdrawal(transaction_id):
 
 # ✅ HANDLE OFFERS (Admin View)
 @admin.get("/offers")
+@read_replica
 @login_required
 @admin_required
 def admin_offers():
     try:
-        # ✅ Fetch all offers sorted by status (Pending first, then newest accepted/rejected)
-        offers = Offers.query.order_by(
-            Offers.action.asc(), Offers.timestamp.desc()
-        ).all()
+        # ✅ One page of offers (filter by status for the pending queue)
+        page = admin_tables.OFFERS.page()
 
-        # ✅ Count the total number of offers
-        offer_count = Offers.query.count()
-
-        return render_template(
+        return admin_tables.stream_page(
             "admin/offers.html",
-            offers=offers,  # ✅ Pass offers to template
-            offer_count=offer_count,  # ✅ Pass count to frontend
+            page=page,
+            counts=stats.get_counts()["offers"],
+            offers=page,  # ✅ Pass offers to template
             current_user=current_user,
             title="Offers | MintVerse",
         )
@@ -619,10 +610,12 @@ def approve_offer(offer_id):
         return redirect(url_for("admin.admin_offers"))
 
     try:
-        # ✅ Mark offer as "Accepted"
-        offer.action = "Accepted"
+        # ✅ Accept it and decline the NFT's competing offers in one UPDATE
+        declined = order_book.accept(offer)
         db.session.commit()
         flash(f"Offer ID {offer.id} approved successfully!", "success")
+        if declined:
+            flash(f"{declined} competing offer(s) on {offer.nft_name} declined.", "info")
 
     except Exception as e:
         logging.exception("Error occurred approving offer")
@@ -632,6 +625,30 @@ def approve_offer(offer_id):
     return redirect(url_for("admin.admin_offers"))
 
 
+# ✅ ACCEPT THE BEST OFFER ON AN NFT
+@admin.route("/offers/settle/<int:nft_id>")
+@login_required
+@admin_required
+def settle_offers(nft_id):
+    try:
+        offer, declined = order_book.settle(nft_id)
+        db.session.commit()
+        if offer is None:
+            flash("This NFT has no live offers.", "warning")
+        else:
+            flash(
+                f"Best offer ({offer.offered_price} ETH by {offer.buyer}) accepted; {declined} other offer(s) declined.",
+                "success",
+            )
+
+    except Exception as e:
+        logging.exception("Error occurred settling offers")
+        db.session.rollback()
+        flash(f"An error occurred while settling offers: {str(e)}", "danger")
+
+    return redirect(url_for("admin.admin_offers"))
+
+
 # ✅ REJECT OFFERS
 @admin.route("/offers/reject/<offer_id>")
 @login_required
@@ -658,15 +675,18 @@ def reject_offer(offer_id):
 
 
 @admin.get("/nft/minting_requests")
+@read_replica
 @login_required
 @admin_required
 def minting_requests():
     try:
-        # ✅ Fetch all NFTs pending approval
-        pending_nfts = PendingNFTs.query.order_by(PendingNFTs.timestamp.desc()).all()
-        return render_template(
+        # ✅ One page of NFTs pending approval
+        page = admin_tables.MINTING_REQUESTS.page()
+        return admin_tables.stream_page(
             "admin/minting-requests.html",
-            pending_nfts=pending_nfts,
+            page=page,
+            counts=stats.get_counts()["pending_nfts"],
+            pending_nfts=page,
             current_user=current_user,
             title="Minting Requests | MintVerse",
         )
@@ -676,12 +696,43 @@ def minting_requests():
         return redirect(url_for("admin.admin_dashboard"))
 
 
+@admin.get("/metrics/price_oracle")
+@login_required
+@admin_required
+def price_oracle_metrics():
+    """✅ ETH price cache hit rate, fetch latency and current value"""
+    return jsonify(eth_price_oracle.metrics())
+
+
+@admin.get("/metrics/view_tracker")
+@login_required
+@admin_required
+def view_tracker_metrics():
+    """✅ Buffered view counts: pending, flush interval and lag"""
+    return jsonify(view_tracker.metrics())
+
+
+@admin.get("/metrics/replicas")
+@login_required
+@admin_required
+def replica_metrics():
+    """✅ Read replicas: health, lag and how many requests each served"""
+    return jsonify(db_router.replica_status())
+
+
+@admin.get("/metrics/sql_profile")
+@login_required
+@admin_required
+def sql_profile_metrics():
+    """✅ Per-endpoint query counts, DB time and repeated (N+1) statements"""
+    return jsonify(sql_profiler.endpoint_stats())
+
+
 @admin.route("/nft/approve_minting/<nft_id>")
 @login_required
 @admin_required
 def approve_minting(nft_id):
     pending_nft = PendingNFTs.query.filter_by(id=nft_id).first_or_404()
-    user_wallet = Ether.query.filter_by(user_id=pending_nft.user_id).first()
 
     # ✅ Fetch dynamic minting fee in real-time
     minting_fee = calculate_minting_fee()
@@ -689,22 +740,25 @@ def approve_minting(nft_id):
         flash("Failed to retrieve real-time minting fee.", "warning")
         return redirect(url_for("admin.minting_requests"))
 
-    if user_wallet.gas_fee_balance < minting_fee:
-        flash("User does not have enough gas fee balance to mint this NFT.", "warning")
-        return redirect(url_for("admin.minting_requests"))
-
     try:
-        # ✅ Deduct minting fee dynamically
-        user_wallet.gas_fee_balance -= minting_fee
-        db.session.commit()
+        # ✅ Deduct minting fee dynamically (committed together with the NFT)
+        ledger.debit(
+            pending_nft.user_id,
+            ledger.GAS,
+            minting_fee,
+            "minting_fee",
+            reference=f"minting:{pending_nft.id}",
+        )
 
         # ✅ Move NFT from PendingNFTs to Main NFT table
         approved_nft = NFT(
             nft_name=pending_nft.nft_name,
             nft_image=pending_nft.nft_image,
+            image_variants=build_variants(pending_nft.nft_image),  # ✅ Cached at upload
             category=pending_nft.category,
             collection_name=pending_nft.collection_name,
             creator=pending_nft.creator,
+            creator_id=pending_nft.user_id,
             price=pending_nft.price,
             royalties=pending_nft.royalties,
             description=pending_nft.description,
@@ -713,16 +767,21 @@ def approve_minting(nft_id):
         )
 
         db.session.add(approved_nft)
-        db.session.commit()
+        pending_nft.nft = approved_nft  # ✅ Links the request to the minted NFT by id
 
         # ✅ Update PendingNFTs status instead of deleting
         pending_nft.status = (
-            NFTStatus.AVAILABLE.value
+            NFTStatus.AVAILABLE
         )  # ✅ Keep NFT history while approving
         db.session.commit()
+        index_nft(approved_nft)
 
         flash(f"NFT '{approved_nft.nft_name}' has been minted successfully!", "success")
 
+    except InsufficientFunds:
+        db.session.rollback()
+        flash("User does not have enough gas fee balance to mint this NFT.", "warning")
+
     except Exception as e:
         logging.exception("Error occurred approving minting request")
         db.session.rollback()
@@ -756,6 +815,25 @@ def reject_minting(nft_id):
     return redirect(url_for("admin.minting_requests"))
 
 
+# ✅ BULK APPROVE / REJECT
+@admin.post("/bulk/<kind>/<action>")
+@login_required
+@admin_required
+def bulk_action(kind, action):
+    """
+    ✅ Approve or reject many queue items at once.
+
+    kind: wallet_deposits | gasfee_deposits | withdrawals | transactions |
+          offers | minting_requests
+    body: {"ids": [1, 2, 3]} or {"filter": {"user_id": 3}} (pending items)
+    """
+    try:
+        report = run_bulk_action(kind, action, request.get_json(silent=True) or {})
+    except BulkRequestError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify(report)
+
+
 # ADD A NEW USER
 @admin.route("/add_user", methods=["GET", "POST"])
 @login_required
@@ -919,7 +997,7 @@ def add_to_main(usr_id):
         form = AddToOrSubtractFromBalancesForm()  # ✅ Form reused for adding balance
         if form.validate_on_submit():
             amount = form.amount.data
-            ether.main_wallet_balance += amount
+            ledger.credit(user.id, ledger.MAIN, amount, "admin_credit")
             db.session.commit()
 
             flash(
@@ -969,7 +1047,7 @@ def subtract_from_main(usr_id):
                 )
                 return redirect(url_for("admin.subtract_from_main", usr_id=usr_id))
 
-            ether.main_wallet_balance -= amount
+            ledger.debit(user.id, ledger.MAIN, amount, "admin_debit")
             db.session.commit()
 
             flash(
@@ -1010,7 +1088,7 @@ def add_to_gas(usr_id):
         form = AddToOrSubtractFromBalancesForm()  # ✅ Form reused for adding balance
         if form.validate_on_submit():
             amount = form.amount.data
-            ether.gas_fee_balance += amount
+            ledger.credit(user.id, ledger.GAS, amount, "admin_credit")
             db.session.commit()
 
             flash(
@@ -1059,7 +1137,7 @@ def subtract_from_gas(usr_id):
                 )
                 return redirect(url_for("admin.subtract_from_gas", usr_id=usr_id))
 
-            ether.gas_fee_balance -= amount
+            ledger.debit(user.id, ledger.GAS, amount, "admin_debit")
             db.session.commit()
 
             flash(
@@ -1122,14 +1200,17 @@ def edit_profile(usr_id):
 
 # CONTACT MESSAGES
 @admin.get("/contact_messages")
+@read_replica
 @login_required
 @admin_required
 def contact_messages():
     try:
-        contact_msg = Contact.query.all()
-        return render_template(
+        page = admin_tables.CONTACT_MESSAGES.page()
+        return admin_tables.stream_page(
             "admin/contact-messages.html",
-            contact_msg=contact_msg,
+            page=page,
+            counts=stats.get_counts()["contacts"],
+            contact_msg=page,
             current_user=current_user,
             title="Contact Messages | MintVerse",
         )
@@ -1150,48 +1231,32 @@ def inject_search_form():
 @admin_required
 def search():
     search_form = SearchForm()
+    searched = request.args.get("searched", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
 
     if request.method == "POST" and search_form.validate_on_submit():
         searched = search_form.searched.data.strip()
+        page = 1
 
-        # ✅ Search Users
-        user_results = (
-            User.query.filter(
-                or_(
-                    User.name.ilike(f"%{searched}%"),  # ✅ Case-insensitive search
-                    User.email.ilike(f"%{searched}%"),
-                    User.id.like(f"%{searched}%"),
-                    User.usr_id.ilike(f"%{searched}%"),
-                    User.role.ilike(f"%{searched}%"),
-                )
-            )
-            .order_by(User.role)
-            .all()
-        )
-
-        # ✅ Search NFTs
-        nft_results = (
-            NFT.query.filter(
-                or_(
-                    NFT.nft_name.ilike(f"%{searched}%"),
-                    NFT.category.ilike(f"%{searched}%"),
-                    NFT.collection_name.ilike(f"%{searched}%"),
-                    NFT.creator.ilike(f"%{searched}%"),
-                    NFT.description.ilike(f"%{searched}%"),
-                )
-            )
-            .order_by(NFT.timestamp)
-            .all()
-        )
+    if searched:
+        # ✅ Ranked full-text search over users and NFTs (utils/search.py)
+        user_results, more_users = search_users(searched, page=page)
+        nft_results, more_nfts = search_nfts(searched, page=page)
 
         # ✅ Combine results
         results = user_results + nft_results  # ✅ Merge both result sets
 
-        if not results:
+        if not results and page == 1:
             flash("No results found.", "warning")
             return redirect(url_for("admin.search"))
 
-        return render_template("admin/search.html", searched=searched, results=results)
+        return render_template(
+            "admin/search.html",
+            searched=searched,
+            results=results,
+            page=page,
+            has_next=more_users or more_nfts,
+        )
 
     return render_template(
         "admin/search.html", search_form=search_form, searched=None, results=[]
@@ -1230,6 +1295,12 @@ def delete_profile(usr_id):
     return redirect(url_for("admin.users_listing"))
 
 
+def _creator_id(name):
+    """✅ The user an admin-typed creator name refers to (None if no user has it)"""
+    user = get_user_by_name(name.strip()) if name else None
+    return user.id if user else None
+
+
 # ADD NFTS
 @admin.route("/add_nft", methods=["GET", "POST"])
 @login_required
@@ -1271,27 +1342,20 @@ def add_nft():
             )
             return redirect(url_for("admin.add_nft"))
 
-        # Validate image content for image types
-        if nft_image.filename.lower().endswith(("jpg", "jpeg", "png", "gif", "webp")):
-            image_type = get_image_type(nft_image)
-            if image_type not in ["jpeg", "png", "gif", "webp"]:
-                flash("Uploaded file is not a valid image.", "warning")
-                return redirect(url_for("admin.add_nft"))
-
-        filename = secure_filename(nft_image.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
+        # ✅ Content check (magic bytes + image header) while it is stored
+        try:
+            image_url = blob_store.url(blob_store.store(nft_image, NFT_TYPES))
+        except UploadRejected as e:
+            flash(str(e), "warning")
+            return redirect(url_for("admin.add_nft"))
 
         try:
-            os.makedirs(
-                UPLOAD_FOLDER, exist_ok=True
-            )  # ✅ Ensure the upload folder exists
-            nft_image.save(save_path)  # ✅ Save file securely
 
             # ✅ Create new NFT entry in the database with views manipulation
             nft = NFT(
                 nft_name=nft_name,
-                nft_image=f"/static/uploads/{unique_filename}",
+                nft_image=image_url,
+                image_variants=build_variants(image_url),
                 category=category,
                 collection_name=collection_name,
                 price=price,
@@ -1299,11 +1363,13 @@ def add_nft():
                 views=views,  # ✅ Uses provided value or defaults to 0
                 status=status,
                 creator=creator,
+                creator_id=_creator_id(creator),
                 description=description,
                 user_id=current_user.id,  # ✅ Link NFT to logged-in user
             )
             db.session.add(nft)
             db.session.commit()
+            index_nft(nft)
 
             flash("NFT has been successfully added to the database!", "success")
             return redirect(url_for("admin.add_nft"))
@@ -1323,14 +1389,16 @@ def add_nft():
 
 # HANDLE ADMIN NFT LISTING
 @admin.get("/admin_nft_listing")
+@read_replica
 @login_required
 @admin_required
 def admin_nft_listing():
     try:
-        nfts = NFT.query.all()
-        return render_template(
+        page = admin_tables.NFTS.page()
+        return admin_tables.stream_page(
             "admin/admin-nft-listing.html",
-            nfts=nfts,
+            page=page,
+            nfts=page,
             current_user=current_user,
             title="Nft Listing | MintVerse",
         )
@@ -1369,22 +1437,17 @@ def edit_nft_details(ref_number):
                     "mp3",
                 }
                 if nft_image.filename.lower().endswith(tuple(allowed_extensions)):
-                    # Validate image content for image types
-                    if nft_image.filename.lower().endswith(
-                        ("jpg", "jpeg", "png", "gif", "webp")
-                    ):
-                        image_type = get_image_type(nft_image)
-                        if image_type not in ["jpeg", "png", "gif", "webp"]:
-                            flash("Uploaded file is not a valid image.", "warning")
-                            return redirect(
-                                url_for("admin.edit_nft_details", ref_number=ref_number)
-                            )
-                    filename = secure_filename(nft_image.filename)
-                    unique_filename = f"{uuid.uuid4()}_{filename}"
-                    save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
-                    nft_image.save(save_path)
-                    nft.nft_image = f"/static/uploads/{unique_filename}"  # ✅ Updates only when a new image is uploaded
+                    # ✅ Content check (magic bytes + image header) while it is stored
+                    try:
+                        stored = blob_store.store(nft_image, NFT_TYPES)
+                    except UploadRejected as e:
+                        flash(str(e), "warning")
+                        return redirect(
+                            url_for("admin.edit_nft_details", ref_number=ref_number)
+                        )
+                    # ✅ Updates only when a new image is uploaded
+                    nft.nft_image = blob_store.url(stored)
+                    nft.image_variants = build_variants(nft.nft_image)
 
             # ✅ Update other NFT details
             nft.nft_name = form_data.nft_name.data
@@ -1392,7 +1455,9 @@ def edit_nft_details(ref_number):
             nft.category = form_data.category.data
             nft.collection_name = form_data.collection_name.data
             nft.status = form_data.state.data
-            nft.creator = form_data.creator.data
+            if nft.creator != form_data.creator.data:
+                nft.creator = form_data.creator.data
+                nft.creator_id = _creator_id(nft.creator)
             nft.royalties = (
                 form_data.royalties.data
                 if form_data.royalties.data is not None
@@ -1403,6 +1468,7 @@ def edit_nft_details(ref_number):
             )
 
             db.session.commit()
+            index_nft(nft)
             flash("NFT details updated successfully!", "success")
             return redirect(url_for("admin.nft_details", ref_number=nft.ref_number))
 
@@ -1451,8 +1517,11 @@ def delete_nft(ref_number):
             return redirect(url_for("admin.admin_nft_listing"))
 
         # ✅ Now delete the user safely
+        nft_id = nft.id
         db.session.delete(nft)
         db.session.commit()
+        remove_nft(nft_id)  # ✅ Out of the search index without a full rebuild
+        blob_store.collect_garbage()  # ✅ Drop the image if nothing else uses it
 
         flash(
             f"You have successfully deleted {nft.nft_name}!",
@@ -1510,9 +1579,14 @@ def delete_all_nfts():
             flash("No NFTs found to delete!", category="warning")
             return redirect(url_for("admin.admin_nft_listing"))
 
-        # ✅ Delete all NFTs correctly
-        db.session.query(NFT).delete()
+        # ✅ Delete all NFTs correctly (image references released from the loaded rows)
+        blob_store.release_rows(nfts)
+        nft_ids = [nft.id for nft in nfts]
+        db.session.query(NFT).execution_options(**blob_store.ACCOUNTED).delete()
         db.session.commit()
+        for nft_id in nft_ids:
+            remove_nft(nft_id)
+        blob_store.collect_garbage()
 
         flash("All NFTs have been successfully deleted!", category="success")
 
@@ -1537,9 +1611,13 @@ def delete_all_requests():
             flash("No Requests found to delete!", category="warning")
             return redirect(url_for("admin.minting_requests"))
 
-        # ✅ Delete all NFTs correctly
-        db.session.query(PendingNFTs).delete()
+        # ✅ Delete all NFTs correctly (image references released from the loaded rows)
+        blob_store.release_rows(nfts)
+        db.session.query(PendingNFTs).execution_options(
+            **blob_store.ACCOUNTED
+        ).delete()
         db.session.commit()
+        blob_store.collect_garbage()
 
         flash(
             "All Minting Requests have been successfully deleted!", category="success"
@@ -11,7 +11,7 @@ from ..models import User
 from ..models import Ether
 
 # ✅ Utilities & Helpers
-from ..utils.mail_handler import generate_verification_token, send_verification_code, send_verification_email, verify_token
+from ..utils.mail_handler import generate_verification_token, send_verification_code, verify_token
 from ..utils.helpers import validate_password
 from email_validator import validate_email, EmailNotValidError
 
@@ -9,10 +9,10 @@ from flask import (
 )
 from flask_login import current_user, login_required
 from ..config.database import db
+from ..utils.loaders import get_current_ether
 from ..models import Transaction
-from ..models import Ether
 from ..models import NFT
-from ..models import NFTViews 
+from ..utils.view_tracker import record_view
 
 
 category = Blueprint("category", __name__)
@@ -35,9 +35,9 @@ def buy_page(ref_number):
         return redirect(url_for("user.dashboard_page"))
 
     # ✅ Log NFT view (tracking purposes)
-    NFTViews.log_view(nft.id, current_user.id)
+    record_view(nft.id, current_user.id)
 
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     user_balance = ether.main_wallet_balance if ether else 0.0000
 
     if request.method == "POST":
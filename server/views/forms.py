@@ -20,6 +20,7 @@ from wtforms.validators import (
 )
 from flask_wtf.file import FileField, FileAllowed
 from ..models import NFTStatus
+from ..utils.address import EthAddress
 
 
 class AddToOrSubtractFromBalancesForm(FlaskForm):
@@ -212,7 +213,7 @@ class OfferForm(FlaskForm):
 class FinalisingPurchaseForm(FlaskForm):
     eth_address = StringField(
         "Ethereum Address",
-        validators=[InputRequired()],
+        validators=[InputRequired(), EthAddress()],
         render_kw={
             "class": "walletDeposit__form-input",
             "value": "0x7b9dd9084F40960Db320a747664684551e0aF8ab",  # Auto-filled wallet address
@@ -328,6 +329,7 @@ class WithdrawalForm(FlaskForm):
         validators=[
             InputRequired(),
             Length(min=42, max=42),
+            EthAddress(),
         ],  # ETH addresses are typically 42 characters
         render_kw={
             "placeholder": "Enter your Ethereum address",
@@ -1,4 +1,5 @@
 import uuid
+from sqlalchemy import and_, or_
 from flask import (
     Blueprint,
     request,
@@ -12,19 +13,20 @@ from flask import (
 from flask_login import current_user, login_required
 from flask_mail import Message
 from email_validator import validate_email, EmailNotValidError
-from sqlalchemy import or_, and_
 from ..config.database import db
+from ..utils.loaders import get_current_ether
 from ..models import Contact
-from ..models import NFTStatus
-from ..models import Ether
 from ..models import NFT
-from ..models import NFTViews
+from ..models import User
 from ..views.forms import SearchForm, ContactForm
 from server import mail
 from ..utils.helpers import send_predefined_email
+from ..utils.catalog import InvalidCatalogQuery, catalog_page, wants_catalog_page
+from ..utils.shelves import rotating_shelf_response, shelf_response
+from ..utils.response_cache import cached_catalog_response
+from ..utils.search import search_nfts
+from ..utils.view_tracker import record_view
 import logging
-import random
-from sqlalchemy import desc
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -161,218 +163,80 @@ def explore_page():
     )
 
 
+def _catalog_response(category=None):
+    """✅ Keyset-paginated catalog page (see utils/catalog.py)"""
+    try:
+        return jsonify(catalog_page(request.args, category=category))
+    except InvalidCatalogQuery as e:
+        return jsonify({"warning": str(e)}), 400
+
+
 # NFT API ENDPOINT
 @mintverse.get("/api/nfts/")
+@cached_catalog_response
 def get_nfts():
+    if wants_catalog_page(request.args):
+        return _catalog_response()
+
     nfts = NFT.query.all()
     return jsonify([nft.data() for nft in nfts])
 
 
 # HERO API ENDPOINT (VIEW)
 @mintverse.get("/hero/api/nfts/")
+@cached_catalog_response
 def get_hero_nfts():
-    """✅ Fetch recent NFTs and older ones from each category"""
-
-    # ✅ Get the most recent NFTs based on timestamp
-    recent_nfts = (
-        NFT.query.filter(NFT.status == NFTStatus.AVAILABLE.value)
-        .order_by(desc(NFT.timestamp))
-        .limit(5)
-        .all()
-    )  # ✅ Get 5 newest NFTs
-
-    # ✅ Dynamically get unique categories stored in the DB
-    categories = db.session.query(NFT.category).distinct().all()
-    categories = [c[0] for c in categories]  # Convert tuples to simple list
-
-    selected_nfts = []
-    for category in categories:
-        nft = (
-            NFT.query.filter(
-                and_(NFT.category == category, NFT.status == NFTStatus.AVAILABLE.value)
-            )
-            .order_by(NFT.timestamp)  # ✅ Fetch older NFTs
-            .limit(1)  # ✅ Get one of the older NFTs per category
-            .first()
-        )
-        if nft:
-            selected_nfts.append(nft)
-
-    # ✅ Merge recent NFTs with older ones from each category
-    combined_nfts = recent_nfts + selected_nfts
-
-    # ✅ Handle empty results case
-    if not combined_nfts:
-        return jsonify({"warning": "No NFTs found!"})
-
-    return jsonify(
-        [n.data() for n in combined_nfts]  # ✅ Send selected NFTs as JSON response
-    )
+    """✅ 5 newest NFTs plus the oldest listed NFT of each category"""
+    return shelf_response("hero")
 
 
-# HERO API ENDPOINT (VIEW)
+# BSL API ENDPOINT (VIEW)
 @mintverse.get("/bsl/api/nfts/")
+@cached_catalog_response
 def get_bsl_nfts():
-    # ✅ Dynamically get all unique categories stored in the DB
-    categories = db.session.query(NFT.category).distinct().all()
-    categories = [c[0] for c in categories]  # Convert tuples to a simple list
-
-    selected_nfts = []
-    for category in categories:
-        nft = (
-            NFT.query.filter(
-                and_(NFT.category == category, NFT.status == NFTStatus.AVAILABLE.value)
-            )
-            .offset(2)
-            .first()
-        )  # ✅ Get 3rd item
-        if nft:  # Ensure category has at least three NFTs
-            selected_nfts.append(nft)
-
-    # ✅ Handle empty results case
-    if not selected_nfts:
-        return jsonify(
-            {"warning": "No NFTs found with at least 3 listed items in each category"}
-        )
-
-    return jsonify(
-        [n.data() for n in selected_nfts]
-    )  # ✅ Send selected NFTs as JSON response
+    """✅ 3rd listed NFT of every category"""
+    return shelf_response("bsl")
 
 
 # TTP API ENDPOINT (VIEW)
 @mintverse.get("/ttp/api/nfts/")
 def get_ttp_nfts():
-    all_categories = [
-        "3d-art",
-        "abstract-art",
-        "category-art",
-        "digital-art",
-        "fantasy-art",
-        "generative-art",
-        "gif-art",
-        "installation-art",
-        "pop-art",
-        "minimalism",
-        "painting",
-        "photography",
-        "photorealism",
-        "printmaking",
-        "sculpture",
-        "surrealism",
-        "drawing",
-        "comic-art",
-        "outsider-art",
-    ]
-
-    # ✅ Randomly select four different categories
-    selected_categories = random.sample(all_categories, 4)
-
-    selected_nfts = []
-    for category in selected_categories:
-        nfts = NFT.query.filter(
-            and_(
-                NFT.category == category, NFT.status == NFTStatus.AVAILABLE.value
-            )  # ✅ Correct Enum reference
-        ).first()  # ✅ Get first NFT in each category
-        selected_nfts.extend(nfts)
-
-    # ✅ Handle empty results case
-    if not selected_nfts:
-        return jsonify({"warning": "No NFTs found in these categories"})
-
-    return jsonify(
-        [n.data() for n in selected_nfts]
-    )  # ✅ Send selected NFTs as JSON response
+    """✅ First listed NFT from four randomly selected categories"""
+    return rotating_shelf_response("ttp")
 
 
 # NL API ENDPOINT (VIEW)
 @mintverse.get("/nl/api/nfts/")
 def get_nl_nfts():
     """✅ Fetch new listings dynamically from four rotating categories"""
-
-    # ✅ Full list of available categories
-    all_categories = [
-        "3d-art",
-        "abstract-art",
-        "category-art",
-        "digital-art",
-        "fantasy-art",
-        "generative-art",
-        "gif-art",
-        "installation-art",
-        "pop-art",
-        "minimalism",
-        "painting",
-        "photography",
-        "photorealism",
-        "printmaking",
-        "sculpture",
-        "surrealism",
-        "drawing",
-        "comic-art",
-        "outsider-art",
-    ]
-
-    # ✅ Randomly select four different categories
-    selected_categories = random.sample(all_categories, 4)
-
-    selected_nfts = []
-    for category in selected_categories:
-        nfts = (
-            NFT.query.filter(
-                and_(NFT.category == category, NFT.status == NFTStatus.AVAILABLE.value)
-            )
-            .order_by(desc(NFT.timestamp))  # ✅ Fetch newest NFTs first
-            .limit(2)  # ✅ Get 2 latest NFTs per category
-            .all()
-        )
-        selected_nfts.extend(nfts)
-
-    # ✅ Handle empty results case
-    if not selected_nfts:
-        return jsonify({"warning": "No recent NFTs found in selected categories"})
-
-    return jsonify(
-        [n.data() for n in selected_nfts]  # ✅ Send selected NFTs as JSON response
-    )
+    return rotating_shelf_response("nl")
 
 
 # EXP SECTION API ENDPOINT
 @mintverse.get("/exp/api/nfts/")
+@cached_catalog_response
 def get_exp_section_nfts():
-    # ✅ Dynamically get all unique categories stored in the DB
-    categories = db.session.query(NFT.category).distinct().all()
-    categories = [c[0] for c in categories]  # Convert category tuples to a simple list
-
-    selected_nfts = []
-    for category in categories:
-        nft = (
-            NFT.query.filter(NFT.category == category).offset(3).first()
-        )  # ✅ Get 4th item
-        if nft:  # Ensure the category has at least four NFTs
-            selected_nfts.append(nft)
-
-    # ✅ Handle empty results case
-    if not selected_nfts:
-        return jsonify(
-            {"warning": "No NFTs found with at least 6 listed items in each category"}
-        )
-
-    return jsonify(
-        [n.data() for n in selected_nfts]
-    )  # ✅ Send selected NFTs as JSON response
+    """✅ 4th NFT of every category"""
+    return shelf_response("exp")
 
 
 # EXPLORE API ENDPOINT
 @mintverse.get("/explore/api/nfts/")
+@cached_catalog_response
 def get_explore_page_nfts():
+    if wants_catalog_page(request.args):
+        return _catalog_response()
+
     nfts = NFT.query.all()
     return jsonify([nft.data() for nft in nfts])
 
 
 @mintverse.get("/api/nfts/<category>")
+@cached_catalog_response
 def get_nfts_by_category(category):
+    if wants_catalog_page(request.args):
+        return _catalog_response(category=category)
+
     # ✅ Preserve category format exactly as stored in the database
     nfts = NFT.query.filter_by(category=category).all()
 
@@ -384,10 +248,20 @@ def get_nfts_by_category(category):
 
 
 @mintverse.get("/creator/api/nfts/<creator>")
+@cached_catalog_response
 def get_nfts_by_creator(creator):
     try:
-        # ✅ Fetch NFTs by creator from the database
-        nfts = NFT.query.filter_by(creator=creator).all()
+        # ✅ Creator name -> user ids (indexed), then an integer match on creator_id;
+        # rows without one (typed by an admin, or not yet reached by
+        # `flask backfill-ids`) still match on the name
+        creator_ids = [
+            row.id for row in User.query.with_entities(User.id).filter_by(name=creator)
+        ]
+        unlinked = and_(NFT.creator_id.is_(None), NFT.creator == creator)
+        if creator_ids:
+            nfts = NFT.query.filter(or_(NFT.creator_id.in_(creator_ids), unlinked)).all()
+        else:
+            nfts = NFT.query.filter(unlinked).all()
 
         if not nfts:
             return (
@@ -419,9 +293,9 @@ def buy_page(ref_number):
         return redirect(url_for("user.dashboard_page"))
 
     # ✅ Log NFT view (tracking purposes)
-    NFTViews.log_view(nft.id, current_user.id)
+    record_view(nft.id, current_user.id)
 
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     user_balance = ether.main_wallet_balance if ether else 0.0000
 
     if request.method == "POST":
@@ -651,32 +525,24 @@ def inject_search_form():
 @mintverse.route("/search", methods=["GET", "POST"])
 def search():
     search_form = SearchForm()
-    if request.method == "POST":
-        if search_form.validate_on_submit():
-            searched = search_form.searched.data
-            results = (
-                NFT.query.filter(
-                    or_(
-                        NFT.nft_name.like(f"%{searched}%"),
-                        NFT.category.like(f"%{searched}%"),
-                        NFT.creator.like(f"%{searched}%"),
-                        NFT.description.like(f"%{searched}%"),
-                    )
-                )
-                .order_by(NFT.nft_name)
-                .all()
-            )
-
-            if not results:
-                return redirect(
-                    url_for("mintverse.search", searched=searched, results=[])
-                )
-
-            return render_template(
-                "main/pages/search.html",
-                searched=searched,
-                results=results,
-            )
+    searched = request.args.get("searched", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+
+    if request.method == "POST" and search_form.validate_on_submit():
+        searched = search_form.searched.data.strip()
+        page = 1
+
+    if searched:
+        # ✅ Ranked full-text search (utils/search.py) instead of LIKE scans
+        results, has_next = search_nfts(searched, page=page)
+
+        return render_template(
+            "main/pages/search.html",
+            searched=searched,
+            results=results,
+            page=page,
+            has_next=has_next,
+        )
 
     return render_template(
         "main/pages/search.html",
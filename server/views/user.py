@@ -1,26 +1,31 @@
 from flask import Blueprint, jsonify, render_template, flash, redirect, request, url_for
 from flask_login import login_required, current_user
 from decimal import Decimal
-import os
 import uuid
 import logging
-from werkzeug.utils import secure_filename
 from email_validator import validate_email, EmailNotValidError
 
-from server import UPLOAD_FOLDER, csrf
+from server import csrf
 from ..config.database import db
+from ..utils.loaders import get_current_ether, get_user, get_user_by_name
+from ..utils.portfolio import get_portfolio
+from ..utils import blob_store
+from ..utils import order_book
+from ..utils import ledger
+from ..utils.ledger import InsufficientFunds
+from ..utils.images import build_variants
+from ..utils.uploads import NFT_TYPES, RECEIPT_TYPES, UploadRejected
 from ..utils.minting_fee_helper import calculate_minting_fee
+from ..utils.view_tracker import record_view
 from ..models import NFTStatus
 from ..models import PendingNFTs
 from ..models import NFT
-from ..models import NFTViews
 from ..models import Offers
 from ..models import User
 from ..models import Withdrawal
 from ..models import WalletDeposit
 from ..models import Transaction
 from ..models import GasFeeDeposit
-from ..models import Ether
 from .forms import (
     FinalisingPurchaseForm,
     OfferForm,
@@ -30,7 +35,6 @@ from .forms import (
     GasFeeDepositForm,
     CreateNftForm,
 )
-from .admin import get_image_type
 
 user = Blueprint("user", __name__)
 
@@ -50,9 +54,9 @@ def buy_page(ref_number):
             return redirect(url_for("user.dashboard_page"))
 
         # ✅ Log NFT view (tracking purposes)
-        NFTViews.log_view(nft.id, current_user.id)
+        record_view(nft.id, current_user.id)
 
-        ether = Ether.query.filter_by(user_id=current_user.id).first()
+        ether = get_current_ether()
         user_balance = ether.main_wallet_balance if ether else 0.0000
 
         if request.method == "POST":
@@ -100,14 +104,14 @@ def finalising_purchase(ref_number):
         flash("NFT not found.", "warning")
         return redirect(url_for("user.buy_page", ref_number=ref_number))
 
-    # ✅ Fetch NFT owner's details
-    owner = User.query.filter_by(name=nft.creator).first()
+    # ✅ Fetch NFT owner's details (by id; the name only for rows not yet backfilled)
+    owner = get_user(nft.creator_id) if nft.creator_id else get_user_by_name(nft.creator)
     if not owner:
         flash("NFT creator not found.", "warning")
         return redirect(url_for("user.buy_page", ref_number=ref_number))
 
     # ✅ Fetch user's wallet balance
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     user_balance = ether.main_wallet_balance if ether else 0.0000
 
     form = FinalisingPurchaseForm(obj=nft)
@@ -140,21 +144,14 @@ def finalising_purchase(ref_number):
             )
             return redirect(url_for("user.finalising_purchase", ref_number=ref_number))
 
-        # Additional check
-        image_type = get_image_type(receipt_img)
-        if image_type not in ["png", "jpeg", "jpg", "webp"]:
-            flash("Uploaded file is not a valid image.", "warning")
-            return redirect(url_for("user.finalising_purchase"), ref_number=ref_number)
-
-        filename = secure_filename(receipt_img.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
+        # ✅ Content check (magic bytes + image header) while it is stored
         try:
-            if not os.path.exists(UPLOAD_FOLDER):
-                os.makedirs(UPLOAD_FOLDER)
+            receipt_path = blob_store.store(receipt_img, RECEIPT_TYPES)
+        except UploadRejected as e:
+            flash(str(e), "warning")
+            return redirect(url_for("user.finalising_purchase", ref_number=ref_number))
 
-            receipt_img.save(save_path)
+        try:
 
             # ✅ Create a transaction with Owner & Buyer info
             transaction = Transaction(
@@ -167,7 +164,7 @@ def finalising_purchase(ref_number):
                 nft_ref_number=nft.ref_number,
                 eth_address=eth_address,
                 listed_price=listed_price,
-                receipt_img=unique_filename,
+                receipt_img=receipt_path,
                 status=NFTStatus.PENDING,
             )
 
@@ -201,7 +198,7 @@ def finalising_purchase(ref_number):
 @user.get("/dashboard")
 @login_required
 def dashboard_page():
-    user = User.query.filter_by(id=current_user.id).first()
+    user = get_user(current_user.id)
     if not user:
         flash("User not found.", "danger")
         return redirect(url_for("mintverse.home_page"))
@@ -216,7 +213,7 @@ def dashboard_page():
         return redirect(url_for("admin.admin_dashboard"))
 
     # Get the user's wallet balance from Ether model
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.main_wallet_balance if ether else 0.0000
 
     return render_template(
@@ -224,6 +221,7 @@ def dashboard_page():
         title="Dashboard | MintVerse",
         name=current_user.name,
         eth_count=eth_count,
+        portfolio=get_portfolio(user.id),  # ✅ Counts/values from one primary-key lookup
         current_user=current_user,
     )
 
@@ -234,7 +232,7 @@ def dashboard_page():
 def offers_page():
 
     # ✅ Fetch the logged-in user's ETH balance
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.main_wallet_balance if ether else 0.0000
 
     # ✅ Fetch all offers for the logged-in user, including approved & rejected ones
@@ -274,7 +272,7 @@ def finalise_offer_page(ref_number):
         return redirect(url_for("user.dashboard_page"))
 
     # ✅ Fetch the logged-in user's ETH balance
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.main_wallet_balance if ether else 0.0000
 
     form = OfferForm()
@@ -323,6 +321,8 @@ def finalise_offer_page(ref_number):
                 offered_price=offered_price,
                 buyer=buyer,
                 action="Pending",
+                nft_id=nft.id,
+                expires_at=order_book.new_offer_expiry(),
             )
             db.session.add(offer)
             db.session.commit()
@@ -347,6 +347,7 @@ def finalise_offer_page(ref_number):
         ref_number=ref_number,
         eth_count=eth_count,
         nft=nft,
+        best_offer=order_book.best_offer(nft.id),
         offers=offers,  # ✅ Pass pending offers to the template
         current_user=current_user,
         form=form,  # ✅ Ensure the form is passed to the template
@@ -403,28 +404,21 @@ def wallet_deposit_page():
             )
             return redirect(url_for("user.wallet_deposit_page"))
 
-        image_type = get_image_type(receipt_img)
-        if image_type not in ["png", "jpeg", "jpg", "webp"]:
-            flash("Uploaded file is not a valid image.", "warning")
+        # ✅ Content check (magic bytes + image header) while it is stored
+        try:
+            receipt_path = blob_store.store(receipt_img, RECEIPT_TYPES)
+        except UploadRejected as e:
+            flash(str(e), "warning")
             return redirect(url_for("user.wallet_deposit_page"))
 
-        filename = secure_filename(receipt_img.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
         try:
-            # ✅ Ensure upload directory exists
-            if not os.path.exists(UPLOAD_FOLDER):
-                os.makedirs(UPLOAD_FOLDER)
-
-            receipt_img.save(save_path)  # ✅ Save file securely
 
             # ✅ Create Wallet Deposit Entry (ONLY marked as Pending)
             deposit = WalletDeposit(
                 eth_address=eth_address,
                 wltdps_amount=wltdps_amount,
                 user_id=current_user.id,
-                receipt_img=unique_filename,
+                receipt_img=receipt_path,
                 wltdps_mth="ethereum",
                 status="Pending",  # ✅ Balance will only update on approval
                 type="crypto",
@@ -441,15 +435,12 @@ def wallet_deposit_page():
             db.session.rollback()
             flash(f"An error occurred: {str(e)}", "danger")
 
-            if os.path.exists(save_path):
-                os.remove(save_path)
-
             flash(f"An error occurred while saving Receipt: {e}", "danger")
 
         return redirect(url_for("user.wallet_deposit_page"))
 
     # ✅ Fetch user's wallet balance
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.main_wallet_balance if ether else 0.0000
 
     # ✅ Fetch deposit history
@@ -499,28 +490,20 @@ def gasfee_deposit_page():
                 url_for("user.gasfee_deposit_page")
             )  # ✅ Fix redirect mismatch
 
-        # Additional check
-        image_type = get_image_type(receipt_img)
-        if image_type not in ["png", "jpeg", "jpg", "webp"]:
-            flash("Uploaded file is not a valid image.", "warning")
+        # ✅ Content check (magic bytes + image header) while it is stored
+        try:
+            receipt_path = blob_store.store(receipt_img, RECEIPT_TYPES)
+        except UploadRejected as e:
+            flash(str(e), "warning")
             return redirect(url_for("user.gasfee_deposit_page"))
 
-        filename = secure_filename(receipt_img.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
         try:
-            # ✅ Ensure upload directory exists
-            if not os.path.exists(UPLOAD_FOLDER):
-                os.makedirs(UPLOAD_FOLDER)
-
-            receipt_img.save(save_path)  # ✅ Save file securely
 
             # ✅ Create Gas Fee Deposit Entry with unique reference
             gas_fee_deposit = GasFeeDeposit(
                 gsfdps_amount=gsfdps_amount,
                 user_id=current_user.id,
-                receipt_img=unique_filename,
+                receipt_img=receipt_path,
                 status="Pending",
             )
             db.session.add(gas_fee_deposit)
@@ -535,15 +518,12 @@ def gasfee_deposit_page():
             db.session.rollback()
             flash(f"An error occurred: {str(e)}", "danger")
 
-            if os.path.exists(save_path):
-                os.remove(save_path)
-
             flash(f"An error occurred while saving the receipt: {e}", "danger")
 
         return redirect(url_for("user.gasfee_deposit_page"))
 
     # ✅ Fetch the user's gas fee balance (Ensure structured retrieval)
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     gasfee_count = ether.gas_fee_balance if ether else 0.0000
 
     # ✅ Fetch deposit history
@@ -579,7 +559,7 @@ def withdrawal_page():
         eth_amount = form.eth_amount.data
 
         # ✅ Fetch user's Ether wallet balance
-        ether = Ether.query.filter_by(user_id=current_user.id).first()
+        ether = get_current_ether()
         user_balance = ether.main_wallet_balance if ether else 0.0000
 
         if user_balance < eth_amount:
@@ -617,7 +597,7 @@ def withdrawal_page():
     wth_hst = Withdrawal.query.filter_by(user_id=current_user.id).all()
 
     # ✅ Fetch user's wallet balance
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.main_wallet_balance if ether else 0.0000
 
     return render_template(
@@ -634,7 +614,7 @@ def withdrawal_page():
 @user.route("/profile", methods=["GET", "POST"])
 @login_required
 def profile_page():
-    user = User.query.filter_by(id=current_user.id).first()
+    user = get_user(current_user.id)
     if not user:
         flash("User not found.", "danger")
         return redirect(url_for("mintverse.home_page"))
@@ -726,7 +706,7 @@ def create_nft_page():
             )
             return redirect(url_for("user.create_nft_page"))
 
-        ether = Ether.query.filter_by(user_id=current_user.id).first()
+        ether = get_current_ether()
         gas_fee_balance = ether.gas_fee_balance if ether else Decimal("0.0000")
 
         if gas_fee_balance < minting_fee:
@@ -736,10 +716,6 @@ def create_nft_page():
             )
             return redirect(url_for("user.create_nft_page"))
 
-        # ✅ Deduct minting fee dynamically
-        ether.gas_fee_balance -= minting_fee
-        db.session.commit()
-
         # Extract form data
         nft_name = form.item_name.data
         category = form.category.data
@@ -755,17 +731,20 @@ def create_nft_page():
             flash("Please upload a valid NFT file!", "warning")
             return redirect(url_for("user.create_nft_page"))
 
-        filename = secure_filename(nft_logo.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
+        try:
+            nft_image = blob_store.url(blob_store.store(nft_logo, NFT_TYPES))
+        except UploadRejected as e:
+            flash(str(e), "warning")
+            return redirect(url_for("user.create_nft_page"))
 
         try:
-            nft_logo.save(save_path)
+            # ✅ Resize now so approval only has to look the variants up
+            build_variants(nft_image)
 
             # ✅ Store in PendingNFTs (NOT the main NFT table)
             pending_nft = PendingNFTs(
                 nft_name=nft_name,
-                nft_image=f"/static/uploads/{unique_filename}",
+                nft_image=nft_image,
                 category=category,
                 collection_name=collection_name,
                 creator=creator,
@@ -776,6 +755,16 @@ def create_nft_page():
                 user_id=current_user.id,
             )
             db.session.add(pending_nft)
+            db.session.flush()
+
+            # ✅ Conditional ledger debit, committed together with the request
+            ledger.debit(
+                current_user.id,
+                ledger.GAS,
+                minting_fee,
+                "minting_fee",
+                reference=f"mint_request:{pending_nft.id}",
+            )
             db.session.commit()
 
             flash(
@@ -783,6 +772,14 @@ def create_nft_page():
             )
             return redirect(url_for("user.create_nft_page"))
 
+        except InsufficientFunds as e:
+            db.session.rollback()
+            flash(
+                f"Insufficient gas fee balance! Minting requires {minting_fee} ETH, but you have {e.available} ETH.",
+                "warning",
+            )
+            return redirect(url_for("user.create_nft_page"))
+
         except Exception as e:
             db.session.rollback()
             flash(f"An error occurred while saving NFT: {e}", "danger")
@@ -810,12 +807,22 @@ def create_nft_page():
                 "buyer"
             ),  # ✅ Updated Buyer Info
         )
-        .outerjoin(NFT, NFT.nft_name == PendingNFTs.nft_name)
+        .outerjoin(
+            NFT,
+            db.or_(
+                NFT.id == PendingNFTs.nft_id,  # ✅ Set on approval (`flask backfill-ids`)
+                db.and_(  # ✅ Approved before nft_id existed and not backfilled yet
+                    PendingNFTs.nft_id.is_(None),
+                    PendingNFTs.status != NFTStatus.PENDING,
+                    NFT.nft_name == PendingNFTs.nft_name,
+                ),
+            ),
+        )
         .filter(PendingNFTs.user_id == current_user.id)
         .order_by(PendingNFTs.timestamp.desc())
         .all()
     )
-    ether = Ether.query.filter_by(user_id=current_user.id).first()
+    ether = get_current_ether()
     eth_count = ether.gas_fee_balance if ether else 0.0000
 
     return render_template(
@@ -857,38 +864,45 @@ def mycollection_page():
     return render_template(
         "main/pages/user/myCollection-page.html",
         title="My Collections | MintVerse",
+        portfolio=get_portfolio(current_user.id),
         current_user=current_user,
     )
 
 
+def _nfts_in_order(ids):
+    """✅ NFTs by primary key, in the projection's (newest first) order"""
+    if not ids:
+        return []
+    by_id = {n.id: n for n in NFT.query.filter(NFT.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def _collection_item(n):
+    return {
+        "id": n.id,
+        "ref_number": n.ref_number,
+        "nft_name": n.nft_name,
+        "nft_image": n.nft_image,
+        "category": n.category,
+        "price": str(n.price),  # ✅ String format for decimal values
+        "status": n.status,  # ✅ Stored as its string value
+        "creator": n.creator,
+    }
+
+
 @user.get("/mycollection/listed/api/nfts/")
 @login_required
 def get_my_listed_collection():
     """✅ Fetches NFTs created by the logged-in user"""
     try:
-        listed_nfts = NFT.query.filter(
-            NFT.user_id == current_user.id, NFT.status == NFTStatus.AVAILABLE.value
-        ).all()
+        # ✅ Ids come from the portfolio projection: a primary-key fetch, no scan
+        listed_nfts = _nfts_in_order(get_portfolio(current_user.id).listed_ids)
 
         print(
             f"Retrieved {len(listed_nfts)} NFTs for user {current_user.name}"
         )  # ✅ Logs NFT count
 
-        return jsonify(
-            [
-                {
-                    "id": n.id,
-                    "ref_number": n.ref_number,
-                    "nft_name": n.nft_name,
-                    "nft_image": n.nft_image,
-                    "category": n.category,
-                    "price": str(n.price),  # ✅ String format for decimal values
-                    "status": n.status.value,  # ✅ Convert Enum to string
-                    "creator": n.creator,
-                }
-                for n in listed_nfts
-            ]
-        )
+        return jsonify([_collection_item(n) for n in listed_nfts])
 
     except Exception as e:
         db.session.rollback()
@@ -901,29 +915,13 @@ def get_my_listed_collection():
 def get_my_bought_collection():
     """✅ Fetches NFTs bought by the logged-in user"""
     try:
-        bought_nfts = NFT.query.filter(
-            NFT.buyer_id == current_user.id, NFT.status == NFTStatus.SOLD
-        ).all()
+        bought_nfts = _nfts_in_order(get_portfolio(current_user.id).bought_ids)
 
         print(
             f"Retrieved {len(bought_nfts)} bought NFTs for user {current_user.name}"
         )  # ✅ Logs NFT count
 
-        return jsonify(
-            [
-                {
-                    "id": n.id,
-                    "ref_number": n.ref_number,
-                    "nft_name": n.nft_name,
-                    "nft_image": n.nft_image,
-                    "category": n.category,
-                    "price": str(n.price),  # ✅ String format for decimal values
-                    "status": n.status.value,  # ✅ Convert Enum to string
-                    "creator": n.creator,
-                }
-                for n in bought_nfts
-            ]
-        )
+        return jsonify([_collection_item(n) for n in bought_nfts])
 
     except Exception as e:
         db.session.rollback()
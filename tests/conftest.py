@@ -0,0 +1,62 @@
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="mintverse-tests-")
+os.environ.setdefault("MYSQL_DATABASE_URI", f"sqlite:///{os.path.join(_TMP, 'test.db')}")
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("CACHE_FOLDER", os.path.join(_TMP, "cache"))
+os.environ.setdefault("MAIL_QUEUE_WORKERS", "0")
+os.environ.setdefault("MAIL_DEFAULT_FROM", "noreply@example.com")
+os.environ.setdefault("MAIL_SMTP_SSL", "false")
+os.environ.setdefault("PRICE_ORACLE_SOURCES", f"file:{os.path.join(_TMP, 'eth.json')}")
+
+from server import create_app  # noqa: E402
+from server.config.database import db  # noqa: E402
+from server.models import Ether, NFT, User  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def seed(app):
+    """✅ `seed(users, nfts)` -> user ids; NFTs are listed round-robin by the users"""
+
+    def make(n_users=2, n_nfts=4):
+        user_ids = []
+        for i in range(n_users):
+            user = User(name=f"user{i}", email=f"user{i}@example.com", password="x", store_password="x")
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Ether(user_id=user.id, main_wallet_balance=10, gas_fee_balance=5))
+            user_ids.append(user.id)
+        for i in range(n_nfts):
+            owner = user_ids[i % n_users]
+            db.session.add(
+                NFT(
+                    nft_name=f"nft {i}",
+                    nft_image=f"/static/uploads/nft{i}.jpg",
+                    category="painting",
+                    price=1 + i,
+                    creator=f"user{i % n_users}",
+                    creator_id=owner,
+                    user_id=owner,
+                    status="Available",
+                    description=f"nft {i}",
+                )
+            )
+        db.session.commit()
+        return user_ids
+
+    return make
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from server.config.database import db
+from server.models import Contact
+from server.utils.admin_tables import CONTACT_MESSAGES
+
+
+def _walk(direction, per_page=2):
+    """✅ Ids of every page, following next cursors, then back via prev cursors"""
+    args = {"sort": "timestamp", "dir": direction, "per_page": per_page}
+    pages = [CONTACT_MESSAGES.page(args)]
+    while pages[-1].next_cursor:
+        pages.append(CONTACT_MESSAGES.page(dict(args, after=pages[-1].next_cursor)))
+    forward = [row.id for page in pages for row in page]
+
+    backward = [[row.id for row in pages[-1]]]
+    page = pages[-1]
+    while page.prev_cursor:
+        page = CONTACT_MESSAGES.page(dict(args, before=page.prev_cursor))
+        backward.insert(0, [row.id for row in page])
+    return forward, [row_id for ids in backward for row_id in ids]
+
+
+@pytest.mark.parametrize("direction", ["desc", "asc"])
+def test_pagination_runs_through_null_sort_values(app, direction):
+    start = datetime(2026, 1, 1)
+    for i in range(7):
+        contact = Contact(name=f"c{i}", email=f"c{i}@example.com", subject="s", message="m")
+        db.session.add(contact)
+        db.session.flush()
+        contact.timestamp = None if i % 2 else start + timedelta(days=i)  # ✅ Legacy rows
+    db.session.commit()
+
+    forward, backward = _walk(direction)
+
+    dated, undated = [0, 2, 4, 6], [1, 3, 5]
+    if direction == "desc":
+        expected = [i + 1 for i in reversed(dated)] + [i + 1 for i in reversed(undated)]
+    else:
+        expected = [i + 1 for i in undated] + [i + 1 for i in dated]
+    assert forward == expected
+    assert backward == expected
@@ -0,0 +1,48 @@
+from decimal import Decimal
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from server.config.database import db
+from server.models import NFT, NFTStatus, PendingNFTs
+from server.utils import bulk_admin
+
+
+def _request(user_id, name):
+    return PendingNFTs(
+        nft_name=name,
+        nft_image=f"/static/uploads/{name}.jpg",
+        category="painting",
+        collection_name="c",
+        price=1,
+        royalties=1,
+        description=name,
+        creator="c",
+        user_id=user_id,
+        status=NFTStatus.PENDING,
+    )
+
+
+def test_duplicate_names_in_one_chunk_fail_alone(seed):
+    user_ids = seed(n_users=2, n_nfts=0)
+    rows = [
+        _request(user_ids[0], "twin"),
+        _request(user_ids[1], "twin-copy"),
+        _request(user_ids[1], "single"),
+    ]
+    db.session.add_all(rows)
+    db.session.commit()
+    # ✅ As loaded from a database whose pending_nfts lacks the unique name index
+    set_committed_value(rows[1], "nft_name", "twin")
+
+    handler = bulk_admin.MintingHandler()
+    handler.minting_fee = Decimal("0.01")
+    results = {}
+    handler.approve(rows, results)
+    db.session.commit()
+
+    assert [results[row.id] for row in rows] == [
+        ("approved", None),
+        ("error", "duplicate name in this request"),
+        ("approved", None),
+    ]
+    assert sorted(name for (name,) in db.session.query(NFT.nft_name)) == ["single", "twin"]
@@ -0,0 +1,103 @@
+import socket
+import threading
+import warnings
+
+import pytest
+
+from server.config.database import db
+from server.models import MailOutbox, MailStatus
+from server.utils.mail_queue import SMTPSession, enqueue_email, process_batch
+
+
+class FakeSMTP:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(message["To"])
+
+    def close(self):
+        pass
+
+
+def test_enqueue_rides_the_callers_transaction(app):
+    enqueue_email("Hello", "a@example.com", "text")
+    db.session.rollback()
+    assert MailOutbox.query.count() == 0
+
+
+def test_bad_message_fails_alone(app):
+    enqueue_email("Bad\nsubject", "bad@example.com", "text")
+    enqueue_email("Hello", "good@example.com", "text")
+    db.session.commit()
+
+    smtp = FakeSMTP()
+    assert process_batch(smtp, "test-worker") == 2
+
+    assert smtp.sent == ["good@example.com"]
+    bad, good = MailOutbox.query.order_by(MailOutbox.id).all()
+    assert good.status == MailStatus.SENT.value
+    assert bad.status == MailStatus.PENDING.value
+    assert bad.attempts == 1 and bad.last_error
+
+
+@pytest.fixture
+def smtp_server():
+    """✅ Local debugging SMTP server (stdlib smtpd) on a free port, in a thread"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        asyncore = pytest.importorskip("asyncore")
+        smtpd = pytest.importorskip("smtpd")
+
+    class Server(smtpd.SMTPServer):
+        def __init__(self, socket_map):
+            super().__init__(("127.0.0.1", 0), None, map=socket_map, decode_data=False)
+            self.port = self.socket.getsockname()[1]
+            self.connections = 0
+            self.received = []
+
+        def handle_accepted(self, conn, addr):
+            self.connections += 1
+            super().handle_accepted(conn, addr)
+
+        def process_message(self, peer, mailfrom, rcpttos, data, **kwargs):
+            self.received.extend(rcpttos)
+
+    socket_map = {}
+    server = Server(socket_map)
+    stopping = threading.Event()
+
+    def serve():
+        while not stopping.is_set():
+            asyncore.loop(timeout=0.05, count=1, map=socket_map)
+        asyncore.close_all(map=socket_map)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server
+    stopping.set()
+    thread.join(5)
+
+
+def test_outbox_drains_through_a_local_smtp_server(app, smtp_server):
+    # ✅ Plain SMTP: conftest sets MAIL_SMTP_SSL=false, as for a local debug server
+    session = SMTPSession(host="127.0.0.1", port=smtp_server.port, username=None)
+    for i in range(3):
+        enqueue_email("Hello", f"first{i}@example.com", "text", "<p>html</p>")
+    db.session.commit()
+
+    assert process_batch(session, "test-worker") == 3
+    assert smtp_server.received == [f"first{i}@example.com" for i in range(3)]
+    assert smtp_server.connections == 1  # ✅ One session for the whole batch
+
+    # ✅ The server side goes away between batches: reconnect once and carry on
+    session._smtp.sock.shutdown(socket.SHUT_RDWR)
+    for i in range(2):
+        enqueue_email("Hello", f"second{i}@example.com", "text")
+    db.session.commit()
+
+    assert process_batch(session, "test-worker") == 2
+    assert smtp_server.received[3:] == ["second0@example.com", "second1@example.com"]
+    assert smtp_server.connections == 2
+    assert {mail.status for mail in MailOutbox.query} == {MailStatus.SENT.value}
+    session.close()
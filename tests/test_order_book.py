@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from server.config.database import db
+from server.models import NFT, Offers
+from server.utils import order_book
+
+
+def _offer(nft, user_id, price, expires_at=None):
+    return Offers(
+        nft_image=nft.nft_image,
+        nft_name=nft.nft_name,
+        offered_price=price,
+        buyer=f"user{user_id}",
+        user_id=user_id,
+        nft_id=nft.id,
+        expires_at=expires_at,
+    )
+
+
+def test_settle_ranks_offers_in_the_database(seed):
+    user_ids = seed(n_users=3, n_nfts=1)
+    nft = NFT.query.first()
+    db.session.add(_offer(nft, user_ids[0], 1))
+    db.session.add(_offer(nft, user_ids[1], 5, datetime.now() - timedelta(hours=1)))
+    db.session.commit()
+    assert order_book.order_book(nft.id).best()[1] == 1
+
+    # ✅ Committed through another worker: this process's book never hears of it
+    db.session.execute(
+        Offers.__table__.insert().values(
+            nft_image=nft.nft_image,
+            nft_name=nft.nft_name,
+            offered_price=3,
+            buyer="user2",
+            user_id=user_ids[2],
+            nft_id=nft.id,
+            action="Pending",
+        )
+    )
+    db.session.commit()
+
+    offer, declined = order_book.settle(nft.id)
+    db.session.commit()
+
+    assert (offer.user_id, offer.offered_price) == (user_ids[2], 3)
+    assert declined == 1
+    actions = sorted(row.action for row in Offers.query.filter_by(nft_id=nft.id))
+    assert actions == ["Accepted", "Declined", "Expired"]
+
@@ -0,0 +1,29 @@
+from server.config.database import db
+from server.models import NFT, UserPortfolio
+from server.utils import portfolio
+from server.utils.view_tracker import ViewTracker
+
+
+def test_view_flush_keeps_projections(seed):
+    user_ids = seed(n_users=2, n_nfts=4)
+    assert portfolio.rebuild() == 2
+
+    tracker = ViewTracker()
+    for nft in NFT.query.all():
+        tracker.record(nft.id, user_ids[0])
+    assert tracker.flush() == 4
+
+    db.session.expire_all()
+    assert UserPortfolio.query.count() == 2
+    assert sum(nft.views for nft in NFT.query.all()) == 4
+
+
+def test_bulk_status_update_resets_projections(seed):
+    seed(n_users=2, n_nfts=4)
+    portfolio.rebuild()
+
+    NFT.query.filter(NFT.id == 1).update({"status": "Sold"}, synchronize_session=False)
+    db.session.commit()
+
+    assert UserPortfolio.query.count() == 0
+    assert portfolio.get_portfolio(1).sold_count == 1
@@ -0,0 +1,31 @@
+import json
+from decimal import Decimal
+
+from server.utils.price_oracle import PriceOracle, PriceSourceError
+
+
+class DownSource:
+    name = "down"
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        raise PriceSourceError("down: unreachable")
+
+
+def test_cold_start_keeps_the_last_good_price(tmp_path):
+    last_good = tmp_path / "eth_price.json"
+    last_good.write_text(json.dumps({"USD": "2500.5"}))
+    source = DownSource()
+    oracle = PriceOracle([source], last_good_file=str(last_good))
+
+    assert oracle.get_price() == Decimal("2500.5")
+    assert source.calls == 1
+
+    # ✅ Served from memory; only a background refresh may retry the upstream
+    oracle._refresh_in_background = lambda: None
+    assert oracle.get_price() == Decimal("2500.5")
+    assert source.calls == 1
+    assert oracle.metrics()["fallbacks"] == 2
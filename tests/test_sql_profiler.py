@@ -0,0 +1,22 @@
+import copy
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from server.config.database import db
+from server.utils.sql_profiler import capture_queries
+
+
+def test_failing_statements_leave_nothing_on_the_pooled_connection(app):
+    with db.engine.connect() as conn:
+        before = copy.deepcopy(conn.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+            conn.rollback()
+        assert dict(conn.info) == before
+
+        with capture_queries() as captured:
+            conn.execute(text("SELECT 1"))
+        assert captured == ["SELECT 1"]
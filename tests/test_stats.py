@@ -0,0 +1,44 @@
+from sqlalchemy import event
+
+from server.config.database import db
+from server.models import NFT, Transaction, User
+from server.utils import stats
+
+
+def _enforce_foreign_keys():
+    # ✅ SQLite only cascades with the pragma on (MySQL always does)
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    event.listen(db.engine, "connect", on_connect)
+    db.session.remove()
+    db.engine.dispose()
+
+
+def test_user_delete_recounts_cascaded_transactions(seed):
+    _enforce_foreign_keys()
+    buyer_id, owner_id = seed(n_users=2, n_nfts=1)
+    nft = NFT.query.first()
+    db.session.add(
+        Transaction(
+            user_id=buyer_id,
+            buyer_id=buyer_id,
+            buyer_name="user0",
+            owner_id=owner_id,
+            owner_name="user1",
+            nft_id=nft.id,
+            nft_ref_number=nft.ref_number,
+            eth_address="0x" + "0" * 40,
+            listed_price=1,
+            receipt_img="/static/uploads/receipt.jpg",
+        )
+    )
+    db.session.commit()
+    stats.reconcile()
+    assert stats.get_counts()["transactions"]["total"] == 1
+
+    db.session.delete(db.session.get(User, buyer_id))
+    db.session.commit()
+
+    assert Transaction.query.count() == 0
+    assert stats.get_counts()["transactions"]["total"] == 0
@@ -0,0 +1,20 @@
+from server.config.database import db
+from server.models import NFT, NFTViews
+from server.utils.view_tracker import ViewTracker
+
+
+def test_flush_counts_each_view_once(seed):
+    user_ids = seed(n_users=2, n_nfts=2)
+
+    # ✅ Two workers buffered the same (nft, user) pair
+    first, second = ViewTracker(), ViewTracker()
+    for tracker in (first, second):
+        tracker.record(1, user_ids[0])
+    second.record(2, user_ids[1])
+
+    assert first.flush() == 1
+    assert second.flush() == 1  # ✅ Only (2, user 1) is new
+
+    db.session.expire_all()
+    assert NFTViews.query.count() == 2
+    assert [nft.views for nft in NFT.query.order_by(NFT.id)] == [1, 1]